@@ -0,0 +1,277 @@
+# analyze_telemetry.py
+# Offline analysis of recorded telemetry sessions
+
+import argparse
+import glob
+import json
+import os
+
+import numpy as np
+import pygame
+
+import app
+import telemetry
+from telemetry import RECORD_DTYPE
+
+# Events whose value is the player's level from then on
+LEVEL_EVENTS = (telemetry.LEVEL_UP, telemetry.RUN_START, telemetry.LOAD)
+# (run, level) keys for grouping records
+SPAN_DTYPE = np.dtype([("run", np.int64), ("level", np.int64)])
+
+# Heatmap cell size in pixels (one floor tile)
+HEATMAP_CELL = 32
+
+def open_session_file(path):
+    """
+    Memory-map a session file as a structured array (no copy).
+
+    Returns:
+        tuple: (records, file format version)
+
+    Raises:
+        ValueError: If the file is not a telemetry session file
+    """
+    with open(path, "rb") as f:
+        header = f.read(telemetry.FILE_HEADER.size)
+    magic, version, record_size, _ = telemetry.FILE_HEADER.unpack(header)
+    if (magic != telemetry.MAGIC or version > telemetry.VERSION
+            or record_size != RECORD_DTYPE.itemsize):
+        raise ValueError(f"{path} is not a telemetry session file")
+    count = (os.path.getsize(path) - telemetry.FILE_HEADER.size) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, RECORD_DTYPE), version
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r",
+                     offset=telemetry.FILE_HEADER.size, shape=(count,)), version
+
+def annotate_levels(records, version, start_level=1, last_tick=0):
+    """
+    Work out the player level and run at each record.
+
+    Runs start at RUN_START events; version 1 files have none, so there a
+    run starts wherever the tick counter goes backwards. The level is the
+    value of the latest LEVEL_UP, RUN_START or LOAD event, so a quick-load
+    or rewind moves the level back without starting a new run.
+
+    Args:
+        records: Structured array of records in file order
+        version: File format version
+        start_level: Level at the end of the previous file
+        last_tick: Tick of the last record in the previous file
+
+    Returns:
+        tuple: (levels array, run index array, final level, final tick)
+    """
+    tick = records["tick"].astype(np.int64)
+    if len(tick) == 0:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64), start_level, last_tick
+
+    kinds = records["kind"]
+    if version == 1:
+        previous = np.empty_like(tick)
+        previous[0] = last_tick
+        previous[1:] = tick[:-1]
+        new_run = tick < previous
+    else:
+        new_run = kinds == telemetry.RUN_START
+    run_index = np.cumsum(new_run)
+
+    # Each record takes the level set by the latest level event before it
+    sets_level = np.isin(kinds, LEVEL_EVENTS)
+    values = np.where(sets_level, records["value"], 1).astype(np.int64)
+    latest = np.where(sets_level | new_run, np.arange(len(tick)), -1)
+    np.maximum.accumulate(latest, out=latest)
+    levels = np.where(latest >= 0, values[latest], start_level)
+    return levels, run_index, int(levels[-1]), int(tick[-1])
+
+def load_session(paths):
+    """
+    Map every file of a session and pull out the columns each report needs.
+
+    Only the records of interest are copied out of the maps; the bulk of the
+    data (frame records on long sessions) is reduced in place.
+    """
+    events = {kind: [] for kind in telemetry.EVENT_NAMES}
+    levels_by_kind = {kind: [] for kind in telemetry.EVENT_NAMES}
+    level_spans = {}  # (run, level) -> [first tick, last tick]
+    level, tick, run_offset = 1, 0, 0
+
+    for path in paths:
+        records, version = open_session_file(path)
+        levels, run_index, level, tick = annotate_levels(records, version, level, tick)
+        runs = run_index + run_offset
+        run_offset = int(runs[-1]) if len(runs) else run_offset
+
+        # Time spent on each level of each run, from the tick range it covers
+        if len(records):
+            keys = np.empty(len(records), SPAN_DTYPE)
+            keys["run"] = runs
+            keys["level"] = levels
+            unique, inverse = np.unique(keys, return_inverse=True)
+            ticks = records["tick"].astype(np.int64)
+            first = np.full(len(unique), np.iinfo(np.int64).max)
+            last = np.zeros(len(unique), np.int64)
+            np.minimum.at(first, inverse, ticks)
+            np.maximum.at(last, inverse, ticks)
+            for key, lo, hi in zip(unique.tolist(), first.tolist(), last.tolist()):
+                span = level_spans.setdefault(key, [lo, hi])
+                span[0], span[1] = min(span[0], lo), max(span[1], hi)
+
+        kinds = records["kind"]
+        for kind in events:
+            mask = kinds == kind
+            events[kind].append(records[mask])
+            levels_by_kind[kind].append(levels[mask])
+
+    merged = {kind: np.concatenate(parts) if parts else np.zeros(0, RECORD_DTYPE)
+              for kind, parts in events.items()}
+    merged_levels = {kind: np.concatenate(parts) if parts else np.zeros(0, np.int64)
+                     for kind, parts in levels_by_kind.items()}
+    return merged, merged_levels, level_spans
+
+def kill_rates(events, levels, level_spans):
+    """
+    Kills per second for each level.
+
+    Returns:
+        list: (level, kills, seconds, kills per second)
+    """
+    deaths = levels[telemetry.DEATH]
+    max_level = int(max(deaths.max(initial=0),
+                        max((level for _, level in level_spans), default=0)))
+    kills = np.bincount(deaths, minlength=max_level + 1)
+    seconds = np.zeros(max_level + 1)
+    for (_, level), (first, last) in level_spans.items():
+        seconds[level] += (last - first) / app.TICK_RATE
+    rows = []
+    for level in range(1, max_level + 1):
+        rate = kills[level] / seconds[level] if seconds[level] > 0 else 0.0
+        rows.append((level, int(kills[level]), float(seconds[level]), float(rate)))
+    return rows
+
+def damage_histogram(events, levels):
+    """
+    Damage taken per level.
+
+    Returns:
+        np.ndarray: Total damage indexed by level
+    """
+    damage = events[telemetry.DAMAGE]
+    return np.bincount(levels[telemetry.DAMAGE], weights=damage["value"])
+
+def upgrade_picks(events):
+    """
+    Returns:
+        np.ndarray: Number of times each upgrade id was picked
+    """
+    return np.bincount(events[telemetry.UPGRADE]["subtype"].astype(np.int64))
+
+def frame_time_percentiles(events, percentiles=(50, 90, 99, 99.9)):
+    """
+    Returns:
+        dict: Percentile -> frame time in ms (empty if no frames were recorded)
+    """
+    frame_ms = events[telemetry.FRAME]["value"]
+    if len(frame_ms) == 0:
+        return {}
+    return dict(zip(percentiles, np.percentile(frame_ms, percentiles).tolist()))
+
+def heatmap(records, width, height, cell=HEATMAP_CELL):
+    """
+    Count events per arena cell.
+
+    Positions outside the arena (e.g. spawns in SPAWN_MARGIN) are clamped
+    into the border cells.
+
+    Returns:
+        np.ndarray: Counts with shape (columns, rows)
+    """
+    columns = -(-width // cell)
+    rows = -(-height // cell)
+    x = np.clip(records["x"], 0, width - 1)
+    y = np.clip(records["y"], 0, height - 1)
+    counts, _, _ = np.histogram2d(x, y, bins=(columns, rows),
+                                  range=((0, columns * cell), (0, rows * cell)))
+    return counts
+
+def save_heatmap(counts, path, cell=HEATMAP_CELL, max_size=2048):
+    """
+    Write a heatmap as a black-red-yellow PNG.
+
+    Each cell is drawn cell pixels wide (arena resolution) unless that would
+    make the image wider or taller than max_size.
+    """
+    scaled = np.log1p(counts)
+    if scaled.max() > 0:
+        scaled /= scaled.max()
+    rgb = np.zeros(counts.shape + (3,), np.uint8)
+    rgb[..., 0] = np.minimum(1.0, scaled * 2) * 255
+    rgb[..., 1] = np.clip(scaled * 2 - 1, 0, 1) * 255
+    pixels = max(1, min(cell, max_size // max(counts.shape)))
+    rgb = np.repeat(np.repeat(rgb, pixels, axis=0), pixels, axis=1)
+    pygame.image.save(pygame.surfarray.make_surface(rgb), path)
+
+def find_sessions(folder):
+    """Group session files in a folder by session name."""
+    sessions = {}
+    for path in sorted(glob.glob(os.path.join(folder, "session-*-*.bin"))):
+        name = os.path.basename(path).rsplit("-", 1)[0]
+        sessions.setdefault(name, []).append(path)
+    return sessions
+
+def report(folder, session, out_dir):
+    """Print the summary tables for one session and write its heatmaps."""
+    paths = find_sessions(folder)[session]
+    meta_path = os.path.join(folder, f"{session}.json")
+    metadata = {}
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            metadata = json.load(f)
+    width = metadata.get("width", app.WIDTH)
+    height = metadata.get("height", app.HEIGHT)
+    upgrade_names = metadata.get("upgrades", [])
+
+    events, levels, level_spans = load_session(paths)
+    print(f"{session}: {len(paths)} file(s)")
+
+    print("\nKill rate per level")
+    for level, kills, seconds, rate in kill_rates(events, levels, level_spans):
+        print(f"  level {level:3d}  {kills:6d} kills  {seconds:8.1f} s  {rate:6.2f}/s")
+
+    print("\nDamage taken per level")
+    for level, damage in enumerate(damage_histogram(events, levels)):
+        if damage:
+            print(f"  level {level:3d}  {damage:g}")
+
+    print("\nUpgrade picks")
+    for upgrade_id, picks in enumerate(upgrade_picks(events)):
+        name = upgrade_names[upgrade_id] if upgrade_id < len(upgrade_names) else upgrade_id
+        print(f"  {name:<10} {picks}")
+
+    print("\nFrame time percentiles")
+    for percentile, ms in frame_time_percentiles(events).items():
+        print(f"  p{percentile:<5} {ms:7.2f} ms")
+
+    os.makedirs(out_dir, exist_ok=True)
+    enemies = np.concatenate((events[telemetry.SPAWN], events[telemetry.DEATH]))
+    save_heatmap(heatmap(enemies, width, height),
+                 os.path.join(out_dir, f"{session}-enemy-density.png"))
+    save_heatmap(heatmap(events[telemetry.DEATH], width, height),
+                 os.path.join(out_dir, f"{session}-deaths.png"))
+    print(f"\nHeatmaps written to {out_dir}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise recorded telemetry sessions.")
+    parser.add_argument("folder", nargs="?", default="telemetry",
+                        help="folder containing session files")
+    parser.add_argument("--session", help="session name (default: the latest)")
+    parser.add_argument("--out", default="telemetry_reports", help="heatmap output folder")
+    args = parser.parse_args()
+
+    sessions = find_sessions(args.folder)
+    if not sessions:
+        parser.error(f"no telemetry sessions in {args.folder}")
+    session = args.session or sorted(sessions)[-1]
+    report(args.folder, session, args.out)
+
+if __name__ == "__main__":
+    main()
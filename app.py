@@ -1,6 +1,9 @@
 # app.py
 import pygame
+import numpy as np
 import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 # --------------------------------------------------------------------------
 #                               CONSTANTS
@@ -10,11 +13,41 @@ WIDTH = 1500
 HEIGHT = 1000
 FPS = 60
 
+# The world scrolls under a camera; positions must fit the co-op
+# protocol's int16 / POSITION_SCALE coordinates (under 16384)
+WORLD_WIDTH = WIDTH * 8
+WORLD_HEIGHT = HEIGHT * 8
+# Floor chunks are CHUNK_TILES x CHUNK_TILES tiles, built when first seen
+CHUNK_TILES = 16
+# Memory cap for cached floor chunks (far-away chunks are freed first)
+CHUNK_CACHE_BYTES = 32 * 1024 * 1024
+# Floor layout seed (None picks a new layout every launch)
+WORLD_SEED = None
+
+# Minimap grid (cells cover the whole world) and how often it is rebuilt
+MINIMAP_COLUMNS = 120
+MINIMAP_ROWS = 80
+MINIMAP_CELL_PIXELS = 2
+MINIMAP_REFRESH_TICKS = 15
+
+# Fixed simulation rate; all per-tick speeds below are tuned for 60 ticks/s
+TICK_RATE = 60
+# Most simulation ticks run in one frame before the backlog is dropped
+MAX_CATCH_UP_STEPS = 5
+# Most consecutive frames skipped while the simulation catches up
+MAX_SKIPPED_RENDERS = 4
+
 PLAYER_SPEED = 3
+# Simulation ticks a player can't be hurt for after taking damage
+INVINCIBILITY_TICKS = int(0.7 * TICK_RATE)
 DEFAULT_ENEMY_SPEED = 1
 
 
 SPAWN_MARGIN = 50
+# Enemy waves are generated this many at a time from each level's schedule
+WAVE_BLOCK_WAVES = 32
+# Most enemies created per tick; bigger waves finish over the next ticks
+SPAWN_BATCH = 64
 
 ENEMY_SCALE_FACTOR = 2
 PLAYER_SCALE_FACTOR = 2
@@ -24,68 +57,395 @@ FIREBALL_SCALE_FACTOR = 0.20
 FIREWAND_SCALE_FACTOR = 0.125
 
 PUSHBACK_DISTANCE = 80
+# Only enemies this close to a player pushing them back are knocked away
+KNOCKBACK_RADIUS = 300
 ENEMY_KNOCKBACK_SPEED = 5
 
+# Boss size multipliers, one tier per boss wave (last tier repeats)
+BOSS_SCALE_TIERS = (2,)
+
+# Hostile projectiles fired by boss attack patterns
+ENEMY_PROJECTILE_CAPACITY = 4096
+ENEMY_PROJECTILE_RADIUS = 6
+# Players are only hit by projectiles touching this circle at their centre
+PLAYER_HITBOX_RADIUS = 10
+
+# Hit, death and pickup particles; bursts are thinned once more than
+# PARTICLE_SOFT_BUDGET of PARTICLE_BUDGET is in use
+PARTICLE_BUDGET = 4096
+PARTICLE_SOFT_BUDGET = 0.5
+PARTICLE_SIZE = 3
+
+# Performance mode renders the world at native sprite resolution onto a
+# surface RENDER_SCALE times smaller and upscales it once per frame
+PERFORMANCE_MODE = False
+# Show frame loop counters under the HUD (toggle with F2)
+SHOW_FRAME_STATS = False
+RENDER_SCALE = 2
+
+# Snapshots kept for rewinding (one every SNAPSHOT_INTERVAL ticks)
+SNAPSHOT_INTERVAL = 60
+SNAPSHOT_HISTORY_LENGTH = 10
+# Where the last state is written if the game loop crashes
+CRASH_SNAPSHOT_PATH = "crash_snapshot.bin"
+
+# SQLite file holding finished runs and the leaderboard
+RUN_HISTORY_PATH = "run_history.db"
+
+# Gameplay telemetry session files (None disables recording)
+TELEMETRY_FOLDER = None
+TELEMETRY_BUFFER_RECORDS = 65536
+TELEMETRY_MAX_FILE_BYTES = 64 * 1024 * 1024
+
+# Gameplay recordings (F10): a video plus the input session that replays it
+CAPTURE_FOLDER = "captures"
+CAPTURE_FORMAT = "y4m"  # "y4m" for one raw video file, "png" for a PNG sequence
+CAPTURE_RING_FRAMES = 8  # Frames buffered for the encoders before dropping
+CAPTURE_WORKERS = 2
+
+# Print a memory report on every level up (allocation sites need tracing,
+# which slows the game down)
+MEMORY_REPORTS = False
+MEMORY_TRACE = False
+
+# Sampling profiler writing per-phase collapsed stacks to PROFILE_FOLDER.
+# PROFILE samples the whole session; F8 samples PROFILE_WINDOW_SECONDS and
+# PROFILE_BOSS_SECONDS (if set) samples that long after each boss spawns.
+PROFILE = False
+PROFILE_RATE = 500  # Samples per second
+PROFILE_FOLDER = "profiles"
+PROFILE_WINDOW_SECONDS = 5
+PROFILE_BOSS_SECONDS = None
+
+# Enemy, upgrade, drop and boss definitions, and their compiled cache
+CONTENT_PATH = "content.json"
+CONTENT_CACHE_PATH = "content.cache"
+
+# Enemy types in id order (used by snapshots and telemetry)
+ENEMY_TYPES = ("orc", "undead", "demon")
+ENEMY_TYPE_IDS = {name: i for i, name in enumerate(ENEMY_TYPES)}
+
+# Worker threads used to decode and scale PNG frames
+ASSET_LOADER_WORKERS = 4
+# Asset groups that must be ready before the first frame is drawn
+EAGER_ASSET_GROUPS = ("player", "floor_tiles", "health")
+
+# Frame sets of each asset group as (file prefix, frame count, name of the
+# scale factor constant, per-pixel alpha). Groups holding a dict have one
+# frame set per animation. Files are "<prefix>_<frame>.png" in ASSET_FOLDER.
+ASSET_FOLDER = "assets"
+ASSET_GROUPS = {
+    "player": {
+        "idle": ("player_idle", 4, "PLAYER_SCALE_FACTOR", True),
+        "run": ("player_run", 4, "PLAYER_SCALE_FACTOR", True),
+    },
+    "floor_tiles": ("floor", 8, "FLOOR_TILE_SCALE_FACTOR", False),
+    "health": ("health", 6, "HEALTH_SCALE_FACTOR", True),
+    "enemies": {enemy_type: (enemy_type, 4, "ENEMY_SCALE_FACTOR", True)
+                for enemy_type in ENEMY_TYPES},
+    "bullets": ("fireball", 6, "FIREBALL_SCALE_FACTOR", True),
+    "weapons": ("firewand", 8, "FIREWAND_SCALE_FACTOR", True),
+}
+
+# Sprites whose alpha is only fully transparent or fully opaque are stored
+# as RLE colorkey surfaces (and fully opaque ones without alpha), which
+# blit much faster than per-pixel alpha in SDL's software renderer
+OPTIMIZE_SURFACES = True
+# Candidate colorkeys, the first one not used by a sprite's pixels wins
+COLORKEY_CANDIDATES = ((255, 0, 255), (0, 255, 255), (1, 254, 1), (254, 1, 254))
+
+# Watch asset and tuning files and swap in changes without restarting
+HOT_RELOAD = False
+HOT_RELOAD_INTERVAL = 0.5  # Seconds between file checks
+# Constants re-read from app.py on change, besides every *_SCALE_FACTOR
+# (objects pick up new values when they are next created)
+HOT_RELOAD_CONSTANTS = ("PLAYER_SPEED", "DEFAULT_ENEMY_SPEED", "SPAWN_MARGIN",
+                        "PUSHBACK_DISTANCE", "KNOCKBACK_RADIUS",
+                        "ENEMY_KNOCKBACK_SPEED")
+
 # --------------------------------------------------------------------------
 #                       ASSET LOADING FUNCTIONS
 # --------------------------------------------------------------------------
 
-def load_frames(prefix, frame_count, scale_factor=1, folder="assets"):
-    frames = []
-    for i in range(frame_count):
-        image_path = os.path.join(folder, f"{prefix}_{i}.png")
-        img = pygame.image.load(image_path).convert_alpha()
+def load_image(image_path, scale_factor=1, alpha=True):
+    """
+    Decode a single image and scale it by the given factor.
+
+    Args:
+        image_path (str): Path of the image file
+        scale_factor (float): Multiplier applied to both dimensions
+        alpha (bool): Keep per-pixel alpha (False for opaque tiles)
+
+    Returns:
+        pygame.Surface: The converted, scaled image
+    """
+    img = pygame.image.load(image_path)
+    img = img.convert_alpha() if alpha else img.convert()
+
+    if scale_factor != 1:
+        w = int(img.get_width() * scale_factor)
+        h = int(img.get_height() * scale_factor)
+        img = pygame.transform.scale(img, (w, h))
+
+    if alpha and OPTIMIZE_SURFACES:
+        img = optimize_surface(img)
+    return img
+
+# Surface representations, fastest to blit first
+SURFACE_OPAQUE = "opaque"
+SURFACE_COLORKEY = "colorkey"
+SURFACE_ALPHA = "alpha"
+
+def surface_class(image):
+    """Return which representation a surface uses (SURFACE_*)."""
+    if image.get_flags() & pygame.SRCALPHA:
+        return SURFACE_ALPHA
+    if image.get_colorkey() is not None:
+        return SURFACE_COLORKEY
+    return SURFACE_OPAQUE
+
+def optimize_surface(image):
+    """
+    Pick the fastest representation for a per-pixel alpha image.
+
+    Images that are fully opaque become plain display-format surfaces;
+    images whose pixels are only fully transparent or fully opaque become
+    RLE-accelerated colorkey surfaces; anything with partial transparency
+    keeps per-pixel alpha.
+
+    Args:
+        image (pygame.Surface): Image converted with convert_alpha()
+
+    Returns:
+        pygame.Surface: The image in its fastest representation
+    """
+    alpha = pygame.surfarray.array_alpha(image)
+    if alpha.min() == 255:
+        return image.convert()
+    if np.count_nonzero((alpha != 0) & (alpha != 255)):
+        return image  # Soft edges need per-pixel alpha
+
+    # Choose a key colour no visible pixel uses
+    rgb = pygame.surfarray.array3d(image)
+    visible = rgb[alpha == 255]
+    for key in COLORKEY_CANDIDATES:
+        if not np.all(visible == key, axis=1).any():
+            break
+    else:
+        return image
+
+    keyed = image.convert()
+    pixels = pygame.surfarray.pixels3d(keyed)
+    pixels[alpha == 0] = key
+    del pixels  # Unlock before enabling RLE
+    keyed.set_colorkey(key, pygame.RLEACCEL)
+    return keyed
 
-        if scale_factor != 1:
-            w = img.get_width() * scale_factor
-            h = img.get_height() * scale_factor
-            img = pygame.transform.scale(img, (w, h))
+_solid_images = {}
 
-        frames.append(img)
-    return frames
+def solid_image(size, colour):
+    """
+    Return a shared opaque square of one colour (bullets and coins).
 
-def load_floor_tiles(folder="assets"):
-    floor_tiles = []
-    for i in range(8):
-        path = os.path.join(folder, f"floor_{i}.png")
-        tile = pygame.image.load(path).convert()
+    Args:
+        size (int): Width and height in pixels
+        colour (tuple): RGB colour
+    """
+    key = (int(size), colour)
+    image = _solid_images.get(key)
+    if image is None:
+        image = pygame.Surface((key[0], key[0]))
+        image.fill(colour)
+        _solid_images[key] = image
+    return image
 
-        if FLOOR_TILE_SCALE_FACTOR != 1:
-            tw = tile.get_width() * FLOOR_TILE_SCALE_FACTOR
-            th = tile.get_height() * FLOOR_TILE_SCALE_FACTOR
-            tile = pygame.transform.scale(tile, (tw, th))
+def load_frames(prefix, frame_count, scale_factor=1, folder="assets", executor=None, alpha=True):
+    """
+    Load an animation as a list of frames.
 
-        floor_tiles.append(tile)
-    return floor_tiles
+    When an executor is given the frames are decoded on its threads and a
+    PendingFrames handle is returned instead of the list itself.
+    """
+    paths = [os.path.join(folder, f"{prefix}_{i}.png") for i in range(frame_count)]
+    if executor is None:
+        return [load_image(path, scale_factor, alpha) for path in paths]
+    return PendingFrames([executor.submit(load_image, path, scale_factor, alpha) for path in paths])
+
+def frame_sets(groups=None):
+    """
+    List every frame set in the asset manifest.
+
+    Args:
+        groups (dict): Asset manifest (default ASSET_GROUPS)
+
+    Returns:
+        list: ((group, animation name or None), spec) pairs
+    """
+    groups = ASSET_GROUPS if groups is None else groups
+    found = []
+    for group, specs in groups.items():
+        if isinstance(specs, dict):
+            found.extend(((group, name), spec) for name, spec in specs.items())
+        else:
+            found.append(((group, None), specs))
+    return found
+
+def load_frame_set(spec, folder=None, executor=None, scale_factor=None):
+    """
+    Load the frames described by one ASSET_GROUPS entry.
+
+    Args:
+        spec (tuple): (prefix, frame count, scale factor constant, alpha)
+        folder (str): Asset folder (default ASSET_FOLDER)
+        executor: Thread pool to decode on (returns PendingFrames)
+        scale_factor (float): Overrides the spec's scale factor constant
+    """
+    prefix, frame_count, scale_name, alpha = spec
+    if scale_factor is None:
+        scale_factor = globals()[scale_name]
+    return load_frames(prefix, frame_count, scale_factor, folder or ASSET_FOLDER,
+                       executor, alpha)
+
+_flipped_frames = weakref.WeakKeyDictionary()
+
+def flipped(image):
+    """
+    Return a horizontally mirrored copy of an image, cached so sprites facing
+    left don't allocate a new surface every frame.
+    """
+    mirrored = _flipped_frames.get(image)
+    if mirrored is None:
+        mirrored = pygame.transform.flip(image, True, False)
+        _flipped_frames[image] = mirrored
+    return mirrored
+
+_frame_masks = weakref.WeakKeyDictionary()
+
+def frame_mask(image):
+    """
+    Return the collision mask of an image, cached so pixel-perfect checks
+    don't rebuild masks from the same animation frames every tick.
+    """
+    mask = _frame_masks.get(image)
+    if mask is None:
+        mask = pygame.mask.from_surface(image)
+        _frame_masks[image] = mask
+    return mask
+
+def add_frame_caches(flips, masks):
+    """
+    Add mirrored frames and masks built elsewhere to the caches, keeping
+    any entries that already exist. Call from the main thread only.
+
+    Args:
+        flips (dict): Image -> mirrored copy
+        masks (dict): Image -> collision mask
+    """
+    for image, mirrored in flips.items():
+        if image not in _flipped_frames:
+            _flipped_frames[image] = mirrored
+    for image, mask in masks.items():
+        if image not in _frame_masks:
+            _frame_masks[image] = mask
+
+class PendingFrames:
+    """
+    A frame list (or dict of frame lists) whose images are still being
+    decoded on the asset loader's thread pool.
+    """
+
+    def __init__(self, futures):
+        """
+        Args:
+            futures (list | dict): Futures for each frame, or a dict of
+                PendingFrames keyed by animation name
+        """
+        self.futures = futures
+
+    def done(self):
+        """Return True once every frame has been decoded."""
+        if isinstance(self.futures, dict):
+            return all(pending.done() for pending in self.futures.values())
+        return all(future.done() for future in self.futures)
+
+    def result(self):
+        """Block until decoding finishes and return the loaded frames."""
+        if isinstance(self.futures, dict):
+            return {name: pending.result() for name, pending in self.futures.items()}
+        return [future.result() for future in self.futures]
+
+class AssetStore(dict):
+    """
+    Dictionary of loaded assets where some groups may still be loading.
+
+    Pending groups are resolved the first time they are looked up, blocking
+    only if their frames have not finished decoding yet.
+    """
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, PendingFrames):
+            value = value.result()
+            super().__setitem__(key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def is_ready(self, key):
+        """Return True if the group can be looked up without blocking."""
+        value = super().__getitem__(key)
+        return not isinstance(value, PendingFrames) or value.done()
+
+    def progress(self):
+        """
+        Returns:
+            tuple: (groups ready, total groups)
+        """
+        ready = sum(1 for key in self if self.is_ready(key))
+        return ready, len(self)
+
+    def all_ready(self):
+        ready, total = self.progress()
+        return ready == total
 
 def load_assets():
-    assets = {}
-
-    # Enemies
-    assets["enemies"] = {
-        "orc":    load_frames("orc",    4, scale_factor=ENEMY_SCALE_FACTOR),
-        "undead": load_frames("undead", 4, scale_factor=ENEMY_SCALE_FACTOR),
-        "demon":  load_frames("demon",  4, scale_factor=ENEMY_SCALE_FACTOR),
-    }
-
-    # Player
-    assets["player"] = {
-        "idle": load_frames("player_idle", 4, scale_factor=PLAYER_SCALE_FACTOR),
-        "run":  load_frames("player_run",  4, scale_factor=PLAYER_SCALE_FACTOR),
-    }
-
-    # Floor tiles
-    assets["floor_tiles"] = load_floor_tiles()
-
-    # Health images
-    assets["health"] = load_frames("health", 6, scale_factor=HEALTH_SCALE_FACTOR)
-
-    #Bullet images
-    assets["bullets"] = load_frames("fireball", 6, scale_factor=FIREBALL_SCALE_FACTOR)
-    
-    #weapon images
-    assets["weapons"] = load_frames("firewand", 8, scale_factor=FIREWAND_SCALE_FACTOR)
+    """
+    Start loading every asset group on a thread pool.
+
+    Groups listed in EAGER_ASSET_GROUPS are waited on before returning; the
+    rest keep streaming in behind the first frames.
+
+    Returns:
+        AssetStore: Asset groups keyed by name
+    """
+    executor = ThreadPoolExecutor(max_workers=ASSET_LOADER_WORKERS,
+                                  thread_name_prefix="asset-loader")
+    assets = AssetStore()
+
+    # Player, floor tiles, health images, enemies, bullets and weapons
+    for group, specs in ASSET_GROUPS.items():
+        if isinstance(specs, dict):
+            assets[group] = PendingFrames({
+                name: load_frame_set(spec, executor=executor) for name, spec in specs.items()
+            })
+        else:
+            assets[group] = load_frame_set(specs, executor=executor)
+
     # Example coin image (uncomment if you have coin frames / images)
     # assets["coin"] = pygame.image.load(os.path.join("assets", "coin.png")).convert_alpha()
 
-    return assets
\ No newline at end of file
+    # Block only on what the first frame needs
+    for key in EAGER_ASSET_GROUPS:
+        assets[key]
+
+    # Let the pool wind down once the remaining groups are decoded
+    executor.shutdown(wait=False)
+
+    return assets
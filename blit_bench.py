@@ -0,0 +1,90 @@
+# blit_bench.py
+# Blit throughput of each sprite representation at in-game sprite counts
+
+import os
+import random
+import time
+
+import app
+
+# Sprites drawn per frame in a busy late-game wave, by asset
+SPRITE_COUNTS = {
+    "enemies": 300,
+    "player": 4,
+    "bullets": 150,    # Fireballs
+    "weapons": 20,
+    "health": 1,
+    "bullet squares": 300,
+    "coins": 500,
+}
+
+def frames_for(assets, group):
+    """Return every frame of an asset group as one list."""
+    frames = assets[group]
+    if isinstance(frames, dict):
+        return [frame for animation in frames.values() for frame in animation]
+    return list(frames)
+
+def time_blits(target, images, count, repeats):
+    """
+    Blit `count` sprites cycling through `images` across the target.
+
+    Returns:
+        float: Milliseconds per frame (best of `repeats`)
+    """
+    rng = random.Random(0)
+    width, height = target.get_size()
+    batch = [(images[i % len(images)], (rng.randrange(width - 64), rng.randrange(height - 64)))
+             for i in range(count)]
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        target.blits(batch, doreturn=False)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def benchmark(repeats=30):
+    """
+    Print the blit cost of each asset as loaded with convert_alpha() against
+    the representation chosen by app.optimize_surface.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.init()
+    screen = pygame.display.set_mode((app.WIDTH, app.HEIGHT))
+
+    optimize = app.OPTIMIZE_SURFACES
+    try:
+        app.OPTIMIZE_SURFACES = False
+        baseline = app.load_assets()
+        baseline = {group: frames_for(baseline, group) for group in baseline}
+    finally:
+        app.OPTIMIZE_SURFACES = optimize
+    optimized = {group: [app.optimize_surface(frame) for frame in frames]
+                 for group, frames in baseline.items()}
+
+    # Bullets and coins used to be SRCALPHA squares
+    for name, size, colour in (("bullet squares", 10, (255, 255, 255)),
+                               ("coins", 15, (255, 215, 0))):
+        square = pygame.Surface((size, size), pygame.SRCALPHA)
+        square.fill(colour)
+        baseline[name] = [square]
+        optimized[name] = [app.solid_image(size, colour)]
+
+    print(f"{'asset':<15}{'count':>6}  {'class':<9}{'before ms':>10}{'after ms':>10}"
+          f"{'blits/s after':>15}{'speedup':>9}")
+    total_before = total_after = 0.0
+    for name, count in SPRITE_COUNTS.items():
+        before = time_blits(screen, baseline[name], count, repeats)
+        after = time_blits(screen, optimized[name], count, repeats)
+        total_before += before
+        total_after += after
+        kinds = sorted({app.surface_class(image) for image in optimized[name]})
+        print(f"{name:<15}{count:>6}  {'/'.join(kinds):<9}{before:>10.3f}{after:>10.3f}"
+              f"{count / (after / 1000):>15,.0f}{before / after:>8.2f}x")
+    print(f"{'total':<15}{'':>6}  {'':<9}{total_before:>10.3f}{total_after:>10.3f}"
+          f"{'':>15}{total_before / total_after:>8.2f}x")
+    pygame.quit()
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,7 +1,140 @@
 from enemy import Enemy
 import app
 import random
+import threading
 import pygame
+import content
+from projectiles import AttackScript
+
+class BossFrameSet:
+    """
+    Pre-scaled animation frames for one enemy type at one boss scale,
+    along with their horizontally flipped variants and collision masks.
+    """
+
+    def __init__(self, frames, scale):
+        """
+        Args:
+            frames (list): The regular enemy animation frames
+            scale (float): Size multiplier applied to each frame
+        """
+        self.scale = scale
+        self.frames = [
+            pygame.transform.scale(
+                frame,
+                (int(frame.get_width() * scale),  # New width
+                 int(frame.get_height() * scale))  # New height
+            )
+            for frame in frames
+        ]
+        self.flipped = [pygame.transform.flip(frame, True, False) for frame in self.frames]
+        self.masks = [pygame.mask.from_surface(frame) for frame in self.frames]
+        self.flipped_masks = [pygame.mask.from_surface(frame) for frame in self.flipped]
+
+class BossAssetRegistry:
+    """
+    Cache of BossFrameSets keyed by (enemy type, scale) so spawning a boss
+    never has to rescale frames or rebuild masks.
+    """
+
+    def __init__(self, scales=None):
+        """
+        Args:
+            scales (tuple): Boss scale tiers to prepare for each enemy type
+                (default app.BOSS_SCALE_TIERS, read when used)
+        """
+        self.scales = scales
+        self.frame_sets = {}
+        self.lock = threading.Lock()
+        self.generation = 0  # Bumped by clear()
+
+    def get(self, enemy_type, enemy_assets, scale, generation=None):
+        """
+        Look up the frame set for an enemy type, preparing it if needed.
+
+        Args:
+            enemy_type (str): Type of enemy the boss is based on
+            enemy_assets (dict): Regular enemy animation frames
+            scale (float): Boss scale tier
+            generation (int): The registry's generation when enemy_assets
+                was read; a set built from frames older than the last
+                clear() is returned but not cached
+
+        Returns:
+            BossFrameSet: The prepared frames
+        """
+        key = (enemy_type, scale)
+        frame_set = self.frame_sets.get(key)
+        if frame_set is None:
+            with self.lock:
+                frame_set = self.frame_sets.get(key)
+                if frame_set is None:
+                    frame_set = BossFrameSet(enemy_assets[enemy_type], scale)
+                    if generation is None or generation == self.generation:
+                        self.frame_sets[key] = frame_set
+        return frame_set
+
+    def clear(self):
+        """Drop every frame set, e.g. after the enemy frames are reloaded."""
+        with self.lock:
+            self.frame_sets.clear()
+            self.generation += 1
+
+    @property
+    def tiers(self):
+        """Scale tiers in use, following app.BOSS_SCALE_TIERS unless fixed."""
+        return self.scales if self.scales is not None else app.BOSS_SCALE_TIERS
+
+    def prepare(self, enemy_assets, generation=None):
+        """
+        Prepare every enemy type at every scale tier, stopping early if the
+        registry is cleared meanwhile.
+
+        Args:
+            enemy_assets (dict): Regular enemy animation frames
+            generation (int): The registry's generation when enemy_assets
+                was read (default: the current one)
+        """
+        if generation is None:
+            generation = self.generation
+        for enemy_type in list(enemy_assets.keys()):
+            for scale in self.tiers:
+                if generation != self.generation:
+                    return
+                self.get(enemy_type, enemy_assets, scale, generation)
+
+    def prepare_in_background(self, assets):
+        """
+        Prepare all frame sets on a daemon thread during normal play.
+
+        Args:
+            assets (dict): Game assets; enemy frames are looked up on the
+                worker so a still-loading group doesn't block the caller
+        """
+        def prepare():
+            # Read the generation first, so frames swapped in by a reload
+            # that clears the registry afterwards are never cached
+            generation = self.generation
+            self.prepare(assets["enemies"], generation)
+
+        thread = threading.Thread(target=prepare, name="boss-assets", daemon=True)
+        thread.start()
+        return thread
+
+def boss_scale_for_level(level, every_levels, scales=None):
+    """
+    Pick the boss scale tier for a player level (one tier per boss wave,
+    clamped to the largest tier).
+
+    Args:
+        level (int): Player level
+        every_levels (int): Levels between boss waves
+        scales (tuple): Scale tiers (default app.BOSS_SCALE_TIERS)
+    """
+    if scales is None:
+        scales = app.BOSS_SCALE_TIERS
+    tier = max(0, level // every_levels - 1)
+    return scales[min(tier, len(scales) - 1)]
 
 class Boss(Enemy):
     """
@@ -10,7 +143,7 @@ class Boss(Enemy):
     Inherits from the base Enemy class.
     """
     
-    def __init__(self, x, y, enemy_assets, player, speed=2):
+    def __init__(self, x, y, enemy_assets, player, speed=2, registry=None, player_count=1):
         """
         Initialize a boss enemy with enhanced properties.
         
@@ -20,6 +153,8 @@ class Boss(Enemy):
             enemy_assets (dict): Dictionary containing animation frames for different enemy types
             player (Player): Reference to the player for difficulty scaling
             speed (float): Movement speed (default 2, slower than regular enemies)
+            registry (BossAssetRegistry): Cache of prepared boss frames
+            player_count (int): Players in the game (health scales with it)
         """
         # Randomly select an enemy type to use as the base for this boss
         enemy_type = random.choice(list(enemy_assets.keys()))
@@ -27,26 +162,36 @@ class Boss(Enemy):
         super().__init__(x, y, enemy_type, enemy_assets, speed)
         
         # Boss-specific health scaling - significantly higher than regular enemies
-        base_health = 50  # Base health value
-        if player.level <= 10: 
-            self.max_health = base_health * player.level  # Scale with player level
-        else: 
-            self.max_health = base_health * player.level * 5
+        self.max_health = content.current().boss_max_health(player.level)
+        self.max_health *= player_count  # Co-op bosses are tougher
         self.health = self.max_health  # Start at full health
         
-        # Scale up the boss sprite to make it visually distinct
-        boss_scale = 2  # Double the size of regular enemies (adjust as needed)
-        
-        # Resize all animation frames
-        self.frames = [
-            pygame.transform.scale(
-                frame, 
-                (int(frame.get_width() * boss_scale),  # New width
-                 int(frame.get_height() * boss_scale))  # New height
-            ) 
-            for frame in self.frames
-        ]
+        # Look up the scaled-up frames that make the boss visually distinct
+        if registry is None:
+            registry = BossAssetRegistry()
+        boss_scale = boss_scale_for_level(player.level, content.current().boss_every_levels,
+                                          registry.tiers)
+        self.frame_set = registry.get(enemy_type, enemy_assets, boss_scale)
+        self.frames = self.frame_set.frames
         
         # Update the current image and collision rectangle
         self.image = self.frames[self.frame_index]
-        self.rect = self.image.get_rect(center=(self.x, self.y))
\ No newline at end of file
+        self.rect = self.image.get_rect(center=(self.x, self.y))
+        self.mask = self.frame_set.masks[self.frame_index]
+
+        # Bullet-hell attack script, chosen by the level the boss appears at
+        self.attacks = AttackScript(player.level)
+
+    def animate(self):
+        """Update animation frame and keep the collision mask in sync."""
+        super().animate()
+        if self.facing_left:
+            self.mask = self.frame_set.flipped_masks[self.frame_index]
+        else:
+            self.mask = self.frame_set.masks[self.frame_index]
+
+    def display_image(self):
+        """Return the pre-flipped frame instead of flipping every draw."""
+        if self.facing_left:
+            return self.frame_set.flipped[self.frame_index]
+        return self.image
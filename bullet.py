@@ -31,9 +31,8 @@ class Bullet:
         # Combat properties
         self.damage = player.base_damage  # Damage based on player's current stats
 
-        # Create bullet visual representation
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)  # Transparent surface
-        self.image.fill((255, 255, 255))  # White bullet
+        # Shared opaque white square (no per-pixel alpha to blend)
+        self.image = app.solid_image(self.size, (255, 255, 255))
         self.rect = self.image.get_rect(center=(self.x, self.y))  # Collision rectangle
 
     def update(self):
@@ -4,8 +4,7 @@ class Coin:
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.image = app.pygame.Surface((15, 15), app.pygame.SRCALPHA)
-        self.image.fill((255, 215, 0))
+        self.image = app.solid_image(15, (255, 215, 0))  # Shared opaque square
         self.rect = self.image.get_rect(center=(self.x, self.y))
 
     def draw(self, surface):
@@ -0,0 +1,146 @@
+# combat.py
+# Per-tick combat event queue: collision checks record hits, one pass resolves them
+
+from array import array
+
+import numpy as np
+
+import app
+
+BOSS = -1  # Target of hits on the boss (it isn't kept in an EntityStore)
+
+def masks_overlap(a, b):
+    """
+    Pixel-perfect check for two sprites whose rects already overlap.
+
+    Uses a sprite's own `mask` when it keeps one (bosses) and otherwise
+    the cached mask of its current image, so no mask is built per check.
+
+    Args:
+        a: Sprite with `image` and `rect`
+        b: Sprite with `image` and `rect`
+
+    Returns:
+        bool: True if any solid pixels overlap
+    """
+    a_mask = getattr(a, "mask", None)
+    if a_mask is None:
+        a_mask = app.frame_mask(a.image)
+    b_mask = getattr(b, "mask", None)
+    if b_mask is None:
+        b_mask = app.frame_mask(b.image)
+    offset = (b.rect.x - a.rect.x, b.rect.y - a.rect.y)
+    return a_mask.overlap(b_mask, offset) is not None
+
+class CombatQueue:
+    """
+    Hits and knockback impulses found by one tick's collision checks.
+
+    Detection only appends compact records here (target handle, damage
+    and hit position; or an impulse source and distance). Game.resolve_combat
+    then applies the whole tick at once in stages: damage totals, deaths,
+    drop rolls and knockback.
+
+    The damage queued so far is also summed per target, so detection can
+    treat a target that already has lethal damage queued as gone (as if it
+    had been removed on the first killing hit) and let later bullets fly on.
+    """
+
+    def __init__(self):
+        self.targets = array("q")   # Entity handle hit, or BOSS
+        self.damage = array("d")
+        self.hit_x = array("d")     # Where each hit landed, for effects
+        self.hit_y = array("d")
+        self.impulse_x = array("d")  # Knockback sources
+        self.impulse_y = array("d")
+        self.impulse_distance = array("d")
+        self.pending = {}  # Target -> damage queued this tick
+
+    def hit(self, target, damage, x, y):
+        """
+        Record a hit.
+
+        Args:
+            target (int): Entity handle, or BOSS
+            damage (float): Damage dealt
+            x (float): World x-coordinate of the hit
+            y (float): World y-coordinate of the hit
+        """
+        self.targets.append(target)
+        self.damage.append(damage)
+        self.hit_x.append(x)
+        self.hit_y.append(y)
+        self.pending[target] = self.pending.get(target, 0.0) + damage
+
+    def lethal(self, target, health):
+        """
+        Check whether the hits already queued will kill a target.
+
+        Args:
+            target (int): Entity handle, or BOSS
+            health (float): The target's health before this tick's hits
+
+        Returns:
+            bool: True if the target has been hit and the queued damage is
+                at least its health
+        """
+        pending = self.pending.get(target)
+        return pending is not None and pending >= health
+
+    def impulse(self, x, y, distance):
+        """
+        Record a knockback pushing nearby enemies away from a point.
+
+        Args:
+            x (float): Source x-coordinate
+            y (float): Source y-coordinate
+            distance (float): Knockback distance
+        """
+        self.impulse_x.append(x)
+        self.impulse_y.append(y)
+        self.impulse_distance.append(distance)
+
+    def clear(self):
+        """Drop every recorded event."""
+        for buffer in (self.targets, self.damage, self.hit_x, self.hit_y,
+                       self.impulse_x, self.impulse_y, self.impulse_distance):
+            del buffer[:]
+        self.pending.clear()
+
+    def damage_totals(self):
+        """
+        Sum the damage each target took this tick.
+
+        Returns:
+            tuple: (targets, total damage, index of each target's first hit)
+                arrays, in the order the targets were first hit
+        """
+        targets = np.array(self.targets, np.int64)
+        unique, first, inverse = np.unique(targets, return_index=True, return_inverse=True)
+        totals = np.bincount(inverse, weights=np.array(self.damage, np.float64))
+        order = np.argsort(first)
+        return unique[order], totals[order], first[order]
+
+    def knockbacks(self, xs, ys, radius):
+        """
+        Find what each impulse pushes: positions within radius of its source.
+
+        Args:
+            xs (np.ndarray): Enemy x-coordinates
+            ys (np.ndarray): Enemy y-coordinates
+            radius (float): Reach of an impulse
+
+        Returns:
+            list: (indices, unit dx, unit dy, distance) per impulse, where
+                indices select the pushed positions
+        """
+        pushes = []
+        for px, py, distance in zip(self.impulse_x, self.impulse_y, self.impulse_distance):
+            dx = xs - px
+            dy = ys - py
+            length_sq = dx * dx + dy * dy
+            # Nothing at the exact source point has a direction to move in
+            indices = np.flatnonzero((length_sq <= radius * radius) & (length_sq > 0))
+            length = np.sqrt(length_sq[indices])
+            pushes.append((indices, dx[indices] / length, dy[indices] / length, distance))
+        return pushes
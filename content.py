@@ -0,0 +1,303 @@
+# content.py
+# Enemy, upgrade, drop and boss definitions compiled into lookup tables
+
+import bisect
+import hashlib
+import json
+import os
+import pickle
+
+import app
+
+# Bump when the compiled layout or validation changes so stale caches are rebuilt
+COMPILER_VERSION = 2
+
+# Levels covered by the precomputed scaling tables (higher levels clamp)
+TABLE_LEVELS = 1000
+
+# Drop items
+DROP_NONE = 0
+DROP_COIN = 1
+DROP_WEAPON = 2
+DROP_ITEMS = {"coin": DROP_COIN, "weapon": DROP_WEAPON}
+
+# Upgrade effect targets and operations
+TARGET_PLAYER = 0
+TARGET_GAME = 1
+TARGETS = {"player": TARGET_PLAYER, "game": TARGET_GAME}
+OP_ADD = 0
+OP_MUL = 1
+OP_HEAL = 2
+OPS = {"add": OP_ADD, "mul": OP_MUL, "heal": OP_HEAL}
+# Numeric attributes upgrades may change on each target
+TARGET_STATS = {
+    TARGET_PLAYER: {"speed", "health", "max_health", "bullet_speed", "bullet_size",
+                    "bullet_count", "shoot_cooldown", "base_damage", "weapon_durability"},
+    TARGET_GAME: {"pierce_level", "xp_value", "xp_scale_factor", "enemy_spawn_interval",
+                  "enemies_per_spawn"},
+}
+
+class Content:
+    """
+    Compiled game content. Enemy stats are lists indexed by the integer
+    type id (the position in app.ENEMY_TYPES); level scaling is a table
+    indexed by level; upgrades are dicts with their effects compiled to
+    (target, attribute, operation, value) tuples.
+    """
+
+    def __init__(self, source_hash):
+        self.source_hash = source_hash
+        self.enemy_health = []       # Base health by type id
+        self.enemy_speed = []        # Speed by type id
+        self.enemy_drop_chances = []  # Cumulative drop chances by type id
+        self.enemy_drop_items = []    # Item for each cumulative chance by type id
+        self.health_bonus = []       # Enemy health bonus by level
+        self.boss_health = []        # Boss health by level (one player)
+        self.boss_speed = 2
+        self.boss_every_levels = 5
+        self.upgrades = []           # Upgrade dicts in id order
+
+    def enemy_health_bonus(self, level):
+        """Extra enemy health at a player level."""
+        return self.health_bonus[min(level, TABLE_LEVELS - 1)]
+
+    def boss_max_health(self, level):
+        """Boss health at a player level for a single player."""
+        return self.boss_health[min(level, TABLE_LEVELS - 1)]
+
+    def roll_drop(self, type_id, roll):
+        """
+        Pick what an enemy drops.
+
+        Args:
+            type_id (int): Enemy type id
+            roll (float): Uniform random number in [0, 1)
+
+        Returns:
+            int: DROP_NONE, DROP_COIN or DROP_WEAPON
+        """
+        chances = self.enemy_drop_chances[type_id]
+        index = bisect.bisect_right(chances, roll)
+        return self.enemy_drop_items[type_id][index] if index < len(chances) else DROP_NONE
+
+def apply_effects(effects, player, game):
+    """Apply compiled upgrade effects to a player and the game."""
+    for target, stat, op, value in effects:
+        obj = player if target == TARGET_PLAYER else game
+        current = getattr(obj, stat)
+        if op == OP_ADD:
+            setattr(obj, stat, current + value)
+        elif op == OP_MUL:
+            setattr(obj, stat, current * value)
+        elif current >= player.max_health:  # OP_HEAL
+            setattr(obj, stat, player.max_health)  # Cap at max health
+        elif current <= 1:
+            setattr(obj, stat, current + value + 1)  # Bigger heal when very low
+        else:
+            setattr(obj, stat, current + value)
+
+# --------------------------------------------------------------------------
+#                         VALIDATION AND COMPILING
+# --------------------------------------------------------------------------
+
+def _fail(where, message):
+    raise ValueError(f"{where} {message}")
+
+def _number(data, key, where, default=None, minimum=None):
+    value = data.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        _fail(where, f"'{key}' must be a number")
+    if minimum is not None and value < minimum:
+        _fail(where, f"'{key}' must be at least {minimum}")
+    return value
+
+def _compile_bands(bands, where):
+    """
+    Compile level bands into a table indexed by level. The first band whose
+    [min_level, max_level] range contains a level gives
+    per_level * level + bonus.
+    """
+    if not isinstance(bands, list) or not bands:
+        _fail(where, "must be a non-empty list of level bands")
+    compiled = []
+    for i, band in enumerate(bands):
+        band_where = f"{where}[{i}]"
+        if not isinstance(band, dict):
+            _fail(band_where, "must be an object")
+        compiled.append((_number(band, "min_level", band_where, 0),
+                         _number(band, "max_level", band_where, TABLE_LEVELS),
+                         _number(band, "per_level", band_where, 0),
+                         _number(band, "bonus", band_where, 0)))
+    if compiled[-1][:2] != (0, TABLE_LEVELS):
+        _fail(where, "must end with a band covering every level")
+
+    table = []
+    for level in range(TABLE_LEVELS):
+        for low, high, per_level, bonus in compiled:
+            if low <= level <= high:
+                table.append(per_level * level + bonus)
+                break
+    return table
+
+def compile_content(data, source_hash):
+    """
+    Validate parsed content and build the lookup tables.
+
+    Raises:
+        ValueError: If the content is malformed
+    """
+    content = Content(source_hash)
+    if not isinstance(data, dict):
+        _fail("content", "must be a JSON object")
+
+    drop_tables = data.get("drop_tables", {})
+    compiled_drops = {}
+    for name, entries in drop_tables.items():
+        where = f"drop_tables.{name}"
+        if not isinstance(entries, list):
+            _fail(where, "must be a list")
+        chances, items, total = [], [], 0.0
+        for i, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                _fail(f"{where}[{i}]", "must be an object")
+            if entry.get("item") not in DROP_ITEMS:
+                _fail(f"{where}[{i}]", f"'item' must be one of {sorted(DROP_ITEMS)}")
+            total += _number(entry, "chance", f"{where}[{i}]", minimum=0)
+            chances.append(total)
+            items.append(DROP_ITEMS[entry["item"]])
+        if total > 1 + 1e-9:
+            _fail(where, "chances add up to more than 1")
+        compiled_drops[name] = (chances, items)
+
+    enemies = data.get("enemies")
+    if not isinstance(enemies, dict):
+        _fail("enemies", "must be an object keyed by enemy type")
+    # Type ids are part of the snapshot, telemetry and network formats
+    if sorted(enemies) != sorted(app.ENEMY_TYPES):
+        _fail("enemies", f"must define exactly the types in app.ENEMY_TYPES {app.ENEMY_TYPES}")
+    for name in app.ENEMY_TYPES:
+        enemy = enemies[name]
+        where = f"enemies.{name}"
+        if not isinstance(enemy, dict):
+            _fail(where, "must be an object")
+        content.enemy_health.append(_number(enemy, "health", where, minimum=0))
+        content.enemy_speed.append(_number(enemy, "speed", where, app.DEFAULT_ENEMY_SPEED, 0))
+        drops = enemy.get("drops")
+        if drops is None:
+            chances, items = [], []
+        elif drops in compiled_drops:
+            chances, items = compiled_drops[drops]
+        else:
+            _fail(where, f"uses unknown drop table '{drops}'")
+        content.enemy_drop_chances.append(chances)
+        content.enemy_drop_items.append(items)
+
+    content.health_bonus = _compile_bands(data.get("enemy_health_bonus"), "enemy_health_bonus")
+
+    boss = data.get("boss")
+    if not isinstance(boss, dict):
+        _fail("boss", "must be an object")
+    content.boss_speed = _number(boss, "speed", "boss", 2, 0)
+    content.boss_every_levels = int(_number(boss, "every_levels", "boss", 5, 1))
+    content.boss_health = _compile_bands(boss.get("health"), "boss.health")
+
+    upgrades = data.get("upgrades")
+    if not isinstance(upgrades, list) or not upgrades:
+        _fail("upgrades", "must be a non-empty list")
+    names = set()
+    for upgrade_id, upgrade in enumerate(upgrades):
+        where = f"upgrades[{upgrade_id}]"
+        if not isinstance(upgrade, dict):
+            _fail(where, "must be an object")
+        name = upgrade.get("name")
+        if not isinstance(name, str) or not name or name in names or "," in name or "|" in name:
+            _fail(where, "needs a unique 'name' without ',' or '|'")
+        names.add(name)
+        effects = []
+        for i, effect in enumerate(upgrade.get("effects", [])):
+            effect_where = f"{where}.effects[{i}]"
+            if not isinstance(effect, dict):
+                _fail(effect_where, "must be an object")
+            if effect.get("target") not in TARGETS:
+                _fail(effect_where, f"'target' must be one of {sorted(TARGETS)}")
+            if effect.get("op") not in OPS:
+                _fail(effect_where, f"'op' must be one of {sorted(OPS)}")
+            stats = TARGET_STATS[TARGETS[effect["target"]]]
+            if effect.get("stat") not in stats:
+                _fail(effect_where, f"'stat' must be one of {sorted(stats)} "
+                                    f"for target '{effect['target']}'")
+            effects.append((TARGETS[effect["target"]], effect["stat"], OPS[effect["op"]],
+                            _number(effect, "value", effect_where)))
+        color = upgrade.get("color", [255, 255, 255])
+        if not (isinstance(color, list) and len(color) == 3
+                and all(isinstance(c, int) and 0 <= c <= 255 for c in color)):
+            _fail(where, "'color' must be [r, g, b]")
+        content.upgrades.append({
+            "id": upgrade_id,
+            "name": name,
+            "desc": str(upgrade.get("desc", "")),
+            "weight": _number(upgrade, "weight", where, minimum=0),
+            "min_level": int(_number(upgrade, "min_level", where, 1)),
+            "color": tuple(color),
+            "unique": bool(upgrade.get("unique", False)),
+            "requires_missing_health": bool(upgrade.get("requires_missing_health", False)),
+            "effects": tuple(effects),
+        })
+    return content
+
+def load_content(path=None, cache_path=None):
+    """
+    Load compiled content, reusing the on-disk cache while the content
+    file is unchanged.
+
+    Args:
+        path (str): Content JSON file (default app.CONTENT_PATH)
+        cache_path (str): Compiled cache file (default app.CONTENT_CACHE_PATH,
+            None to skip caching)
+
+    Returns:
+        Content: The compiled content
+
+    Raises:
+        ValueError: If the content file is malformed
+    """
+    path = path or app.CONTENT_PATH
+    cache_path = cache_path if cache_path is not None else app.CONTENT_CACHE_PATH
+    with open(path, "rb") as f:
+        source = f.read()
+    source_hash = hashlib.sha256(source).hexdigest()
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                version, cached = pickle.load(f)
+            if version == COMPILER_VERSION and cached.source_hash == source_hash:
+                return cached
+        except (OSError, EOFError, ValueError, AttributeError, pickle.UnpicklingError):
+            pass  # Unreadable or outdated cache; rebuild it
+
+    try:
+        content = compile_content(json.loads(source), source_hash)
+    except ValueError as exc:  # Includes json.JSONDecodeError
+        raise ValueError(f"{path}: {exc}") from None
+    if cache_path:
+        try:
+            with open(cache_path, "wb") as f:
+                pickle.dump((COMPILER_VERSION, content), f, pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # Caching is only an optimisation
+    return content
+
+_current = None
+
+def current():
+    """Return the content loaded for this process, loading it on first use."""
+    global _current
+    if _current is None:
+        _current = load_content()
+    return _current
+
+def replace_current(compiled):
+    """Make newly compiled content the process-wide content (hot reload)."""
+    global _current
+    _current = compiled
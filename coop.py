@@ -0,0 +1,598 @@
+# coop.py
+# Co-op mode: an authoritative asyncio UDP server running the Game
+# simulation for 2-4 players, and clients that predict their own movement
+
+import argparse
+import asyncio
+import collections
+import math
+import os
+import random
+import struct
+import time
+
+import app
+import replay
+
+# --------------------------------------------------------------------------
+#                               PROTOCOL
+# --------------------------------------------------------------------------
+
+JOIN = 0
+INPUT = 1
+WELCOME = 2
+SNAPSHOT = 3
+
+# kind
+JOIN_PACKET = struct.Struct("<B")
+# kind, player index, own entity id
+WELCOME_PACKET = struct.Struct("<BBH")
+# kind, input seq, last snapshot tick received, client time, dir x, dir y,
+# shoot, aim x, aim y, upgrade choice (-1 for none)
+INPUT_PACKET = struct.Struct("<BIIdbbBhhb")
+# kind, tick, baseline tick (0 = full), last input seq applied, echoed client
+# time, own speed, changed count, removed count, flags
+SNAPSHOT_HEADER = struct.Struct("<BIIIdfHHB")
+# entity id, entity kind, subtype (enemy type), x, y, health (0-255)
+ENTITY_RECORD = struct.Struct("<HBBhhB")
+REMOVED_RECORD = struct.Struct("<H")
+
+# Entity kinds
+PLAYER, ENEMY, BOSS, BULLET, FIREBALL, COIN, WEAPON = range(7)
+
+# Snapshot flags
+FLAG_GAME_OVER = 1
+FLAG_LEVEL_UP_MENU = 2
+FLAG_PARTIAL = 4  # Too many changes to fit; don't use as a baseline
+
+# Positions are sent in half-pixel units
+POSITION_SCALE = 2
+# Keep datagrams well under the 64 KB UDP limit
+MAX_DATAGRAM = 60000
+# Snapshots kept on both ends for delta baselines
+SNAPSHOT_HISTORY = 64
+
+def quantize(value):
+    return max(-32768, min(32767, int(round(value * POSITION_SCALE))))
+
+def encode_snapshot(tick, baseline_tick, baseline, state, last_seq, echo_time, speed, flags):
+    """
+    Pack a snapshot as a delta against the baseline state.
+
+    Args:
+        tick (int): Server tick of this snapshot
+        baseline_tick (int): Tick of the baseline (0 when sending everything)
+        baseline (dict): entity id -> record tuple the client already has
+        state (dict): entity id -> record tuple now
+        last_seq (int): Last input sequence number applied for this client
+        echo_time (float): Client time from that input, for RTT measurement
+        speed (float): The client's player speed, for prediction
+        flags (int): FLAG_* bits
+
+    Returns:
+        tuple: (datagram bytes, number of changed entities)
+    """
+    changed = [(entity_id, record) for entity_id, record in state.items()
+               if baseline.get(entity_id) != record]
+    removed = [entity_id for entity_id in baseline if entity_id not in state]
+
+    room = (MAX_DATAGRAM - SNAPSHOT_HEADER.size) // ENTITY_RECORD.size
+    if len(changed) + len(removed) > room:
+        flags |= FLAG_PARTIAL
+        removed = removed[:room]
+        changed = changed[:room - len(removed)]
+
+    parts = [SNAPSHOT_HEADER.pack(SNAPSHOT, tick, baseline_tick, last_seq, echo_time,
+                                  speed, len(changed), len(removed), flags)]
+    parts.extend(ENTITY_RECORD.pack(entity_id, *record) for entity_id, record in changed)
+    parts.extend(REMOVED_RECORD.pack(entity_id) for entity_id in removed)
+    return b"".join(parts), len(changed)
+
+def decode_snapshot(data):
+    """
+    Returns:
+        tuple: (header fields, changed {id: record}, removed [ids])
+    """
+    header = SNAPSHOT_HEADER.unpack_from(data, 0)
+    changed_count, removed_count = header[6], header[7]
+    offset = SNAPSHOT_HEADER.size
+    changed = {}
+    for _ in range(changed_count):
+        entity_id, *record = ENTITY_RECORD.unpack_from(data, offset)
+        changed[entity_id] = tuple(record)
+        offset += ENTITY_RECORD.size
+    removed = [REMOVED_RECORD.unpack_from(data, offset + i * REMOVED_RECORD.size)[0]
+               for i in range(removed_count)]
+    return header, changed, removed
+
+# --------------------------------------------------------------------------
+#                                 SERVER
+# --------------------------------------------------------------------------
+
+class ClientSlot:
+    """Server-side state for one connected client."""
+
+    def __init__(self, address, player):
+        self.address = address
+        self.player = player
+        self.last_seq = 0
+        self.last_client_time = 0.0
+        self.ack_tick = 0
+        self.shoot = None  # Pending (aim x, aim y)
+        self.upgrade_choice = -1
+
+class CoopServer(asyncio.DatagramProtocol):
+    """
+    Authoritative co-op server.
+
+    Runs Game.update at TICK_RATE, applies the latest input from each
+    client, and every TICK_RATE / snapshot_rate ticks sends each client a
+    quantized snapshot delta-compressed against the last one it acknowledged.
+    """
+
+    def __init__(self, game, max_players=4, snapshot_rate=20):
+        """
+        Args:
+            game (Game): Headless game to simulate
+            max_players (int): Most clients accepted (2-4)
+            snapshot_rate (int): Snapshots per second sent to each client
+        """
+        self.game = game
+        self.max_players = max_players
+        self.snapshot_every = max(1, app.TICK_RATE // snapshot_rate)
+        self.clients = {}  # address -> ClientSlot
+        self.transport = None
+        self.tick = 0
+        self.history = collections.OrderedDict()  # tick -> state
+        self.next_entity_id = 1
+        self.live_ids = set()  # Ids in the last capture, plus any handed out since
+        self.report = []  # (tick, bytes sent, entities changed, clients)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, address):
+        kind = data[0]
+        if kind == JOIN:
+            self.handle_join(address)
+        elif kind == INPUT and address in self.clients:
+            (_, seq, ack_tick, client_time, dir_x, dir_y, shoot,
+             aim_x, aim_y, choice) = INPUT_PACKET.unpack(data)
+            slot = self.clients[address]
+            if seq <= slot.last_seq:
+                return  # Old or duplicate input
+            slot.last_seq = seq
+            slot.last_client_time = client_time
+            slot.ack_tick = max(slot.ack_tick, ack_tick)
+            slot.player.remote_move = (max(-1, min(1, dir_x)), max(-1, min(1, dir_y)))
+            if shoot:
+                slot.shoot = (aim_x, aim_y)
+            if choice >= 0:
+                slot.upgrade_choice = choice
+
+    def handle_join(self, address):
+        slot = self.clients.get(address)
+        if slot is None:
+            if len(self.clients) >= self.max_players:
+                return
+            if not self.clients:
+                # The first client drives the lead player
+                player = self.game.player
+                player.remote = True
+            else:
+                player = self.game.add_player(remote=True)
+            slot = ClientSlot(address, player)
+            self.clients[address] = slot
+        index = self.game.players.index(slot.player)
+        self.transport.sendto(WELCOME_PACKET.pack(WELCOME, index, self.entity_id(slot.player)),
+                              address)
+
+    def entity_id(self, obj):
+        """Return the stable network id of a game object."""
+        entity_id = getattr(obj, "net_id", None)
+        if entity_id is None:
+            # Ids wrap at 16 bits; skip any still held by a live object
+            if len(self.live_ids) >= 65535:
+                raise OverflowError("No free co-op entity ids")
+            entity_id = self.next_entity_id
+            while entity_id in self.live_ids:
+                entity_id = entity_id % 65535 + 1
+            self.next_entity_id = entity_id % 65535 + 1
+            self.live_ids.add(entity_id)
+            obj.net_id = entity_id
+        return entity_id
+
+    def capture(self):
+        """
+        Quantize every entity into snapshot records.
+
+        Returns:
+            dict: entity id -> (kind, subtype, x, y, health)
+        """
+        state = {}
+        entity_id = self.entity_id
+
+        def health(obj):
+            return int(255 * max(0, min(1, obj.health / obj.max_health))) if obj.max_health else 0
+
+        for player in self.game.players:
+            state[entity_id(player)] = (PLAYER, player.facing_left,
+                                        quantize(player.x), quantize(player.y), health(player))
+            for bullet in player.bullets:
+                kind = FIREBALL if hasattr(bullet, "animation") else BULLET
+                state[entity_id(bullet)] = (kind, 0, quantize(bullet.x), quantize(bullet.y), 0)
+            if player.equipped_weapon:
+                weapon = player.equipped_weapon
+                state[entity_id(weapon)] = (WEAPON, weapon.facing_left,
+                                            quantize(weapon.x), quantize(weapon.y), 0)
+        for enemy in self.game.enemies:
+            state[entity_id(enemy)] = (ENEMY, app.ENEMY_TYPE_IDS[enemy.enemy_type],
+                                       quantize(enemy.x), quantize(enemy.y), health(enemy))
+        if self.game.boss is not None:
+            boss = self.game.boss
+            state[entity_id(boss)] = (BOSS, app.ENEMY_TYPE_IDS[boss.enemy_type],
+                                      quantize(boss.x), quantize(boss.y), health(boss))
+        for coin in self.game.coins:
+            state[entity_id(coin)] = (COIN, 0, quantize(coin.x), quantize(coin.y), 0)
+        for weapon in self.game.weapons:
+            state[entity_id(weapon)] = (WEAPON, 0, quantize(weapon.x), quantize(weapon.y), 0)
+        # Ids of objects gone since the last capture can be handed out again
+        self.live_ids = set(state)
+        return state
+
+    def step(self):
+        """Run one simulation tick with the latest client inputs."""
+        game = self.game
+        self.tick += 1
+
+        for slot in self.clients.values():
+            if slot.shoot is not None and slot.player.health > 0:
+                slot.player.shoot_toward_position(*slot.shoot)
+                slot.shoot = None
+
+        if game.in_level_up_menu:
+            # The lead player's client picks the upgrade
+            for slot in self.clients.values():
+                if slot.player is game.player and slot.upgrade_choice >= 0:
+                    # Same path as a local pick, so the level warm-up is taken
+                    game.perform(replay.UPGRADE, slot.upgrade_choice)
+        elif not game.game_over:
+            game.update()
+        for slot in self.clients.values():
+            slot.upgrade_choice = -1
+
+        if self.tick % self.snapshot_every == 0:
+            self.send_snapshots()
+
+    def send_snapshots(self):
+        state = self.capture()
+        self.history[self.tick] = state
+        while len(self.history) > SNAPSHOT_HISTORY:
+            self.history.popitem(last=False)
+
+        flags = (FLAG_GAME_OVER if self.game.game_over else 0) | \
+                (FLAG_LEVEL_UP_MENU if self.game.in_level_up_menu else 0)
+        sent = 0
+        changed_total = 0
+        for slot in self.clients.values():
+            baseline_tick = slot.ack_tick if slot.ack_tick in self.history else 0
+            baseline = self.history[baseline_tick] if baseline_tick else {}
+            data, changed = encode_snapshot(self.tick, baseline_tick, baseline, state,
+                                            slot.last_seq, slot.last_client_time,
+                                            slot.player.speed, flags)
+            self.transport.sendto(data, slot.address)
+            sent += len(data)
+            changed_total += changed
+        self.report.append((self.tick, sent, changed_total, len(self.clients)))
+
+    async def serve(self, duration=None):
+        """
+        Run the fixed-rate simulation loop.
+
+        Args:
+            duration (float): Stop after this many seconds (None runs forever)
+        """
+        tick_seconds = 1.0 / app.TICK_RATE
+        start = next_tick = time.perf_counter()
+        while duration is None or time.perf_counter() - start < duration:
+            self.step()
+            next_tick += tick_seconds
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+# --------------------------------------------------------------------------
+#                                 CLIENT
+# --------------------------------------------------------------------------
+
+class CoopClient(asyncio.DatagramProtocol):
+    """
+    Co-op client.
+
+    Sends input every tick, rebuilds world state from delta snapshots and
+    predicts its own player's movement by replaying unacknowledged inputs
+    on top of the latest authoritative position.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self.player_index = None
+        self.player_id = None
+        self.joined = asyncio.Event()
+        self.seq = 0
+        self.pending_inputs = collections.deque()  # (seq, dir x, dir y)
+        self.states = collections.OrderedDict()  # tick -> {id: record}
+        self.latest_tick = 0
+        self.ack_tick = 0
+        self.entities = {}
+        self.flags = 0
+        self.speed = app.PLAYER_SPEED
+        self.predicted = None  # (x, y) of our own player
+        self.prediction_errors = []  # Pixels between prediction and server
+        self.rtts = []  # (server tick, round trip seconds)
+        self.bytes_received = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.sendto(JOIN_PACKET.pack(JOIN))
+
+    def datagram_received(self, data, address):
+        self.bytes_received += len(data)
+        kind = data[0]
+        if kind == WELCOME:
+            _, self.player_index, self.player_id = WELCOME_PACKET.unpack(data)
+            self.joined.set()
+        elif kind == SNAPSHOT:
+            self.apply_snapshot(data)
+
+    def apply_snapshot(self, data):
+        header, changed, removed = decode_snapshot(data)
+        (_, tick, baseline_tick, last_seq, echo_time, speed, _, _, flags) = header
+        if tick <= self.latest_tick:
+            return  # Out of order
+        if baseline_tick and baseline_tick not in self.states:
+            return  # Baseline already forgotten; wait for the next one
+
+        state = dict(self.states[baseline_tick]) if baseline_tick else {}
+        state.update(changed)
+        for entity_id in removed:
+            state.pop(entity_id, None)
+
+        self.latest_tick = tick
+        self.entities = state
+        self.flags = flags
+        self.speed = speed
+        if not flags & FLAG_PARTIAL:
+            self.states[tick] = state
+            self.ack_tick = tick
+            while len(self.states) > SNAPSHOT_HISTORY:
+                self.states.popitem(last=False)
+        if echo_time:
+            self.rtts.append((tick, time.perf_counter() - echo_time))
+        self.reconcile(last_seq)
+
+    def reconcile(self, last_seq):
+        """Reset to the server position and replay inputs it hasn't applied."""
+        record = self.entities.get(self.player_id)
+        if record is None:
+            return
+        server_x = record[2] / POSITION_SCALE
+        server_y = record[3] / POSITION_SCALE
+        while self.pending_inputs and self.pending_inputs[0][0] <= last_seq:
+            self.pending_inputs.popleft()
+        if self.predicted is not None:
+            # Compare with what we predicted for the same point in time
+            x, y = server_x, server_y
+            for _, dir_x, dir_y in self.pending_inputs:
+                x, y = self.predict_step(x, y, dir_x, dir_y)
+            self.prediction_errors.append(math.hypot(x - self.predicted[0], y - self.predicted[1]))
+        x, y = server_x, server_y
+        for _, dir_x, dir_y in self.pending_inputs:
+            x, y = self.predict_step(x, y, dir_x, dir_y)
+        self.predicted = (x, y)
+
+    def predict_step(self, x, y, dir_x, dir_y):
+        """Mirror Player.move for one tick."""
+        x = max(0, min(x + dir_x * self.speed, app.WORLD_WIDTH))
+        y = max(0, min(y + dir_y * self.speed, app.WORLD_HEIGHT))
+        return x, y
+
+    def send_input(self, dir_x, dir_y, aim=None, upgrade_choice=-1):
+        """
+        Send this tick's input and apply it to the predicted position.
+
+        Args:
+            dir_x (int): -1, 0 or 1
+            dir_y (int): -1, 0 or 1
+            aim (tuple): Point to shoot toward, or None
+            upgrade_choice (int): Upgrade menu option, or -1
+        """
+        self.seq += 1
+        aim_x, aim_y = aim if aim else (0, 0)
+        self.transport.sendto(INPUT_PACKET.pack(
+            INPUT, self.seq, self.ack_tick, time.perf_counter(), dir_x, dir_y,
+            aim is not None, int(aim_x), int(aim_y), upgrade_choice))
+        self.pending_inputs.append((self.seq, dir_x, dir_y))
+        if self.predicted is not None:
+            self.predicted = self.predict_step(*self.predicted, dir_x, dir_y)
+
+async def run_bot(client, duration):
+    """Drive a client with random movement and shooting for testing."""
+    await client.joined.wait()
+    tick_seconds = 1.0 / app.TICK_RATE
+    dir_x, dir_y = 0, 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        if random.random() < 0.05:
+            dir_x, dir_y = random.choice((-1, 0, 1)), random.choice((-1, 0, 1))
+        aim = None
+        if random.random() < 0.1 and client.predicted is not None:
+            # Somewhere on the bot's own screen
+            aim = (client.predicted[0] + random.randint(-app.WIDTH // 2, app.WIDTH // 2),
+                   client.predicted[1] + random.randint(-app.HEIGHT // 2, app.HEIGHT // 2))
+        choice = 0 if client.flags & FLAG_LEVEL_UP_MENU else -1
+        client.send_input(dir_x, dir_y, aim, choice)
+        await asyncio.sleep(tick_seconds)
+
+# --------------------------------------------------------------------------
+#                              ENTRY POINTS
+# --------------------------------------------------------------------------
+
+def make_headless_game(record=True):
+    """
+    Create a Game that needs no window (for the server).
+
+    Args:
+        record (bool): Keep run history and telemetry (False for test runs)
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if not record:
+        app.TELEMETRY_FOLDER = None
+        app.RUN_HISTORY_PATH = ":memory:"  # Keep bot runs off the real leaderboard
+    from game import Game
+    return Game()
+
+async def run_local_session(players=2, seconds=5.0, port=0, snapshot_rate=20):
+    """
+    Run a server and bot clients over localhost UDP and print a
+    bandwidth/latency report for every snapshot tick.
+
+    Returns:
+        tuple: (server, clients)
+    """
+    loop = asyncio.get_running_loop()
+    server = CoopServer(make_headless_game(record=False), players, snapshot_rate)
+    transport, _ = await loop.create_datagram_endpoint(lambda: server,
+                                                       local_addr=("127.0.0.1", port))
+    address = transport.get_extra_info("sockname")
+
+    clients = []
+    for _ in range(players):
+        _, client = await loop.create_datagram_endpoint(CoopClient, remote_addr=address)
+        clients.append(client)
+
+    await asyncio.gather(server.serve(seconds), *(run_bot(c, seconds) for c in clients))
+    server.game.close()
+    transport.close()
+    for client in clients:
+        client.transport.close()
+
+    rtts = collections.defaultdict(list)
+    for client in clients:
+        for tick, rtt in client.rtts:
+            rtts[tick].append(rtt)
+    print(f"{'tick':>6} {'bytes':>7} {'changed':>8} {'clients':>8} {'rtt ms':>8}")
+    for tick, sent, changed, connected in server.report:
+        samples = rtts.get(tick)
+        rtt = f"{1000 * sum(samples) / len(samples):8.2f}" if samples else f"{'-':>8}"
+        print(f"{tick:6d} {sent:7d} {changed:8d} {connected:8d} {rtt}")
+    total = sum(sent for _, sent, _, _ in server.report)
+    errors = [e for c in clients for e in c.prediction_errors]
+    print(f"total {total} bytes in {seconds:g}s ({total / seconds / 1024:.1f} KiB/s), "
+          f"mean prediction error {sum(errors) / max(1, len(errors)):.2f}px")
+    return server, clients
+
+async def run_viewer(host, port):
+    """Play as a co-op client in a window."""
+    import pygame
+    from boss import BossAssetRegistry
+    from world import Camera
+    pygame.init()
+    screen = pygame.display.set_mode((app.WIDTH, app.HEIGHT))
+    pygame.display.set_caption("Shooter (co-op)")
+    assets = app.load_assets()
+    boss_assets = BossAssetRegistry()
+    camera = Camera(app.WIDTH, app.HEIGHT, app.WORLD_WIDTH, app.WORLD_HEIGHT)
+    bullet_image = pygame.Surface((10, 10))
+    bullet_image.fill((255, 255, 255))
+    coin_image = pygame.Surface((15, 15))
+    coin_image.fill((255, 215, 0))
+
+    loop = asyncio.get_running_loop()
+    _, client = await loop.create_datagram_endpoint(CoopClient, remote_addr=(host, port))
+    await client.joined.wait()
+
+    def image_for(kind, subtype):
+        if kind == PLAYER:
+            image = assets["player"]["idle"][0]
+            return app.flipped(image) if subtype else image
+        if kind == ENEMY:
+            return assets["enemies"][app.ENEMY_TYPES[subtype]][0]
+        if kind == BOSS:
+            enemy_type = app.ENEMY_TYPES[subtype]
+            return boss_assets.get(enemy_type, assets["enemies"], app.BOSS_SCALE_TIERS[0]).frames[0]
+        if kind == FIREBALL:
+            return assets["bullets"][0]
+        if kind == COIN:
+            return coin_image
+        if kind == WEAPON:
+            return assets["weapons"][0]
+        return bullet_image
+
+    running = True
+    while running:
+        aim = None
+        choice = -1
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                aim = camera.screen_to_world(event.pos)
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_1, pygame.K_2, pygame.K_3):
+                choice = event.key - pygame.K_1
+        keys = pygame.key.get_pressed()
+        dir_x = (keys[pygame.K_d] or keys[pygame.K_RIGHT]) - (keys[pygame.K_a] or keys[pygame.K_LEFT])
+        dir_y = (keys[pygame.K_s] or keys[pygame.K_DOWN]) - (keys[pygame.K_w] or keys[pygame.K_UP])
+        client.send_input(dir_x, dir_y, aim, choice)
+
+        if client.predicted is not None:
+            camera.follow(*client.predicted)
+        screen.fill((40, 34, 30))
+        for entity_id, (kind, subtype, qx, qy, health) in client.entities.items():
+            x, y = qx / POSITION_SCALE, qy / POSITION_SCALE
+            if entity_id == client.player_id and client.predicted is not None:
+                x, y = client.predicted
+            image = image_for(kind, subtype)
+            rect = image.get_rect(center=(x - camera.rect.x, y - camera.rect.y))
+            if not screen.get_rect().colliderect(rect):
+                continue
+            screen.blit(image, rect)
+            if kind in (PLAYER, ENEMY, BOSS):
+                screen.fill((255, 0, 0), (rect.centerx - 20, rect.top - 10, 40, 5))
+                screen.fill((0, 255, 0), (rect.centerx - 20, rect.top - 10, 40 * health // 255, 5))
+        pygame.display.flip()
+        await asyncio.sleep(1.0 / app.TICK_RATE)
+
+    client.transport.close()
+    pygame.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Co-op server and local test harness.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("server", help="run an authoritative server")
+    serve.add_argument("--port", type=int, default=5555)
+    serve.add_argument("--players", type=int, default=4, choices=(2, 3, 4))
+    join = sub.add_parser("client", help="join a server in a window")
+    join.add_argument("--host", default="127.0.0.1")
+    join.add_argument("--port", type=int, default=5555)
+    test = sub.add_parser("test", help="run a server and bot clients on localhost")
+    test.add_argument("--players", type=int, default=2, choices=(2, 3, 4))
+    test.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if args.command == "server":
+        async def serve_forever():
+            loop = asyncio.get_running_loop()
+            game = make_headless_game()
+            server = CoopServer(game, args.players)
+            await loop.create_datagram_endpoint(lambda: server, local_addr=("0.0.0.0", args.port))
+            try:
+                await server.serve()
+            finally:
+                game.close()  # Drains the run-history writer
+        asyncio.run(serve_forever())
+    elif args.command == "client":
+        asyncio.run(run_viewer(args.host, args.port))
+    else:
+        asyncio.run(run_local_session(args.players, args.seconds))
+
+if __name__ == "__main__":
+    main()
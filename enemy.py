@@ -1,6 +1,7 @@
 import pygame
 import app
 import math
+import content
 
 class Enemy:
     """
@@ -8,7 +9,7 @@ class Enemy:
     Handles movement, animation, health, and knockback effects.
     """
     
-    def __init__(self, x, y, enemy_type, enemy_assets, speed=app.DEFAULT_ENEMY_SPEED):
+    def __init__(self, x, y, enemy_type, enemy_assets, speed=None, health=None):
         """
         Initialize an enemy at specified position with given properties.
         
@@ -17,8 +18,18 @@ class Enemy:
             y (int): Starting y-coordinate
             enemy_type (str): Type of enemy ('orc', 'demon', etc.)
             enemy_assets (dict): Dictionary containing animation frames
-            speed (float): Movement speed (default from app settings)
+            speed (float): Movement speed (default from the content file)
+            health (float): Max health (default from the content file)
         """
+        self.type_id = app.ENEMY_TYPE_IDS[enemy_type]
+        # Stats not passed in come from the compiled content tables
+        if speed is None or health is None:
+            stats = content.current()
+            if speed is None:
+                speed = stats.enemy_speed[self.type_id]
+            if health is None:
+                health = stats.enemy_health[self.type_id]
+
         # Position and movement properties
         self.x = x
         self.y = y
@@ -42,13 +53,30 @@ class Enemy:
         self.knockback_dy = 0  # Knockback y-direction
 
         # Health system - varies by enemy type
-        self.max_health = 0  # Base health (overridden per type)
-        if enemy_type == "orc":
-            self.max_health = 1  # Orcs have 1 health
-        elif enemy_type == "demon":
-            self.max_health = 2  # Demons have 2 health
+        self.max_health = health
         self.health = self.max_health  # Current health
         
+    @classmethod
+    def spawn_wave(cls, xs, ys, type_ids, health, enemy_assets):
+        """
+        Create a wave of enemies from parallel lists. Per-type stats are
+        looked up once and passed to each constructor.
+
+        Args:
+            xs (list): World x-coordinates
+            ys (list): World y-coordinates
+            type_ids (list): Enemy type ids
+            health (list): Max health of each enemy
+            enemy_assets (dict): Dictionary containing animation frames
+
+        Returns:
+            list: The new enemies
+        """
+        speeds = content.current().enemy_speed
+        types = app.ENEMY_TYPES
+        return [cls(x, y, types[type_id], enemy_assets, speeds[type_id], max_health)
+                for x, y, type_id, max_health in zip(xs, ys, type_ids, health)]
+
     def update(self, player):
         """
         Update enemy state including movement and animation.
@@ -121,37 +149,26 @@ class Enemy:
             self.rect = self.image.get_rect()
             self.rect.center = center
 
-    def draw(self, surface):
+    def display_image(self):
+        """Return the current frame, flipped if the enemy faces left."""
+        if self.facing_left:
+            return app.flipped(self.image)
+        return self.image
+
+    def health_fraction(self):
+        """Return remaining health as a fraction of max health (0-1)."""
+        return max(0, self.health / self.max_health)
+
+    def queue_draw(self, render_queue):
         """
-        Draw enemy sprite and health bar on the given surface.
-        
+        Submit the sprite and health bar to a RenderQueue.
+
         Args:
-            surface (pygame.Surface): The surface to draw on
+            render_queue (RenderQueue): The frame's render queue
         """
-        # Draw facing correct direction
-        if self.facing_left:
-            flipped_image = pygame.transform.flip(self.image, True, False)
-            surface.blit(flipped_image, self.rect)
-        else:
-            surface.blit(self.image, self.rect)
-            
-        # Health bar dimensions
-        health_bar_width = 40
-        health_bar_height = 5
-        health_percent = max(0, self.health / self.max_health)
-        
-        # Position health bar above enemy
-        bar_x = self.rect.centerx - health_bar_width // 2
-        bar_y = self.rect.top - 10  # 10 pixels above enemy
-        
-        # Draw health bar background (red)
-        pygame.draw.rect(surface, (255, 0, 0), 
-                        (bar_x, bar_y, health_bar_width, health_bar_height))
-        
-        # Draw current health (green)
-        current_width = health_bar_width * health_percent
-        pygame.draw.rect(surface, (0, 255, 0), 
-                        (bar_x, bar_y, current_width, health_bar_height))
+        render_queue.add("enemies", self.display_image(), self.rect)
+        render_queue.add_bar(self.rect.centerx - 20, self.rect.top - 10, 40, 5,
+                             (255, 0, 0), (0, 255, 0), self.health_fraction())
 
     def set_knockback(self, px, py, dist):
         """
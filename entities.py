@@ -0,0 +1,161 @@
+# entities.py
+# Dense entity storage with generational handles and deferred removal
+
+# A handle packs a slot index (low bits) with that slot's generation
+SLOT_BITS = 20
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+class EntityStore:
+    """
+    Entities of one kind packed into a dense list.
+
+    Each entity gets a handle made of a slot number and the slot's
+    generation, stored on the entity as `entity.handle`. destroy() only
+    marks the entity; flush(), run once at the end of a simulation tick,
+    removes marked entities by moving the last entity into each gap, so
+    removal is O(1) and loops never need to iterate over a copy. Freed
+    slots get a new generation, so a stale handle is reported as dead
+    instead of silently referring to a newer entity.
+
+    Iterating, len() and indexing cover the dense list, including
+    entities destroyed this tick; use alive() to skip those.
+    """
+
+    def __init__(self):
+        self.dense = []          # Entities, packed
+        self.dense_slots = []    # Slot of each packed entity
+        self.slot_index = []     # Slot -> index in dense (-1 when free)
+        self.generations = []    # Slot -> current generation
+        self.dying = []          # Slot -> destroyed this tick
+        self.free_slots = []
+        self.doomed = []         # Slots to remove on flush
+
+    def __iter__(self):
+        return iter(self.dense)
+
+    def __len__(self):
+        return len(self.dense)
+
+    def __getitem__(self, index):
+        return self.dense[index]
+
+    def create(self, entity):
+        """
+        Add an entity and give it a handle.
+
+        Args:
+            entity: The game object to store
+
+        Returns:
+            int: The entity's handle
+        """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.generations)
+            if slot > SLOT_MASK:
+                raise OverflowError("EntityStore is full")
+            self.generations.append(0)
+            self.slot_index.append(-1)
+            self.dying.append(False)
+        self.slot_index[slot] = len(self.dense)
+        self.dense.append(entity)
+        self.dense_slots.append(slot)
+        entity.handle = (self.generations[slot] << SLOT_BITS) | slot
+        return entity.handle
+
+    def create_many(self, entities):
+        """
+        Add a batch of entities (one spawn wave) at once.
+
+        Args:
+            entities (list): Game objects to store
+
+        Returns:
+            list: Their handles
+        """
+        free_slots = self.free_slots
+        reused = min(len(free_slots), len(entities))
+        slots = free_slots[len(free_slots) - reused:][::-1]
+        del free_slots[len(free_slots) - reused:]
+        first_new = len(self.generations)
+        new = len(entities) - reused
+        if first_new + new - 1 > SLOT_MASK:
+            raise OverflowError("EntityStore is full")
+        slots.extend(range(first_new, first_new + new))
+        self.generations.extend([0] * new)
+        self.slot_index.extend([-1] * new)
+        self.dying.extend([False] * new)
+
+        start = len(self.dense)
+        generations = self.generations
+        slot_index = self.slot_index
+        handles = []
+        for i, (slot, entity) in enumerate(zip(slots, entities)):
+            slot_index[slot] = start + i
+            entity.handle = (generations[slot] << SLOT_BITS) | slot
+            handles.append(entity.handle)
+        self.dense.extend(entities)
+        self.dense_slots.extend(slots)
+        return handles
+
+    def alive(self, handle):
+        """Return True if the handle refers to an entity not yet destroyed."""
+        slot = handle & SLOT_MASK
+        return (slot < len(self.generations)
+                and self.generations[slot] == handle >> SLOT_BITS
+                and self.slot_index[slot] >= 0
+                and not self.dying[slot])
+
+    def get(self, handle):
+        """Return the entity for a handle, or None if it has been destroyed."""
+        if not self.alive(handle):
+            return None
+        return self.dense[self.slot_index[handle & SLOT_MASK]]
+
+    def destroy(self, handle):
+        """
+        Mark an entity for removal at the next flush().
+
+        Returns:
+            bool: True if the entity was alive (False for repeat calls)
+        """
+        if not self.alive(handle):
+            return False
+        slot = handle & SLOT_MASK
+        self.dying[slot] = True
+        self.doomed.append(slot)
+        return True
+
+    def flush(self):
+        """Swap-remove every entity destroyed since the last flush."""
+        dense = self.dense
+        dense_slots = self.dense_slots
+        slot_index = self.slot_index
+        for slot in self.doomed:
+            index = slot_index[slot]
+            last = len(dense) - 1
+            if index != last:
+                # Move the last entity into the gap
+                moved_slot = dense_slots[last]
+                dense[index] = dense[last]
+                dense_slots[index] = moved_slot
+                slot_index[moved_slot] = index
+            dense.pop()
+            dense_slots.pop()
+            self._free(slot)
+        self.doomed.clear()
+
+    def clear(self):
+        """Remove every entity immediately."""
+        for slot in self.dense_slots:
+            self._free(slot)
+        self.dense.clear()
+        self.dense_slots.clear()
+        self.doomed.clear()
+
+    def _free(self, slot):
+        self.slot_index[slot] = -1
+        self.dying[slot] = False
+        self.generations[slot] += 1
+        self.free_slots.append(slot)
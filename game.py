@@ -8,6 +8,8 @@ import os
 import math
 import app
 import time
+import collections
+import numpy as np
 import fireball
 import bullet
 
@@ -19,7 +21,31 @@ from coin import Coin
 from fireball import Fireball
 from weapon import Weapon
 from bullet import Bullet
-from boss import Boss
+from boss import Boss, BossAssetRegistry
+from timestep import FixedTimestep
+from render_target import LowResTarget
+from render_queue import RenderQueue
+from world import Camera, ChunkedFloor
+from waves import WavePlanner
+from warmup import LevelWarmup
+from entities import EntityStore
+from hot_reload import AssetWatcher
+from minimap import Minimap
+from projectiles import ProjectileField
+from particles import ParticleSystem
+from combat import CombatQueue
+from memory import MemoryMonitor, format_report
+from profiler import SamplingProfiler
+import particles
+import combat
+import snapshot
+import replay
+from replay import InputSession
+from video import VideoRecorder
+import content
+from run_history import RunHistory
+import telemetry
+from telemetry import Telemetry
 
 def weighted_sample_without_replacement(items, weight_key, k):
     """
@@ -56,8 +82,10 @@ class Game:
         self.screen = pygame.display.set_mode((app.WIDTH, app.HEIGHT))
         pygame.display.set_caption("Shooter")
         
-        # Set up game clock
+        # Set up game clock and fixed simulation timestep
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(app.TICK_RATE, app.MAX_CATCH_UP_STEPS,
+                                      app.MAX_SKIPPED_RENDERS)
 
         # Load game assets
         self.assets = app.load_assets()
@@ -67,37 +95,62 @@ class Game:
         self.font_small = pygame.font.Font(font_path, 18)
         self.font_large = pygame.font.Font(font_path, 32)
 
-        # Create game background
-        self.background = self.create_random_background(
-            app.WIDTH, app.HEIGHT, self.assets["floor_tiles"]
-        )
+        # Floor of the scrolling world, built in chunks as the camera reaches them
+        seed = app.WORLD_SEED if app.WORLD_SEED is not None else random.getrandbits(32)
+        self.floor = ChunkedFloor(self.assets["floor_tiles"], seed, app.CHUNK_TILES,
+                                  app.CHUNK_CACHE_BYTES)
+        self.camera = Camera(app.WIDTH, app.HEIGHT, app.WORLD_WIDTH, app.WORLD_HEIGHT)
+        self.minimap = Minimap(app.WORLD_WIDTH, app.WORLD_HEIGHT, app.MINIMAP_COLUMNS,
+                               app.MINIMAP_ROWS, app.MINIMAP_CELL_PIXELS)
         
+        # Low-resolution world target for performance mode (toggle with F3)
+        self.performance_mode = app.PERFORMANCE_MODE
+        self.show_frame_stats = app.SHOW_FRAME_STATS
+        self.world_target = LowResTarget(app.WIDTH, app.HEIGHT, app.RENDER_SCALE)
+        self.render_queue = RenderQueue(app.WIDTH, app.HEIGHT)
+
         # Game state flags
         self.running = True
         self.game_over = False
 
-        # Game object containers
-        self.coins = []
-        self.weapons = []
-        self.enemies = []
+        # Game object containers (removals are applied at the end of each tick)
+        self.coins = EntityStore()
+        self.weapons = EntityStore()
+        self.enemies = EntityStore()
         
         # Enemy spawning variables
         self.enemy_spawn_timer = 0
         self.enemy_spawn_interval = 60
         self.enemies_per_spawn = 1
+        # Seeded wave schedules; the next level's is built ahead of time
+        self.wave_planner = WavePlanner((app.WIDTH, app.HEIGHT), app.SPAWN_MARGIN,
+                                        len(app.ENEMY_TYPES), app.WAVE_BLOCK_WAVES)
+        self.waves = None
 
         # Boss enemy
         self.boss = None
+        # Scale boss frames and masks in the background before the first boss wave
+        self.boss_assets = BossAssetRegistry()
+        self.boss_assets.prepare_in_background(self.assets)
+        # Prepares the next level while the upgrade menu is open
+        self.level_warmup = LevelWarmup(self.wave_planner, self.boss_assets)
+        # Projectiles fired by boss attack patterns
+        self.enemy_projectiles = ProjectileField(app.ENEMY_PROJECTILE_CAPACITY,
+                                                 app.ENEMY_PROJECTILE_RADIUS)
+
+        # Hit, death and pickup effects
+        self.particles = ParticleSystem(app.PARTICLE_BUDGET, app.PARTICLE_SOFT_BUDGET,
+                                        app.PARTICLE_SIZE)
+        # Hits and knockback found by collision checks, resolved once per tick
+        self.combat = CombatQueue()
+
+        # Enemy stats, drops, boss scaling and upgrades from the content file
+        self.content = content.current()
 
         # Possible player upgrades with their properties
-        self.possible_upgrades = [
-            {"name": "SNIPER", "desc": "Bullets pierce enemies", "weight": 3, "min_level": 6},
-            {"name": "SPEEDSTER", "desc": "Bullet speed +3, Player speed +80%", "weight": 7, "min_level": 1},
-            {"name": "ARCHER", "desc": "Fire two additional bullet", "weight": 6, "min_level": 1},
-            {"name": "BERSERK", "desc": "Damage multiplier x1.5", "weight": 4, "min_level": 3},
-            {"name": "HEALER", "desc": "Heal 1 hp", "weight": 6, "min_level": 3}, 
-            {"name": "INVESTOR", "desc": "25% more xp", "weight": 4, "min_level": 1}
-        ]
+        self.possible_upgrades = list(self.content.upgrades)
+        # Every upgrade by name, so snapshots can restore removed ones
+        self.upgrade_catalog = {up["name"]: up for up in self.possible_upgrades}
         
         # Upgrade-related variables
         self.pierce_level = 0
@@ -107,21 +160,67 @@ class Game:
 
         self.xp_scale_factor = 4  # XP scaling factor for level up
 
+        # Snapshots for quick-save (F5/F9), rewinding and crash recovery
+        self.tick_count = 0
+        self.quick_save = None
+        self.snapshot_history = collections.deque(maxlen=app.SNAPSHOT_HISTORY_LENGTH)
+        self.history_due = False
+
+        # Finished runs are saved off-thread; the leaderboard shows on game over
+        self.run_history = RunHistory(app.RUN_HISTORY_PATH)
+        self.leaderboard = None
+
+        # Per-event gameplay telemetry (disabled unless TELEMETRY_FOLDER is set)
+        self.telemetry = Telemetry(app.TELEMETRY_FOLDER, app.TELEMETRY_BUFFER_RECORDS,
+                                   app.TELEMETRY_MAX_FILE_BYTES,
+                                   metadata={"enemy_types": app.ENEMY_TYPES,
+                                             "upgrades": list(self.upgrade_catalog),
+                                             "width": app.WORLD_WIDTH,
+                                             "height": app.WORLD_HEIGHT})
+
+        # Gameplay recording (F10): video frames plus the inputs that replay them
+        self.recorder = None
+        self.input_session = None
+        self.recording_name = None
+
+        # Sampling profiler; the game loop tags samples with its current phase
+        self.profiler = SamplingProfiler(app.PROFILE_RATE, app.PROFILE_FOLDER)
+        if app.PROFILE:
+            self.profiler.start()
+
+        # Memory reports printed on level up
+        self.memory = MemoryMonitor(self, app.MEMORY_TRACE) if app.MEMORY_REPORTS else None
+
+        # Changed asset and tuning files are swapped in between frames
+        self.asset_watcher = None
+        if app.HOT_RELOAD:
+            self.asset_watcher = AssetWatcher(self.assets)
+            self.asset_watcher.start()
+
         # Initialize game state
         self.reset_game()
 
     def reset_game(self):
         """Reset the game to its initial state."""
-        # Create player at center of screen
-        self.player = Player(app.WIDTH // 2, app.HEIGHT // 2, self.assets)
+        # Create player at center of the world
+        self.player = Player(app.WORLD_WIDTH // 2, app.WORLD_HEIGHT // 2, self.assets)
+        self.camera.follow(self.player.x, self.player.y)
+        self.player.telemetry = self.telemetry
+        # The first player is the local/lead player; co-op adds more
+        self.players = [self.player]
         
         # Reset enemies
-        self.enemies = []
+        self.enemies.clear()
         self.enemy_spawn_timer = 0
         self.enemies_per_spawn = 1
+        self.wave_seed = random.getrandbits(32)
+        self.wave_index = 0
+        self.wave_pending = 0  # Enemies of the latest wave not created yet
+        self.level_warmup.cancel()
+        self.wave_planner.clear()  # Schedules prepared for the last run
 
         # Reset coins
-        self.coins = []
+        self.coins.clear()
 
         # Reset upgrade stats
         self.pierce_level = 0
@@ -131,53 +230,292 @@ class Game:
         self.xp_value = 1
         self.player.level = 1
         self.boss = None
-        self.weapons = []
+        self.enemy_projectiles.clear()
+        self.particles.clear()
+        self.combat.clear()
+        self.weapons.clear()
+
+        # Reset run statistics
+        self.run_ticks = 0
+        self.telemetry.tick = 0
+        self.telemetry.record(telemetry.RUN_START, 0, self.player.x, self.player.y,
+                              self.player.level)
+        self.kills = 0
+        self.bosses_defeated = 0
+        self.run_upgrades = []  # (upgrade name, level picked)
+        self.leaderboard = None
 
         # Reset game state
         self.game_over = False
+        self.prepare_next_waves()
+
+    def run(self):
+        """Main game loop."""
+        try:
+            self.run_loop()
+        except Exception:
+            # Keep the last state around so the crash can be reproduced
+            with open(app.CRASH_SNAPSHOT_PATH, "wb") as f:
+                f.write(self.save_snapshot())
+            raise
+
+        # Flush saved runs and telemetry and quit pygame when game loop ends
+        self.close()
+        pygame.quit()
+
+    def close(self):
+        """Stop every worker thread the game owns, flushing what they hold."""
+        if self.profiler.running:
+            print(f"Profile written to {self.profiler.stop()}")
+        if self.recorder is not None:
+            self.toggle_recording()
+        if self.asset_watcher is not None:
+            self.asset_watcher.stop()
+        self.level_warmup.close()
+        self.run_history.close()
+        self.telemetry.close()
+
+    def run_loop(self):
+        """Run frames until the game is closed."""
+        profiler = self.profiler
+        while self.running:
+            # Cap the frame rate and measure real time since the last frame
+            profiler.phase = "wait"
+            frame_seconds = self.clock.tick(app.FPS) / 1000
+
+            # Swap in hot-reloaded assets at the frame boundary
+            if self.asset_watcher is not None:
+                self.apply_reload(self.asset_watcher.swap())
+
+            # Handle user input
+            profiler.phase = "events"
+            self.handle_events()
 
-    def create_random_background(self, width, height, floor_tiles):
+            # Run as many fixed simulation ticks as real time calls for
+            update_start = time.perf_counter()
+            steps = self.timestep.advance(frame_seconds)
+            for _ in range(steps):
+                # Update game state if not in menus
+                if not self.game_over and not self.in_level_up_menu:
+                    if self.input_session is not None:
+                        self.input_session.move(*self.player.input_direction())
+                    self.store_previous_positions()
+                    self.update()
+                    self.record_history(defer=True)
+
+            # Draw everything, unless the simulation is catching up. While
+            # paused no tick moves anything, so draw the simulated positions
+            draw_start = time.perf_counter()
+            if self.timestep.should_render(steps):
+                profiler.phase = "draw"
+                paused = self.game_over or self.in_level_up_menu
+                self.draw(1.0 if paused else self.timestep.alpha)
+                if self.recorder is not None:
+                    self.recorder.capture(self.screen)
+            draw_end = time.perf_counter()
+
+            # The frame is already on screen, so the history snapshot only
+            # uses time the loop would otherwise spend waiting
+            profiler.phase = "history"
+            self.save_due_history()
+
+            self.telemetry.record(telemetry.FRAME, steps,
+                                  (draw_start - update_start) * 1000,
+                                  (draw_end - draw_start) * 1000,
+                                  frame_seconds * 1000)
+
+    def toggle_recording(self):
         """
-        Create a randomly tiled background surface.
-        
+        Start recording video and inputs, or stop and save the recording.
+        Files are written to CAPTURE_FOLDER as <time>.y4m (or a <time>
+        PNG folder) and <time>.inputs for replay.py.
+        """
+        if self.recorder is None:
+            os.makedirs(app.CAPTURE_FOLDER, exist_ok=True)
+            self.recording_name = os.path.join(app.CAPTURE_FOLDER,
+                                               time.strftime("%Y%m%d-%H%M%S"))
+            video_path = self.recording_name + (".y4m" if app.CAPTURE_FORMAT == "y4m" else "")
+            self.recorder = VideoRecorder(video_path, self.screen, app.FPS,
+                                          app.CAPTURE_RING_FRAMES, app.CAPTURE_WORKERS)
+            self.input_session = InputSession(self.save_snapshot(), self.floor.seed)
+        else:
+            self.input_session.save(self.recording_name + ".inputs")
+            self.recorder.close()
+            print(f"Recording saved to {self.recording_name}: {self.recorder.stats()}")
+            self.recorder = None
+            self.input_session = None
+
+    def perform(self, kind, a=0.0, b=0.0):
+        """
+        Apply a gameplay action, recording it when inputs are being recorded.
+
         Args:
-            width: Width of the background
-            height: Height of the background
-            floor_tiles: List of tile images to use
-            
+            kind (int): replay.SHOOT_NEAREST, SHOOT_AT, UPGRADE or RESTART
+            a (float): World x to shoot at, or the upgrade option index
+            b (float): World y to shoot at
+        """
+        if self.input_session is not None:
+            self.input_session.action(kind, a, b)
+
+        if kind == replay.SHOOT_NEAREST:
+            nearest_enemy = self.find_nearest_enemy()
+            if nearest_enemy:
+                self.player.shoot_toward_enemy(nearest_enemy)
+        elif kind == replay.SHOOT_AT:
+            self.player.shoot_toward_mouse((a, b))
+        elif kind == replay.UPGRADE:
+            index = int(a)
+            if 0 <= index < len(self.upgrade_options):
+                upgrade = self.upgrade_options[index]
+                self.apply_upgrade(self.player, upgrade)
+                self.in_level_up_menu = False
+                self.finish_level_warmup()
+        elif kind == replay.RESTART:
+            self.reset_game()
+
+    def apply_reload(self, reload):
+        """
+        Update state derived from hot-reloaded assets and content.
+
+        Args:
+            reload (Reload): Changes swapped in by the asset watcher (or None)
+        """
+        if not reload:
+            return
+        groups = reload.groups()
+        if "enemies" in groups:
+            # Boss frames, flips and masks are rebuilt from the new frames;
+            # a level warm-up built from the old ones is thrown away
+            self.level_warmup.cancel()
+            self.boss_assets.clear()
+            self.boss_assets.prepare_in_background(self.assets)
+        if "floor_tiles" in groups:
+            self.floor = ChunkedFloor(self.assets["floor_tiles"], self.floor.seed,
+                                      app.CHUNK_TILES, app.CHUNK_CACHE_BYTES)
+        if reload.content is not None:
+            # Unique upgrades already taken stay out of the pool
+            taken = set(self.upgrade_catalog) - {up["name"] for up in self.possible_upgrades}
+            self.content = reload.content
+            self.upgrade_catalog.update({up["name"]: up for up in self.content.upgrades})
+            self.possible_upgrades = [up for up in self.content.upgrades
+                                      if up["name"] not in taken]
+        if reload.content is not None or "SPAWN_MARGIN" in reload.constants:
+            # Same seeds, so only health and spawn distance change
+            self.level_warmup.cancel()
+            self.wave_planner.clear(app.SPAWN_MARGIN)
+            self.waves = None
+            self.prepare_next_waves()
+
+    def save_snapshot(self):
+        """Return the full simulation state (including RNG) as bytes."""
+        return snapshot.save_snapshot(self)
+
+    def restore_snapshot(self, blob):
+        """Restore state previously returned by save_snapshot."""
+        snapshot.restore_snapshot(self, blob)
+        # The tick moves back without a new run starting; mark it for analysis
+        self.telemetry.tick = self.run_ticks
+        self.telemetry.record(telemetry.LOAD, 0, self.player.x, self.player.y,
+                              self.player.level)
+
+    def record_history(self, defer=False):
+        """
+        Keep a rolling history of snapshots for rewinding.
+
+        Args:
+            defer: Only mark the snapshot as due; save_due_history takes it
+                at the end of the frame
+        """
+        self.tick_count += 1
+        if self.tick_count % app.SNAPSHOT_INTERVAL == 0:
+            self.history_due = True
+        if not defer:
+            self.save_due_history()
+
+    def save_due_history(self):
+        """Take the history snapshot marked due by record_history, if any."""
+        if self.history_due:
+            self.history_due = False
+            self.snapshot_history.append(self.save_snapshot())
+
+    def rewind(self, steps_back=1):
+        """
+        Restore one of the recent history snapshots.
+
+        Args:
+            steps_back: 1 for the most recent snapshot, 2 for the one before, ...
+
         Returns:
-            A pygame Surface with the tiled background
+            True if a snapshot was restored
         """
-        bg = pygame.Surface((width, height))
-        tile_w = floor_tiles[0].get_width()
-        tile_h = floor_tiles[0].get_height()
+        if steps_back > len(self.snapshot_history):
+            return False
+        self.restore_snapshot(self.snapshot_history[-steps_back])
+        return True
 
-        # Tile the background with random floor tiles
-        for y in range(0, height, tile_h):
-            for x in range(0, width, tile_w):
-                tile = random.choice(floor_tiles)
-                bg.blit(tile, (x, y))
+    def interpolated_entities(self):
+        """Return every moving object whose drawn position is interpolated."""
+        entities = list(self.enemies)
+        for player in self.players:
+            entities.append(player)
+            entities.extend(player.bullets)
+            if player.equipped_weapon:
+                entities.append(player.equipped_weapon)
+        if self.boss is not None:
+            entities.append(self.boss)
+        return entities
 
-        return bg
+    def store_previous_positions(self):
+        """Remember positions from before a simulation tick for interpolation."""
+        for entity in self.interpolated_entities():
+            entity.prev_x = entity.x
+            entity.prev_y = entity.y
 
-    def run(self):
-        """Main game loop."""
-        while self.running:
-            # Control game speed
-            self.clock.tick(app.FPS)
+    def apply_interpolation(self, alpha):
+        """
+        Move each entity's rect between its previous and current position.
 
-            # Handle user input
-            self.handle_events()
+        Args:
+            alpha: Fraction of a tick since the last update (1.0 restores
+                the simulated positions used for collisions)
+        """
+        for entity in self.interpolated_entities():
+            prev_x = getattr(entity, "prev_x", entity.x)
+            prev_y = getattr(entity, "prev_y", entity.y)
+            entity.rect.center = (prev_x + (entity.x - prev_x) * alpha,
+                                  prev_y + (entity.y - prev_y) * alpha)
 
-            # Update game state if not in menus
-            if not self.game_over and not self.in_level_up_menu:
-                self.update()
+    def add_player(self, remote=True):
+        """
+        Add a co-op player. XP and levels are shared through the lead player.
 
-            # Draw everything
-            self.draw()
+        Args:
+            remote: Drive the player from remote_move instead of the keyboard
 
-        # Quit pygame when game loop ends
-        pygame.quit()
+        Returns:
+            The new Player
+        """
+        offset = 60 * len(self.players)
+        player = Player(app.WORLD_WIDTH // 2 + offset, app.WORLD_HEIGHT // 2, self.assets)
+        player.telemetry = self.telemetry
+        player.remote = remote
+        player.level = self.player.level
+        self.players.append(player)
+        return player
+
+    def living_players(self):
+        """Return the players that still have health."""
+        return [player for player in self.players if player.health > 0]
+
+    def nearest_player(self, x, y):
+        """
+        Return the living player closest to a point (the lead player when
+        playing alone or when everyone is down).
+        """
+        if len(self.players) == 1:
+            return self.player
+        living = self.living_players() or [self.player]
+        return min(living, key=lambda p: (p.x - x) ** 2 + (p.y - y) ** 2)
 
     def handle_events(self):
         """Process user input (keyboard, mouse, quitting)."""
@@ -186,10 +524,26 @@ class Game:
                 # Quit the game if window is closed
                 self.running = False
             elif event.type == pygame.KEYDOWN:
-                if self.game_over:
+                if event.key == pygame.K_F2:
+                    # Toggle the frame loop counters
+                    self.show_frame_stats = not self.show_frame_stats
+                elif event.key == pygame.K_F3:
+                    # Toggle low-resolution world rendering
+                    self.performance_mode = not self.performance_mode
+                elif event.key == pygame.K_F5:
+                    self.quick_save = self.save_snapshot()  # Quick-save
+                elif event.key == pygame.K_F9:
+                    if self.quick_save is not None:
+                        self.restore_snapshot(self.quick_save)  # Quick-load
+                elif event.key == pygame.K_F8:
+                    # Profile the next few seconds
+                    self.profiler.capture_window(app.PROFILE_WINDOW_SECONDS, "manual")
+                elif event.key == pygame.K_F10:
+                    self.toggle_recording()  # Start/stop video and input recording
+                elif self.game_over:
                     # Game over screen controls
                     if event.key == pygame.K_r:
-                        self.reset_game()  # Restart game
+                        self.perform(replay.RESTART)  # Restart game
                     elif event.key == pygame.K_ESCAPE:
                         self.running = False  # Quit game
                 else:
@@ -197,71 +551,191 @@ class Game:
                         # In-game controls
                         if event.key == pygame.K_SPACE:
                             # Shoot at nearest enemy
-                            nearest_enemy = self.find_nearest_enemy()
-                            if nearest_enemy:
-                                self.player.shoot_toward_enemy(nearest_enemy)
+                            self.perform(replay.SHOOT_NEAREST)
                     else:
                         # Upgrade menu controls
                         if event.key in [pygame.K_1, pygame.K_2, pygame.K_3]:
                             index = event.key - pygame.K_1  # 0,1,2
-                            if 0 <= index < len(self.upgrade_options):
-                                upgrade = self.upgrade_options[index]
-                                self.apply_upgrade(self.player, upgrade)
-                                self.in_level_up_menu = False
+                            self.perform(replay.UPGRADE, index)
                 
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left mouse button
                     # Shoot toward mouse position
-                    self.player.shoot_toward_mouse(event.pos)
+                    self.perform(replay.SHOOT_AT, *self.camera.screen_to_world(event.pos))
     
     def update(self):
         """Update all game objects and check game state."""
-        # Update player
-        self.player.handle_input()
-        self.player.update()
+        profiler = self.profiler
+        profiler.phase = "update"
+        self.run_ticks += 1
+        self.telemetry.tick = self.run_ticks
+
+        # Update players
+        for player in self.players:
+            player.handle_input()
+            player.update()
+        self.camera.follow(self.player.x, self.player.y)
         
         # Update boss if present
         if hasattr(self, "boss") and self.boss is not None:
-            self.boss.update(self.player)
-            self.boss.draw(self.screen)
+            target = self.nearest_player(self.boss.x, self.boss.y)
+            self.boss.update(target)
+            self.boss.attacks.update(self.boss, target, self.enemy_projectiles)
             # Remove boss if defeated
             if self.boss.health <= 0:
                 self.boss = None
 
+        # Move boss projectiles, dropping those well off-screen (and all of
+        # them once the boss is gone)
+        if self.boss is None:
+            self.enemy_projectiles.clear()
+        self.enemy_projectiles.update(self.camera.rect.inflate(app.WIDTH, app.HEIGHT))
+        self.particles.update()
+
         # Only spawn/update regular enemies if no boss is active
         if self.boss is None:
-            for enemy in self.enemies:
-                enemy.update(self.player)
+            if len(self.players) == 1:
+                for enemy in self.enemies:
+                    enemy.update(self.player)
+            else:
+                for enemy in self.enemies:
+                    enemy.update(self.nearest_player(enemy.x, enemy.y))
 
         # Check for collisions
+        profiler.phase = "check_player_enemy_collisions"
         self.check_player_enemy_collisions()
+        profiler.phase = "check_player_projectile_collisions"
+        self.check_player_projectile_collisions()
+        profiler.phase = "check_bullet_enemy_collisions"
         self.check_bullet_enemy_collisions()
+        self.resolve_combat()
+        profiler.phase = "check_player_coin_collisions"
         self.check_player_coin_collisions()
+        profiler.phase = "check_player_weapon_collisions"
         self.check_player_weapon_collisions()
+        profiler.phase = "update"
         
-        # Check for game over
-        if self.player.health <= 0:
+        # Check for game over (every player down)
+        if not self.living_players():
             self.enemies.clear()
             self.game_over = True
+            self.end_run()
+            self.flush_removals()
             return
             
         # Spawn enemies and check for level up
+        profiler.phase = "spawn"
         self.spawn_enemies()
+        profiler.phase = "level_up"
         self.check_for_level_up()
+
+        # Rebuild the minimap a few times per second
+        if self.run_ticks % app.MINIMAP_REFRESH_TICKS == 0:
+            profiler.phase = "minimap"
+            self.minimap.refresh(self.enemies, self.coins, self.weapons, self.boss,
+                                 self.living_players())
+
+        profiler.phase = "update"
+        self.flush_removals()
+
+    def flush_removals(self):
+        """Apply the entity removals deferred during this tick."""
+        self.enemies.flush()
+        self.coins.flush()
+        self.weapons.flush()
+        for player in self.players:
+            player.bullets.flush()
         
-    def draw(self):
-        """Render all game elements to the screen."""
-        # Draw background
-        self.screen.blit(self.background, (0, 0))
+    def draw(self, alpha=1.0):
+        """
+        Render all game elements to the screen.
+
+        Args:
+            alpha: Interpolation factor between the last two simulation ticks
+        """
+        self.apply_interpolation(alpha)
+
+        # Follow the drawn (interpolated) player so scrolling stays smooth
+        self.camera.follow(*self.player.rect.center)
+        self.render_queue.set_view(self.camera.rect)
+
+        # Draw the world, at native sprite resolution in performance mode
+        if self.performance_mode:
+            self.draw_world(self.world_target)
+            self.world_target.present(self.screen)
+        else:
+            self.draw_world(self.screen)
+
+        # Put rects back at their simulated positions for collision checks
+        self.apply_interpolation(1.0)
+
+        # HUD and menus are always drawn at full resolution
+        self.draw_hud()
+
+        # Update display
+        pygame.display.flip()
 
-        # Draw coins
+    def draw_world(self, target):
+        """
+        Draw the background and every game object.
+
+        Args:
+            target: The screen, or a LowResTarget in performance mode
+        """
+        # Draw the floor chunks in view
+        self.floor.draw(target, self.camera.rect)
+
+        # Queue sprites per layer, culling anything outside the camera view
+        queue = self.render_queue
         for coin in self.coins:
-            coin.draw(self.screen)
+            queue.add("coins", coin.image, coin.rect)
 
-        # Draw player if game is active
+        # Draw players if game is active
         if not self.game_over:
-            self.player.draw(self.screen) 
+            for player in self.living_players():
+                player.queue_draw(queue)
+            
+        # Draw boss or enemies
+        if self.boss is not None:
+            self.boss.queue_draw(queue)
+        else:
+            for enemy in self.enemies:
+                enemy.queue_draw(queue)
         
+        # Draw weapons
+        for weapon in self.weapons:
+            queue.add("weapons", weapon.image, weapon.rect)
+            
+        # Draw weapon durability if equipped
+        if self.player.equipped_weapon:
+            weapon = self.player.equipped_weapon
+            # Bar sits 20 pixels above the wand
+            queue.add_bar(weapon.rect.centerx - 20, weapon.rect.top - 20, 40, 6,
+                          (211, 211, 211),  # Grey
+                          (207, 159, 255),  # Purple
+                          weapon.durability / weapon.max_durability)
+
+        # Submit each layer with one blits call, then all bars
+        queue.flush(target)
+
+        # Particles, then boss projectiles on top of everything
+        self.particles.draw(target, self.camera.rect)
+        self.enemy_projectiles.draw(target, self.camera.rect)
+
+    def draw_frame_stats(self):
+        """Draw how the fixed-timestep loop is keeping up with real time."""
+        stats = self.timestep.stats
+        lines = [f"FPS: {self.clock.get_fps():.0f}",
+                 f"Ticks: {stats.ticks}  Frames: {stats.frames}",
+                 f"Drawn: {stats.renders}  Skipped: {stats.skipped_renders}",
+                 f"Dropped ticks: {stats.dropped_ticks}",
+                 f"Culled sprites: {self.render_queue.last_culled}"]
+        for i, line in enumerate(lines):
+            line_surf = self.font_small.render(line, True, (200, 200, 200))
+            self.screen.blit(line_surf, (10, 170 + i * 25))
+
+    def draw_hud(self):
+        """Draw health, XP and level text plus any menu overlays."""
         # Draw health display
         hp = max(0, min(self.player.health, 5))
         health_img = self.assets["health"][hp]
@@ -280,47 +754,24 @@ class Game:
         level_display = self.font_small.render(f"Level: {self.player.level}", True, (255, 255, 255))
         self.screen.blit(level_display, (10, 130))
 
+        # Draw the minimap in the top-right corner
+        minimap_x = app.WIDTH - self.minimap.surface.get_width() - 10
+        self.minimap.draw(self.screen, self.camera.rect, (minimap_x, 10))
+
+        if self.show_frame_stats:
+            self.draw_frame_stats()
+
+        # Draw loading indicator while enemy/weapon assets stream in
+        if not self.assets.all_ready():
+            ready, total = self.assets.progress()
+            loading_surf = self.font_small.render(f"Loading {ready}/{total}", True, (200, 200, 200))
+            self.screen.blit(loading_surf, (10, app.HEIGHT - 30))
+
         # Draw special screens if needed
         if self.game_over:
             self.draw_game_over_screen()
         if self.in_level_up_menu: 
             self.draw_upgrade_menu()
-            
-        # Draw boss or enemies
-        if self.boss is not None:
-            self.boss.draw(self.screen)
-        else:
-            for enemy in self.enemies:
-                enemy.draw(self.screen)
-        
-        # Draw weapons
-        for weapon in self.weapons:
-            weapon.draw(self.screen)
-            
-        # Draw weapon durability if equipped
-        if self.player.equipped_weapon:
-            weapon = self.player.equipped_weapon
-            # Health bar dimensions and colors
-            bar_width = 40
-            bar_height = 6
-            background_color = (211, 211, 211)    # Grey
-            durability_color = (207, 159, 255)   # Purple
-            
-            # Calculate position above the wand
-            bar_x = weapon.rect.centerx - bar_width // 2
-            bar_y = weapon.rect.top - 20  # Position 20 pixels above the wand
-            
-            # Calculate current durability percentage
-            dura_percent = weapon.durability / weapon.max_durability
-            current_width = bar_width * dura_percent
-            
-            # Draw background
-            pygame.draw.rect(self.screen, background_color, (bar_x, bar_y, bar_width, bar_height))
-            # Draw current durability
-            pygame.draw.rect(self.screen, durability_color, (bar_x, bar_y, current_width, bar_height))
-            
-        # Update display
-        pygame.display.flip()
 
     def spawn_enemies(self):
         """Spawn new enemies at regular intervals."""
@@ -332,55 +783,109 @@ class Game:
         else: 
             if self.enemy_spawn_timer >= self.enemy_spawn_interval:
                 self.enemy_spawn_timer = 0
-                for _ in range(self.enemies_per_spawn):
-                    # Choose random spawn side
-                    side = random.choice(["top", "bottom", "left", "right"])
-                    if side == "top":
-                        x = random.randint(0, app.WIDTH)
-                        y = -app.SPAWN_MARGIN
-                    elif side == "bottom":
-                        x = random.randint(0, app.WIDTH)
-                        y = app.HEIGHT + app.SPAWN_MARGIN
-                    elif side == "left":
-                        x = -app.SPAWN_MARGIN
-                        y = random.randint(0, app.HEIGHT)
-                    else:
-                        x = app.WIDTH + app.SPAWN_MARGIN
-                        y = random.randint(0, app.HEIGHT)
-
-                    # Create enemy with scaled stats based on player level
-                    enemy_type = random.choice(list(self.assets["enemies"].keys()))
-                    enemy = Enemy(x, y, enemy_type, self.assets["enemies"])
-                    if 20 > self.player.level > 5: 
-                        enemy.max_health += self.player.level + 3
-                    elif self.player.level > 20:
-                        enemy.max_health += self.player.level * 1.5
-                    else: 
-                        enemy.max_health += self.player.level
-                    enemy.health = enemy.max_health
-                    self.enemies.append(enemy)
+                self.wave_index += 1
+                self.wave_pending = self.enemies_per_spawn
+            if self.wave_pending:
+                self.spawn_wave_part()
+
+    def spawn_wave_part(self):
+        """
+        Create up to SPAWN_BATCH enemies of the latest wave, so a large
+        wave is spread over several ticks instead of stalling one.
+        """
+        # Positions, types and level-scaled health come precomputed
+        xs, ys, type_ids, health = self.current_waves().wave(self.wave_index - 1)
+        start = self.enemies_per_spawn - self.wave_pending
+        end = min(start + app.SPAWN_BATCH, self.enemies_per_spawn)
+        self.wave_pending -= end - start
+        view = self.camera.rect
+        xs = xs[start:end] + view.left
+        ys = ys[start:end] + view.top
+        type_ids = type_ids[start:end]
+        health = health[start:end]
+        self.enemies.create_many(Enemy.spawn_wave(
+            xs.tolist(), ys.tolist(), type_ids.tolist(), health.tolist(),
+            self.assets["enemies"]))
+        self.telemetry.record_many(telemetry.SPAWN, type_ids, xs, ys, health)
+
+    def current_waves(self):
+        """Return the wave schedule for the current level and spawn size."""
+        key = (self.wave_seed, self.player.level, self.enemies_per_spawn)
+        if self.waves is None or self.waves.key != key:
+            self.waves = self.wave_planner.schedule(*key, self.content)
+        return self.waves
+
+    def prepare_next_waves(self):
+        """Build the next level's wave schedule ahead of its first spawn."""
+        self.wave_planner.prepare(self.wave_seed, self.player.level + 1,
+                                  self.enemies_per_spawn + 1, self.content)
+
+    def start_level_warmup(self):
+        """Prepare the level just reached on a worker while the menu is open."""
+        key = (self.wave_seed, self.player.level, self.enemies_per_spawn)
+        self.level_warmup.start(key, self.content, self.assets["enemies"],
+                                self.content.boss_every_levels)
+
+    def finish_level_warmup(self):
+        """Swap in the prepared level as the menu closes."""
+        prepared = self.level_warmup.take()
+        if prepared is None:
+            return
+        app.add_frame_caches(prepared.flips, prepared.masks)
+        key = (self.wave_seed, self.player.level, self.enemies_per_spawn)
+        # Anything prepared for another run or level is left to current_waves
+        if prepared.key == key:
+            self.waves = prepared.waves
+            self.wave_planner.offer(prepared.next_waves)
 
     def check_player_enemy_collisions(self):
-        """Check for collisions between player and enemies."""
-        collided = False
+        """Check for collisions between players and enemies."""
+        enemy_rects = [enemy.rect for enemy in self.enemies]
+        for player in self.living_players():
+            collided = False
 
-        # Check boss collision
-        if self.boss is not None:
-            if pygame.sprite.collide_mask(self.boss, self.player):
-                collided = True
+            # Check boss collision
+            if self.boss is not None:
+                if self.boss.rect.colliderect(player.rect) and combat.masks_overlap(self.boss, player):
+                    collided = True
 
-        # Check regular enemy collisions
-        for enemy in self.enemies:
-            if enemy.rect.colliderect(self.player.rect):
+            # Check regular enemy collisions
+            if player.rect.collidelist(enemy_rects) != -1:
                 collided = True
-                break
 
-        if collided:
-            self.player.take_damage(1)
-            px, py = self.player.x, self.player.y
-            for enemy in self.enemies:
-                    enemy.set_knockback(px, py, app.PUSHBACK_DISTANCE)
+            if collided:
+                player.take_damage(1)
+                # Nearby enemies are pushed away when combat is resolved
+                self.combat.impulse(player.x, player.y, app.PUSHBACK_DISTANCE)
+
+    def check_player_projectile_collisions(self):
+        """Check boss projectiles against each living player's hitbox."""
+        for player in self.living_players():
+            if self.enemy_projectiles.collide(player.x, player.y, app.PLAYER_HITBOX_RADIUS):
+                player.take_damage(1)
 
+    def end_run(self):
+        """Queue the finished run for saving and ask for the leaderboard."""
+        self.run_history.record_run(
+            self.player.level, self.player.xp, self.run_ticks / app.TICK_RATE,
+            self.kills, self.bosses_defeated, self.run_upgrades)
+        self.leaderboard = self.run_history.request_leaderboard()
+
+    def draw_leaderboard(self):
+        """Draw the best runs under the game over text once they are loaded."""
+        if self.leaderboard is None or not self.leaderboard.done():
+            return
+        if self.leaderboard.exception() is not None:
+            return
+        title_surf = self.font_small.render("Best Runs", True, (255, 215, 0))
+        title_rect = title_surf.get_rect(center=(app.WIDTH // 2, app.HEIGHT // 2 + 90))
+        self.screen.blit(title_surf, title_rect)
+        for i, (level, xp, seconds) in enumerate(self.leaderboard.result()):
+            minutes, secs = divmod(int(seconds), 60)
+            row = f"{i+1}. Level {level}  XP {xp:g}  {minutes}:{secs:02d}"
+            row_surf = self.font_small.render(row, True, (255, 255, 255))
+            row_rect = row_surf.get_rect(center=(app.WIDTH // 2, app.HEIGHT // 2 + 130 + i * 30))
+            self.screen.blit(row_surf, row_rect)
 
     def draw_game_over_screen(self):
         """
@@ -401,19 +906,26 @@ class Game:
         prompt_rect = prompt_surf.get_rect(center=(app.WIDTH // 2, app.HEIGHT // 2 + 20))
         self.screen.blit(prompt_surf, prompt_rect)
 
-    def find_nearest_enemy(self):
+        # Show the best runs so far
+        self.draw_leaderboard()
+
+    def find_nearest_enemy(self, player=None):
         """
-        Find the enemy closest to the player.
+        Find the enemy closest to a player.
+
+        Args:
+            player: Player to measure from (default: the lead player)
         
         Returns:
             The nearest Enemy object or None if no enemies exist
         """
         if not self.enemies:
             return None
-            
+
+        player = player or self.player
         nearest = None
         min_dist = float('inf')  # Initialize with very large distance
-        px, py = self.player.x, self.player.y
+        px, py = player.x, player.y
         
         # Calculate distance to each enemy and find the nearest one
         for enemy in self.enemies:
@@ -428,62 +940,156 @@ class Game:
         Check for collisions between bullets and enemies/boss.
         Handles damage application, piercing, and death effects.
         """
-        # Loop over a copy of the bullets list to allow removal during iteration
-        for bullet in self.player.bullets[:]:
+        for player in self.players:
+            self.check_player_bullet_collisions(player)
+
+    def check_player_bullet_collisions(self, player):
+        """
+        Check one player's bullets against enemies and the boss.
+
+        Args:
+            player: The player whose bullets to check
+        """
+        # Hits are only recorded here; resolve_combat applies them. Targets
+        # already dealt lethal damage this tick are skipped, so bullets fly
+        # past them as they did when a kill removed the enemy at once.
+        bullets = player.bullets
+        enemies = self.enemies
+        queue = self.combat
+        enemy_rects = [enemy.rect for enemy in enemies]
+        for bullet in bullets:
+            if not bullets.alive(bullet.handle):
+                continue
+
             # Check for boss collision first
-            if self.boss is not None:
-                if pygame.sprite.collide_mask(bullet, self.boss):
-                    self.boss.health -= bullet.damage
+            boss = self.boss
+            if boss is not None and not queue.lethal(combat.BOSS, boss.health):
+                if bullet.rect.colliderect(boss.rect) and combat.masks_overlap(bullet, boss):
+                    queue.hit(combat.BOSS, bullet.damage, bullet.x, bullet.y)
                     # Remove bullet unless it has piercing capability
                     if self.pierce_level <= 0: 
-                        self.player.bullets.remove(bullet)
-                    # Check if boss was defeated
-                    if self.boss.health <= 0:
-                        self.boss = None
-                    break  # Stop checking other enemies for this bullet
+                        bullets.destroy(bullet.handle)
+                    break  # Only one bullet hits the boss per tick
 
             # Track how many enemies this bullet has pierced through
             bullet_pierce_count = 0
-            hit_enemies = []  # Track enemies already hit by this bullet
-            
-            # Check collisions with regular enemies
-            for enemy in self.enemies[:]:
-                if pygame.sprite.collide_mask(bullet, enemy) and enemy not in hit_enemies:
-                    hit_enemies.append(enemy)
-                    enemy.health -= bullet.damage
-                    bullet_pierce_count += 1
 
-                    # Handle enemy death
-                    if enemy.health <= 0:
-                        self.enemies.remove(enemy)
-                        # Random chance to drop weapon (2%) or coin (98%)
-                        if random.random() < 0.02:
-                            new_weapon = Weapon(enemy.x, enemy.y, self.assets)
-                            self.weapons.append(new_weapon)
-                        else:
-                            new_coin = Coin(enemy.x, enemy.y)
-                            self.coins.append(new_coin)
+            # Rects are filtered in one call; masks only for the overlaps
+            for index in bullet.rect.collidelistall(enemy_rects):
+                enemy = enemies[index]
+                if queue.lethal(enemy.handle, enemy.health):
+                    continue
+                if combat.masks_overlap(bullet, enemy):
+                    queue.hit(enemy.handle, bullet.damage, bullet.x, bullet.y)
+                    bullet_pierce_count += 1
 
                     # Remove bullet if it has exceeded its pierce limit
                     if bullet_pierce_count > self.pierce_level:
-                        self.player.bullets.remove(bullet)
+                        bullets.destroy(bullet.handle)
                         break  # Stop checking other enemies for this bullet
 
+    def resolve_combat(self):
+        """
+        Apply this tick's queued hits and knockback in batched stages:
+        damage totals, deaths, drop rolls, then knockback.
+        """
+        queue = self.combat
+        profiler = self.profiler
+        enemies = self.enemies
+
+        # Damage: one total per target, however many bullets hit it
+        dead = []
+        if queue.targets:
+            profiler.phase = "combat_damage"
+            targets, totals, first_hits = queue.damage_totals()
+            for handle, total, first in zip(targets.tolist(), totals.tolist(),
+                                            first_hits.tolist()):
+                hit_x, hit_y = queue.hit_x[first], queue.hit_y[first]
+                if handle == combat.BOSS:
+                    if self.boss is not None:
+                        self.damage_boss(total, hit_x, hit_y)
+                    continue
+                if not enemies.alive(handle):
+                    continue
+                enemy = enemies.get(handle)
+                enemy.health -= total
+                if enemy.health > 0:
+                    colour = particles.ENEMY_COLOURS.get(enemy.enemy_type, (255, 255, 255))
+                    self.particles.burst("hit", hit_x, hit_y, colour)
+                else:
+                    dead.append(enemy)
+
+        # Deaths
+        if dead:
+            profiler.phase = "combat_deaths"
+            for enemy in dead:
+                enemies.destroy(enemy.handle)
+                self.particles.burst("death", enemy.x, enemy.y,
+                                     particles.ENEMY_COLOURS.get(enemy.enemy_type,
+                                                                 (255, 255, 255)))
+                self.telemetry.record(telemetry.DEATH, enemy.type_id,
+                                      enemy.x, enemy.y, -enemy.health)
+            self.kills += len(dead)
+
+            # Roll each enemy's drop table (weapon, coin or nothing)
+            profiler.phase = "combat_drops"
+            rolls = [random.random() for _ in dead]
+            for enemy, roll in zip(dead, rolls):
+                drop = self.content.roll_drop(enemy.type_id, roll)
+                if drop == content.DROP_WEAPON:
+                    self.weapons.create(Weapon(enemy.x, enemy.y, self.assets))
+                elif drop == content.DROP_COIN:
+                    self.coins.create(Coin(enemy.x, enemy.y))
+
+        # Knockback: only enemies within reach of each impulse
+        if queue.impulse_x and enemies:
+            profiler.phase = "combat_knockback"
+            count = len(enemies)
+            xs = np.fromiter((enemy.x for enemy in enemies), np.float64, count)
+            ys = np.fromiter((enemy.y for enemy in enemies), np.float64, count)
+            for indices, dxs, dys, distance in queue.knockbacks(xs, ys, app.KNOCKBACK_RADIUS):
+                for index, dx, dy in zip(indices.tolist(), dxs.tolist(), dys.tolist()):
+                    enemy = enemies[index]
+                    enemy.knockback_dx = dx
+                    enemy.knockback_dy = dy
+                    enemy.knockback_dist_remaining = distance
+
+        queue.clear()
+        profiler.phase = "update"
+
+    def damage_boss(self, damage, x, y):
+        """
+        Damage the boss, removing it once defeated.
+
+        Args:
+            damage (float): Damage dealt
+            x (float): World x-coordinate of the hit
+            y (float): World y-coordinate of the hit
+        """
+        boss = self.boss
+        boss.health -= damage
+        self.particles.burst("hit", x, y, particles.HIT_COLOUR)
+        if boss.health <= 0:
+            self.telemetry.record(telemetry.DEATH, app.ENEMY_TYPE_IDS[boss.enemy_type],
+                                  boss.x, boss.y, -boss.health)
+            self.particles.burst("boss_death", boss.x, boss.y,
+                                 particles.ENEMY_COLOURS.get(boss.enemy_type, (255, 255, 255)))
+            self.boss = None
+            self.bosses_defeated += 1
+
     def check_player_coin_collisions(self):
         """
         Check for and handle player collisions with coins.
         Adds XP for each collected coin.
         """
-        coins_collected = []
-        for coin in self.coins:
-            if coin.rect.colliderect(self.player.rect):
-                coins_collected.append(coin)
-                self.player.add_xp(self.xp_value)
-            
-        # Remove collected coins from game
-        for c in coins_collected:
-            if c in self.coins:
-                self.coins.remove(c) 
+        for player in self.living_players():
+            for coin in self.coins:
+                # destroy() is False for a coin already collected this tick
+                if coin.rect.colliderect(player.rect) and self.coins.destroy(coin.handle):
+                    # XP is shared through the lead player
+                    self.player.add_xp(self.xp_value)
+                    self.particles.burst("pickup", coin.x, coin.y, particles.COIN_COLOUR)
+                    self.telemetry.record(telemetry.COIN, 0, coin.x, coin.y, self.xp_value)
 
     
     def check_player_weapon_collisions(self): 
@@ -491,15 +1097,13 @@ class Game:
         Check for and handle player collisions with weapons.
         Equips collected weapons to the player.
         """
-        collected_weapons = []
-        for weapon in self.weapons: 
-            if pygame.sprite.collide_mask(weapon, self.player):
-                self.player.equip_weapon(weapon)
-                collected_weapons.append(weapon)
-
-        # Remove collected weapons from game
-        for weapon in collected_weapons:
-            self.weapons.remove(weapon)
+        for player in self.living_players():
+            for weapon in self.weapons: 
+                if (self.weapons.alive(weapon.handle) and weapon.rect.colliderect(player.rect)
+                        and combat.masks_overlap(weapon, player)):
+                    player.equip_weapon(weapon)
+                    self.weapons.destroy(weapon.handle)
+                    self.telemetry.record(telemetry.WEAPON_EQUIP, 0, weapon.x, weapon.y)
 
     def pick_random_upgrades(self, num):
         """
@@ -514,8 +1118,8 @@ class Game:
         # Filter available upgrades based on player level and health
         available_upgrades = [
             up for up in self.possible_upgrades 
-            if self.player.level >= up.get("min_level", 1)
-            and (up["name"] != "HEALER" or self.player.health < self.player.max_health)
+            if self.player.level >= up["min_level"]
+            and (not up["requires_missing_health"] or self.player.health < self.player.max_health)
         ]
         # Use weighted selection to pick upgrades
         return weighted_sample_without_replacement(available_upgrades, "weight", num)
@@ -529,29 +1133,16 @@ class Game:
             upgrade: Dictionary containing upgrade details
         """
         name = upgrade["name"]
-            
-        if name == "BERSERK":
-            player.base_damage *= 1.5  # Increase damage
-        elif name == "SPEEDSTER":
-            player.bullet_speed += 3  # Faster bullets
-            player.speed += 0.8  # Faster movement
-        elif name == "ARCHER":
-            player.bullet_count += 2  # More bullets per shot
-        elif name == "HEALER":
-            # Heal player, with different amounts based on current health
-            if player.health >= 5:
-                player.health = 5  # Cap at max health
-            elif player.health <= 1: 
-                player.health += 2  # Bigger heal when very low
-            else: 
-                player.health += 1  # Normal heal
-        elif name == "INVESTOR": 
-            self.xp_value *= 1.25  # XP bonus
-        elif name == "SNIPER":
-            self.pierce_level += 1  # Bullets pierce enemies
-            # Remove SNIPER from possible upgrades after taking it once
+        self.run_upgrades.append((name, player.level))
+        self.telemetry.record(telemetry.UPGRADE, upgrade["id"],
+                              player.x, player.y, player.level)
+
+        # Effects are compiled from the content file
+        content.apply_effects(upgrade["effects"], player, self)
+        if upgrade["unique"]:
+            # Unique upgrades can only be taken once
             self.possible_upgrades = [
-                up for up in self.possible_upgrades if up["name"] != "SNIPER"
+                up for up in self.possible_upgrades if up["name"] != name
             ]
 
     def draw_upgrade_menu(self):
@@ -568,20 +1159,10 @@ class Game:
         title_rect = title_surf.get_rect(center=(app.WIDTH // 2, app.HEIGHT // 3 - 50))
         self.screen.blit(title_surf, title_rect)
 
-        # Color mapping for different upgrade types
-        upgrade_colors = {
-            "BERSERK": (255, 0, 0),       # Red
-            "SPEEDSTER": (255, 255, 0),    # Yellow
-            "ARCHER": (0, 213, 255),     # Light Blue
-            "SNIPER": (0, 255, 0),   # Green
-            "HEALER": (255, 182, 193),   # Light pink
-            "INVESTOR": (160, 32, 240)  # Purple
-        }
-
-        # Draw each upgrade option with its corresponding color
+        # Draw each upgrade option in its content-defined color
         for i, upgrade in enumerate(self.upgrade_options):
             text_str = f"{i+1}. {upgrade['name']} - {upgrade['desc']}"
-            color = upgrade_colors.get(upgrade["name"].upper(), (255, 255, 255))
+            color = upgrade["color"]
             option_surf = self.font_small.render(text_str, True, color)
             line_y = app.HEIGHT // 3 + i * 40
             option_rect = option_surf.get_rect(center=(app.WIDTH // 2, line_y))
@@ -596,20 +1177,34 @@ class Game:
         if self.player.xp >= xp_needed:
             # Level up the player
             self.player.level += 1
+            self.telemetry.record(telemetry.LEVEL_UP, 0, self.player.x, self.player.y,
+                                  self.player.level)
+            if self.memory is not None:
+                print(format_report(self.memory.report(self.player.level)))
             self.enemies.clear()  # Clear current enemies
             self.in_level_up_menu = True
             self.upgrade_options = self.pick_random_upgrades(3)  # Get 3 upgrade options
         
-            # Every 5 levels, spawn a boss
-            if self.player.level % 5 == 0:
+            # Every few levels (5 by default), spawn a boss
+            if self.player.level % self.content.boss_every_levels == 0:
                 self.enemies.clear()  # Clear any remaining enemies
                 self.coins.clear()  # Clear any remaining coins
-                boss_x = app.WIDTH // 2
-                boss_y = app.HEIGHT // 4
-                selected_enemy_type = random.choice(list(self.assets["enemies"].keys()))
-                self.boss = Boss(boss_x, boss_y, self.assets["enemies"], self.player, speed=2)
+                boss_x = self.camera.rect.centerx
+                boss_y = self.camera.rect.top + app.HEIGHT // 4
+                self.boss = Boss(boss_x, boss_y, self.assets["enemies"], self.player,
+                                 speed=self.content.boss_speed,
+                                 registry=self.boss_assets, player_count=len(self.players))
+                self.telemetry.record(telemetry.BOSS_SPAWN,
+                                      app.ENEMY_TYPE_IDS[self.boss.enemy_type],
+                                      boss_x, boss_y, self.boss.max_health)
+                if app.PROFILE_BOSS_SECONDS:
+                    self.profiler.capture_window(app.PROFILE_BOSS_SECONDS,
+                                                 f"boss-level{self.player.level}")
             else:
                 self.boss = None  # Ensure no boss is active on non-boss levels
 
             # Increase enemy spawn rate with each level
             self.enemies_per_spawn += 1
+            self.wave_index = 0
+            self.wave_pending = 0
+            self.start_level_warmup()
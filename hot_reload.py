@@ -0,0 +1,221 @@
+# hot_reload.py
+# Watches asset and tuning files and swaps changed assets in between frames
+
+import ast
+import os
+import threading
+
+import pygame
+
+import app
+import content
+
+class Reload:
+    """Everything one hot reload changed."""
+
+    def __init__(self):
+        self.frame_sets = {}   # (group, animation name or None) -> new frames
+        self.constants = {}    # app constant name -> new value
+        self.content = None    # Newly compiled Content, if content.json changed
+        self.errors = []       # Files that could not be reloaded, with the reason
+
+    def groups(self):
+        """Return the names of the asset groups that changed."""
+        return {group for group, _ in self.frame_sets}
+
+    def __bool__(self):
+        return bool(self.frame_sets or self.constants or self.content)
+
+def read_constants(path, names):
+    """
+    Read literal constants from a Python file without executing it.
+
+    Args:
+        path (str): Source file (normally app.py)
+        names (callable): Predicate picking the constant names to read
+
+    Returns:
+        dict: Constant name -> value, for assignments with literal values
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    constants = {}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and names(node.targets[0].id)):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                pass  # Computed from other constants; not reloadable
+    return constants
+
+def is_reloadable(name):
+    """Return True for app constants the watcher re-reads."""
+    return name.endswith("_SCALE_FACTOR") or name in app.HOT_RELOAD_CONSTANTS
+
+class AssetWatcher:
+    """
+    Polls the asset folder, app.py and the content file on a daemon thread.
+
+    Only the frame sets whose files (or scale factor) changed are decoded
+    again, on the watcher thread; the new frames wait in `pending` until
+    the game calls swap() between frames. Swapping replaces the contents of
+    the existing frame lists, so sprites already holding those lists pick
+    up the new frames on their next animation step. Derived variants follow
+    automatically: flipped frames are cached per surface and rotated
+    fireball frames are made from the live lists, while cached boss frame
+    sets are dropped by the game (see Game.apply_reload).
+    """
+
+    def __init__(self, assets, folder=None, config_path=None, content_path=None,
+                 interval=None):
+        """
+        Args:
+            assets (AssetStore): The live assets dict to update
+            folder (str): Asset folder (default app.ASSET_FOLDER)
+            config_path (str): Tuning constants file (default app.py)
+            content_path (str): Content file (default app.CONTENT_PATH)
+            interval (float): Seconds between checks (default app.HOT_RELOAD_INTERVAL)
+        """
+        self.assets = assets
+        self.folder = folder or app.ASSET_FOLDER
+        self.config_path = config_path or app.__file__
+        self.content_path = content_path or app.CONTENT_PATH
+        self.interval = interval if interval is not None else app.HOT_RELOAD_INTERVAL
+
+        # Frame set key and spec for every asset file
+        self.owners = {}
+        for key, spec in app.frame_sets():
+            prefix, frame_count = spec[0], spec[1]
+            for i in range(frame_count):
+                self.owners[os.path.join(self.folder, f"{prefix}_{i}.png")] = (key, spec)
+        self.constants = {name: getattr(app, name)
+                          for name in read_constants(self.config_path, is_reloadable)}
+        self.stamps = self.scan()
+
+        self.pending = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.reloads = 0
+
+    def scan(self):
+        """Return (mtime, size) for every watched file that exists."""
+        stamps = {}
+        for path in [*self.owners, self.config_path, self.content_path]:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def changed_files(self):
+        """Return the watched files modified since the last call."""
+        stamps = self.scan()
+        changed = [path for path, stamp in stamps.items() if self.stamps.get(path) != stamp]
+        self.stamps = stamps
+        return changed
+
+    def check(self):
+        """
+        Look for changed files and prepare a Reload for them.
+
+        Returns:
+            Reload: The prepared changes (empty if nothing changed)
+        """
+        reload = Reload()
+        changed = self.changed_files()
+        stale = {}  # Frame set key -> spec
+
+        if self.config_path in changed:
+            try:
+                constants = read_constants(self.config_path, is_reloadable)
+            except (SyntaxError, OSError) as exc:
+                reload.errors.append((self.config_path, str(exc)))
+                constants = {}
+            for name, value in constants.items():
+                if self.constants.get(name) != value:
+                    reload.constants[name] = value
+            self.constants.update(reload.constants)
+            # Frame sets scaled by a changed factor must be decoded again
+            for key, spec in app.frame_sets():
+                if spec[2] in reload.constants:
+                    stale[key] = spec
+
+        for path in changed:
+            if path in self.owners:
+                key, spec = self.owners[path]
+                stale[key] = spec
+
+        for key, spec in stale.items():
+            try:
+                reload.frame_sets[key] = app.load_frame_set(
+                    spec, self.folder, scale_factor=self.constants[spec[2]])
+            except (pygame.error, OSError, ValueError) as exc:
+                # Half-written files are retried when they next change
+                reload.errors.append((key, str(exc)))
+
+        if self.content_path in changed:
+            try:
+                reload.content = content.load_content(self.content_path)
+            except (OSError, ValueError) as exc:
+                reload.errors.append((self.content_path, str(exc)))
+        return reload
+
+    def watch(self):
+        """Watcher thread loop: queue changes for the next swap()."""
+        while not self.stopped.wait(self.interval):
+            reload = self.check()
+            if reload or reload.errors:
+                with self.lock:
+                    self.pending = merge(self.pending, reload)
+
+    def start(self):
+        """Start watching on a daemon thread."""
+        self.thread = threading.Thread(target=self.watch, name="asset-watcher", daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        """Stop the watcher thread."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def swap(self):
+        """
+        Apply prepared changes to the live assets, app constants and content.
+        Call this between frames, on the main thread.
+
+        Returns:
+            Reload: What changed, or None if nothing is waiting
+        """
+        if self.pending is None:
+            return None
+        with self.lock:
+            reload, self.pending = self.pending, None
+
+        for (group, name), frames in reload.frame_sets.items():
+            live = self.assets[group]
+            if name is not None:
+                live = live[name]
+            live[:] = frames
+        for name, value in reload.constants.items():
+            setattr(app, name, value)
+        if reload.content is not None:
+            content.replace_current(reload.content)
+        for source, message in reload.errors:
+            print(f"Hot reload failed for {source}: {message}")
+        self.reloads += 1
+        return reload
+
+def merge(older, newer):
+    """Combine two Reloads not yet swapped in, the newer one winning."""
+    if older is None:
+        return newer
+    older.frame_sets.update(newer.frame_sets)
+    older.constants.update(newer.constants)
+    older.content = newer.content or older.content
+    older.errors.extend(newer.errors)
+    return older
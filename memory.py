@@ -0,0 +1,169 @@
+# memory.py
+# Memory accounting: surface bytes, live objects and allocation sites
+
+import gc
+import os
+import threading
+import tracemalloc
+
+import app
+
+def surface_bytes(surface):
+    """Pixel memory held by one surface."""
+    return surface.get_pitch() * surface.get_height()
+
+def frames_bytes(frames):
+    """Pixel memory of a frame list or a dict of frame lists."""
+    if isinstance(frames, dict):
+        return sum(frames_bytes(animation) for animation in frames.values())
+    return sum(surface_bytes(frame) for frame in frames)
+
+def asset_bytes(assets):
+    """
+    Surface bytes of each loaded asset group. Groups still loading are
+    left out rather than waited on.
+
+    Args:
+        assets (AssetStore): Assets from app.load_assets
+
+    Returns:
+        dict: Group name -> bytes
+    """
+    return {group: frames_bytes(assets[group]) for group in assets if assets.is_ready(group)}
+
+def cache_bytes(game):
+    """
+    Surface bytes held by derived-image caches.
+
+    Returns:
+        dict: Cache name -> bytes
+    """
+    boss_sets = list(game.boss_assets.frame_sets.values())
+    return {
+        "flipped frames": sum(surface_bytes(image) for image in list(app._flipped_frames.values())),
+        "boss frames": sum(frames_bytes(frame_set.frames) + frames_bytes(frame_set.flipped)
+                           for frame_set in boss_sets),
+        "floor chunks": game.floor.cached_bytes,
+        "low-res copies": sum(surface_bytes(image)
+                              for image in list(game.world_target.downscaled.values())),
+        "solid squares": sum(surface_bytes(image) for image in app._solid_images.values()),
+    }
+
+def entity_counts(game):
+    """Live game objects and threads."""
+    return {
+        "enemies": len(game.enemies),
+        "bullets": sum(len(player.bullets) for player in game.players),
+        "coins": len(game.coins),
+        "weapons": len(game.weapons),
+        "particles": game.particles.count,
+        "projectiles": game.enemy_projectiles.count,
+        "snapshots": len(game.snapshot_history),
+        "threads": threading.active_count(),
+        "python objects": len(gc.get_objects()),
+    }
+
+def resident_bytes():
+    """Current resident set size, or None where it can't be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class MemoryMonitor:
+    """
+    Collects memory reports for a game: asset and cache surface bytes,
+    live entity counts and, when tracing, the allocation sites that grew
+    the most since the previous report.
+
+    tracemalloc slows allocation-heavy code down noticeably, so tracing
+    only runs when asked for.
+    """
+
+    def __init__(self, game, trace=False, top=10, frames=1):
+        """
+        Args:
+            game (Game): Game to inspect
+            trace (bool): Track Python allocation sites with tracemalloc
+            top (int): Allocation sites listed per report
+            frames (int): Stack frames kept per allocation
+        """
+        self.game = game
+        self.trace = trace
+        self.top = top
+        self.reports = []
+        self.last_snapshot = None
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def sample(self):
+        """
+        Returns:
+            dict: Traced and resident bytes plus live entity counts
+        """
+        sample = {"rss": resident_bytes()}
+        if self.trace:
+            sample["traced"] = tracemalloc.get_traced_memory()[0]
+        sample.update(entity_counts(self.game))
+        return sample
+
+    def top_sites(self):
+        """
+        Return the allocation sites that grew the most since the last call.
+
+        Returns:
+            list: (site, bytes now, bytes change) tuples
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        if self.last_snapshot is None:
+            stats = [(stat.traceback, stat.size, stat.size)
+                     for stat in snapshot.statistics("lineno")[:self.top]]
+        else:
+            stats = [(stat.traceback, stat.size, stat.size_diff)
+                     for stat in snapshot.compare_to(self.last_snapshot, "lineno")[:self.top]]
+        self.last_snapshot = snapshot
+        return [(str(traceback), size, change) for traceback, size, change in stats]
+
+    def report(self, level=None):
+        """
+        Build a full report and keep it in `reports`.
+
+        Args:
+            level (int): Player level the report belongs to
+
+        Returns:
+            dict: The report
+        """
+        report = {
+            "level": level,
+            "assets": asset_bytes(self.game.assets),
+            "caches": cache_bytes(self.game),
+            "sample": self.sample(),
+        }
+        if self.trace:
+            report["sites"] = self.top_sites()
+        self.reports.append(report)
+        return report
+
+def format_report(report):
+    """Render a report from MemoryMonitor.report as text."""
+    lines = [f"Memory report (level {report['level']})"]
+    for section in ("assets", "caches"):
+        total = sum(report[section].values())
+        lines.append(f"  {section}: {total / 1024:,.0f} KiB")
+        for name, size in sorted(report[section].items(), key=lambda item: -item[1]):
+            lines.append(f"    {name:<16}{size / 1024:>10,.0f} KiB")
+    lines.append("  live:")
+    for name, value in report["sample"].items():
+        if value is not None:
+            value = f"{value / 1024 / 1024:,.1f} MiB" if name in ("rss", "traced") else value
+            lines.append(f"    {name:<16}{value:>10}")
+    if "sites" in report:
+        lines.append("  allocation sites (size, change):")
+        for site, size, change in report["sites"]:
+            lines.append(f"    {size / 1024:>8,.0f} KiB {change / 1024:>+8,.0f} KiB  {site}")
+    return "\n".join(lines)
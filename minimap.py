@@ -0,0 +1,105 @@
+# minimap.py
+# Low-frequency overview map of the whole world
+
+import numpy as np
+import pygame
+
+# Colours (RGB)
+BACKGROUND = (20, 18, 16)
+ENEMY = (255, 40, 40)
+COIN = (255, 215, 0)
+WEAPON = (207, 159, 255)
+BOSS = (255, 255, 255)
+PLAYER = (0, 255, 0)
+VIEW = (200, 200, 200)
+
+class Minimap:
+    """
+    Overview of the world drawn from a coarse occupancy grid.
+
+    refresh() bins entity positions into the grid and renders it into a
+    cached surface with surfarray; it is meant to run a few times per
+    second. draw() only blits the cached surface and outlines the camera
+    view, so its per-frame cost does not depend on how many entities exist.
+    """
+
+    def __init__(self, world_width, world_height, columns, rows, pixels_per_cell=2):
+        """
+        Args:
+            world_width (int): World width
+            world_height (int): World height
+            columns (int): Grid columns
+            rows (int): Grid rows
+            pixels_per_cell (int): On-screen size of one grid cell
+        """
+        self.world_width = world_width
+        self.world_height = world_height
+        self.columns = columns
+        self.rows = rows
+        self.pixels_per_cell = pixels_per_cell
+        self.grid_surface = pygame.Surface((columns, rows))
+        self.surface = pygame.Surface((columns * pixels_per_cell, rows * pixels_per_cell))
+        self.surface.fill(BACKGROUND)
+        self.rgb = np.empty((columns, rows, 3), np.uint8)
+
+    def cells(self, xs, ys):
+        """Flat grid cell index for arrays of world positions."""
+        column = np.clip((xs * self.columns / self.world_width).astype(np.int64), 0, self.columns - 1)
+        row = np.clip((ys * self.rows / self.world_height).astype(np.int64), 0, self.rows - 1)
+        return column * self.rows + row
+
+    def counts(self, objects):
+        """Number of objects in each grid cell, shaped (columns, rows)."""
+        count = len(objects)
+        xs = np.fromiter((obj.x for obj in objects), float, count)
+        ys = np.fromiter((obj.y for obj in objects), float, count)
+        return np.bincount(self.cells(xs, ys), minlength=self.columns * self.rows) \
+            .reshape(self.columns, self.rows)
+
+    def refresh(self, enemies, coins, weapons, boss, players):
+        """
+        Rebuild the cached map from current entity positions.
+
+        Args:
+            enemies (list): Regular enemies
+            coins (list): Coins on the ground
+            weapons (list): Weapons on the ground
+            boss: The active Boss or None
+            players (list): Living players
+        """
+        rgb = self.rgb
+        rgb[:] = BACKGROUND
+
+        # Enemy density: brighter red for more enemies in a cell
+        density = self.counts(enemies)
+        if density.any():
+            level = np.log1p(density) / np.log1p(density.max())
+            occupied = density > 0
+            for channel, value in enumerate(ENEMY):
+                rgb[..., channel][occupied] = (60 + level[occupied] * (value - 60)).astype(np.uint8)
+
+        # Single-colour markers, later ones drawn over earlier ones
+        for objects, colour in ((coins, COIN), (weapons, WEAPON), (players, PLAYER)):
+            rgb[self.counts(objects) > 0] = colour
+        if boss is not None:
+            cell = self.cells(np.array([boss.x]), np.array([boss.y]))[0]
+            column, row = divmod(int(cell), self.rows)
+            rgb[max(0, column - 1):column + 2, max(0, row - 1):row + 2] = BOSS
+
+        pygame.surfarray.blit_array(self.grid_surface, rgb)
+        pygame.transform.scale(self.grid_surface, self.surface.get_size(), self.surface)
+
+    def draw(self, screen, view, pos):
+        """
+        Blit the cached map and outline the camera view.
+
+        Args:
+            screen (pygame.Surface): Surface to draw on
+            view (pygame.Rect): Camera view in world coordinates
+            pos (tuple): Top-left corner of the map on screen
+        """
+        screen.blit(self.surface, pos)
+        scale_x = self.surface.get_width() / self.world_width
+        scale_y = self.surface.get_height() / self.world_height
+        pygame.draw.rect(screen, VIEW, (pos[0] + view.x * scale_x, pos[1] + view.y * scale_y,
+                                        view.width * scale_x, view.height * scale_y), 1)
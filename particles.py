@@ -0,0 +1,172 @@
+# particles.py
+# Array-backed particle effects for hits, deaths and pickups
+
+import numpy as np
+import pygame
+
+from render_target import LowResTarget
+
+# Particle effects. Each burst emits "count" particles in random directions
+# at "speed" (min, max) pixels per tick, living "life" (min, max) ticks.
+# "rise" is added to the initial vertical speed (negative is up).
+EFFECTS = {
+    "hit": {"count": 6, "speed": (1.5, 3.5), "life": (8, 16), "rise": 0},
+    "death": {"count": 24, "speed": (1, 5), "life": (20, 40), "rise": 0},
+    "boss_death": {"count": 200, "speed": (2, 9), "life": (40, 80), "rise": 0},
+    "pickup": {"count": 10, "speed": (0.5, 2), "life": (15, 30), "rise": -1.5},
+}
+
+# Particle colours by enemy type (others use white)
+ENEMY_COLOURS = {
+    "orc": (90, 200, 60),
+    "undead": (170, 190, 220),
+    "demon": (230, 60, 40),
+}
+HIT_COLOUR = (255, 240, 200)
+COIN_COLOUR = (255, 215, 0)
+
+class ParticleSystem:
+    """
+    Every particle, stored as parallel NumPy arrays.
+
+    Live particles are packed into the first `count` slots and updated with
+    one array operation per tick. Drawing writes the particles straight
+    into the target's pixels through a surfarray view.
+
+    Once more than soft_budget of the capacity is in use, bursts are
+    thinned in proportion to how close the system is to full, so a
+    crowded screen gets sparser effects instead of a slower frame.
+    Particles use their own random generator, so effects never change the
+    gameplay random sequence (or snapshots and replays).
+    """
+
+    def __init__(self, capacity, soft_budget=0.5, size=3, drag=0.92, seed=None):
+        """
+        Args:
+            capacity (int): Most particles alive at once
+            soft_budget (float): Fraction of capacity where thinning starts
+            size (int): Particle square size in screen pixels
+            drag (float): Velocity multiplier applied every tick
+            seed (int): Seed for the particle random generator
+        """
+        self.capacity = capacity
+        self.soft_limit = int(capacity * soft_budget)
+        self.size = size
+        self.drag = drag
+        self.rng = np.random.default_rng(seed)
+        # Rows: x, y, vx, vy, life left, starting life
+        self.state = np.zeros((6, capacity), np.float32)
+        self.colours = np.zeros((3, capacity), np.float32)
+        self.count = 0
+        self.emitted = 0
+        self.thinned = 0  # Particles skipped to stay within the budget
+
+    def burst(self, effect, x, y, colour):
+        """
+        Emit one of the EFFECTS at a point.
+
+        Args:
+            effect (str): Effect name
+            x (float): World x-coordinate
+            y (float): World y-coordinate
+            colour (tuple): RGB colour
+        """
+        spec = EFFECTS[effect]
+        self.emit(x, y, spec["count"], colour, spec["speed"], spec["life"], spec["rise"])
+
+    def emit(self, x, y, count, colour, speed, life, rise=0.0):
+        """
+        Emit particles from a point in random directions.
+
+        Args:
+            x (float): World x-coordinate
+            y (float): World y-coordinate
+            count (int): Particles wanted (fewer when over the soft budget)
+            colour (tuple): RGB colour
+            speed (tuple): (min, max) pixels per tick
+            life (tuple): (min, max) ticks
+            rise (float): Added to every particle's vertical speed
+        """
+        wanted = count
+        if self.count > self.soft_limit:
+            # Scale the burst down linearly to nothing at full capacity
+            room_left = (self.capacity - self.count) / (self.capacity - self.soft_limit)
+            count = int(count * room_left + self.rng.random())
+        count = min(count, self.capacity - self.count)
+        self.thinned += wanted - count
+        if count <= 0:
+            return
+
+        rng = self.rng
+        angles = rng.uniform(0, 2 * np.pi, count)
+        speeds = rng.uniform(speed[0], speed[1], count)
+        start, end = self.count, self.count + count
+        state = self.state
+        state[0, start:end] = x
+        state[1, start:end] = y
+        state[2, start:end] = np.cos(angles) * speeds
+        state[3, start:end] = np.sin(angles) * speeds + rise
+        state[4, start:end] = rng.integers(life[0], life[1] + 1, count)
+        state[5, start:end] = state[4, start:end]
+        self.colours[:, start:end] = np.asarray(colour, np.float32)[:, None]
+        self.count = end
+        self.emitted += count
+
+    def update(self):
+        """Move and age every particle, removing the expired ones."""
+        if self.count == 0:
+            return
+        live = self.state[:, :self.count]
+        live[:2] += live[2:4]
+        live[2:4] *= self.drag
+        live[4] -= 1
+        keep = live[4] > 0
+        kept = int(keep.sum())
+        if kept != self.count:
+            self.state[:, :kept] = live[:, keep]
+            self.colours[:, :kept] = self.colours[:, :self.count][:, keep]
+            self.count = kept
+
+    def clear(self):
+        """Remove every particle."""
+        self.count = 0
+
+    def draw(self, target, view):
+        """
+        Write the particles inside a view into the target's pixels, fading
+        each one out over its life.
+
+        Args:
+            target: A 32-bit pygame.Surface or LowResTarget the size of the view
+            view (pygame.Rect): Visible part of the world
+        """
+        if self.count == 0:
+            return
+        if isinstance(target, LowResTarget):
+            surface, scale = target.surface, target.scale
+        else:
+            surface, scale = target, 1
+        size = max(1, self.size // scale)
+        width, height = surface.get_size()
+
+        live = self.state[:, :self.count]
+        xs = ((live[0] - view.x) / scale).astype(np.int32)
+        ys = ((live[1] - view.y) / scale).astype(np.int32)
+        inside = (xs >= 0) & (xs <= width - size) & (ys >= 0) & (ys <= height - size)
+        if not inside.any():
+            return
+        xs, ys = xs[inside], ys[inside]
+
+        # Pack the faded colours into the surface's pixel format
+        fade = live[4, inside] / live[5, inside]
+        rgb = (self.colours[:, :self.count][:, inside] * fade).astype(np.uint32)
+        r_shift, g_shift, b_shift = surface.get_shifts()[:3]
+        packed = (rgb[0] << r_shift) | (rgb[1] << g_shift) | (rgb[2] << b_shift)
+        if surface.get_masks()[3]:
+            packed |= np.uint32(surface.get_masks()[3])  # Opaque alpha
+
+        pixels = pygame.surfarray.pixels2d(surface)
+        for dx in range(size):
+            for dy in range(size):
+                pixels[xs + dx, ys + dy] = packed
+        del pixels  # Unlock the surface
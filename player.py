@@ -1,13 +1,13 @@
-import threading
 import pygame
 import app  # Contains global settings like WIDTH, HEIGHT, PLAYER_SPEED, etc.
 import math
 import random
-import time
 import weapon
+import telemetry
 
 from bullet import Bullet
 from fireball import Fireball
+from entities import EntityStore
 
 class Player:
     """
@@ -50,7 +50,7 @@ class Player:
         self.xp = 0  # Experience points
         self.health = 5  # Current health
         self.max_health = 5  # Maximum health
-        self.invincible = False  # Invincibility flag after taking damage
+        self.invincible_ticks = 0  # Invincibility left after taking damage
 
         # Combat properties
         self.bullet_speed = 10  # Speed of projectiles
@@ -58,33 +58,65 @@ class Player:
         self.bullet_count = 1  # Number of projectiles per shot
         self.shoot_cooldown = 1  # Shooting cooldown time
         self.shoot_timer = 0  # Current cooldown timer
-        self.bullets = []  # Active projectiles
+        self.bullets = EntityStore()  # Active projectiles (flushed by the game each tick)
         self.assets = assets  # Reference to game assets
         self.base_damage = 1  # Base damage per projectile
 
         # Progression
         self.level = 1  # Current player level
 
+        # Event recorder, set by the game
+        self.telemetry = None
+
+        # Co-op players are driven by network input instead of the keyboard
+        self.remote = False
+        self.remote_move = (0, 0)  # Direction (-1, 0 or 1 on each axis)
+
     def handle_input(self):
         """Process keyboard input to control player movement."""
+        if self.remote:
+            self.move(*self.remote_move)
+            return
+        self.move(*self.input_direction())
+
+    def input_direction(self):
+        """
+        Read the movement keys.
+
+        Returns:
+            tuple: (dir x, dir y), each -1, 0 or 1
+        """
         keys = pygame.key.get_pressed()
-        vel_x, vel_y = 0, 0  # Movement velocity components
+        dir_x, dir_y = 0, 0  # Movement direction components
 
         # Movement controls (arrow keys and WASD)
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            vel_x -= self.speed  # Move left
+            dir_x -= 1  # Move left
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            vel_x += self.speed  # Move right
+            dir_x += 1  # Move right
         if keys[pygame.K_UP] or keys[pygame.K_w]:
-            vel_y -= self.speed  # Move up
+            dir_y -= 1  # Move up
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            vel_y += self.speed  # Move down
+            dir_y += 1  # Move down
+
+        return dir_x, dir_y
+
+    def move(self, dir_x, dir_y):
+        """
+        Move one tick in a direction.
+
+        Args:
+            dir_x (int): -1 left, 0 none, 1 right
+            dir_y (int): -1 up, 0 none, 1 down
+        """
+        vel_x = dir_x * self.speed
+        vel_y = dir_y * self.speed
 
         # Update position with boundary checking
         self.x += vel_x
         self.y += vel_y
-        self.x = max(0, min(self.x, app.WIDTH))  # Clamp to screen width
-        self.y = max(0, min(self.y, app.HEIGHT))  # Clamp to screen height
+        self.x = max(0, min(self.x, app.WORLD_WIDTH))  # Clamp to world width
+        self.y = max(0, min(self.y, app.WORLD_HEIGHT))  # Clamp to world height
         self.rect.center = (self.x, self.y)
 
         # Update animation state based on movement
@@ -101,13 +133,21 @@ class Player:
 
     def update(self):
         """Update player state including bullets, animation, and weapon."""
+        if self.invincible_ticks > 0:
+            self.invincible_ticks -= 1
+
+        # The screen-sized view a camera following this player would show
+        view = pygame.Rect(0, 0, app.WIDTH, app.HEIGHT)
+        view.center = (self.x, self.y)
+        view.clamp_ip((0, 0, app.WORLD_WIDTH, app.WORLD_HEIGHT))
+
         # Update all active bullets
-        for bullet in self.bullets[:]:  # Iterate over copy to allow removal
+        for bullet in self.bullets:
             bullet.update()
-            # Remove bullets that go off-screen
-            if (bullet.y < 0 or bullet.y > app.HEIGHT or 
-                bullet.x < 0 or bullet.x > app.WIDTH):
-                self.bullets.remove(bullet)
+            # Remove bullets that leave the view
+            if (bullet.y < view.top or bullet.y > view.bottom or
+                bullet.x < view.left or bullet.x > view.right):
+                self.bullets.destroy(bullet.handle)
 
         # Handle animation updates
         self.animation_timer += 1
@@ -130,6 +170,25 @@ class Player:
             if self.weapon_cooldown > 0:
                 self.weapon_cooldown -= 1
 
+    def display_image(self):
+        """Return the current frame, flipped if the player faces left."""
+        if self.facing_left:
+            return app.flipped(self.image)
+        return self.image
+
+    def queue_draw(self, render_queue):
+        """
+        Submit the player, bullets and equipped weapon to a RenderQueue.
+
+        Args:
+            render_queue (RenderQueue): The frame's render queue
+        """
+        render_queue.add("player", self.display_image(), self.rect)
+        for bullet in self.bullets:
+            render_queue.add("player", bullet.image, bullet.rect)
+        if self.equipped_weapon:
+            render_queue.add("player", self.equipped_weapon.image, self.equipped_weapon.rect)
+
     def draw(self, surface):
         """
         Draw the player and all active bullets on the given surface.
@@ -138,11 +197,7 @@ class Player:
             surface (pygame.Surface): The surface to draw on
         """
         # Draw player with proper facing direction
-        if self.facing_left:
-            flipped_img = pygame.transform.flip(self.image, True, False)
-            surface.blit(flipped_img, self.rect)
-        else:
-            surface.blit(self.image, self.rect)
+        surface.blit(self.display_image(), self.rect)
         
         # Draw all active bullets
         for bullet in self.bullets:
@@ -152,6 +207,11 @@ class Player:
         if self.equipped_weapon:
             self.equipped_weapon.draw(surface)
 
+    @property
+    def invincible(self):
+        """True while the player can't take damage."""
+        return self.invincible_ticks > 0
+
     def take_damage(self, amount):
         """
         Reduce player health by specified amount, with invincibility frames.
@@ -161,9 +221,11 @@ class Player:
         """
         if not self.invincible:
             self.health = max(0, self.health - amount)
-            # Start invincibility period in separate thread
-            self.invincible = True
-            threading.Thread(target=self._start_invincibility_timer).start()
+            if self.telemetry:
+                self.telemetry.record(telemetry.DAMAGE, 0, self.x, self.y, amount)
+            # Invincibility runs on the simulation clock, so it is part of
+            # snapshots and replays
+            self.invincible_ticks = app.INVINCIBILITY_TICKS
 
     def shoot_toward_position(self, tx, ty):
         """
@@ -197,6 +259,8 @@ class Player:
         # Use weapon durability if equipped
         if self.equipped_weapon:
             if not self.equipped_weapon.use():  # Returns False when broken
+                if self.telemetry:
+                    self.telemetry.record(telemetry.WEAPON_BREAK, 0, self.x, self.y)
                 self.equipped_weapon = None
 
         # Create each projectile
@@ -218,7 +282,7 @@ class Player:
                 bullet = Bullet(self, self.x, self.y, final_vx, final_vy, 
                               self.bullet_size)
             
-            self.bullets.append(bullet)
+            self.bullets.create(bullet)
         
         # Reset cooldown timers
         self.shoot_timer = 0
@@ -242,15 +306,6 @@ class Player:
         """Add experience points to the player."""
         self.xp += amount
 
-    def _start_invincibility_timer(self):
-        """
-        Private method to handle invincibility timer in separate thread.
-        Waits for duration then clears invincibility flag.
-        """
-        invincibility_duration = 0.7  # Seconds of invincibility
-        time.sleep(invincibility_duration)
-        self.invincible = False
-    
     def equip_weapon(self, weapon): 
         """
         Equip a weapon to the player.
@@ -0,0 +1,141 @@
+# profiler.py
+# Sampling profiler for the game loop with per-phase collapsed-stack output
+
+import collections
+import os
+import sys
+import threading
+import time
+
+class SamplingProfiler:
+    """
+    Samples the main thread's call stack from a background thread.
+
+    Nothing is instrumented: the game only sets `phase` as it moves
+    between parts of a frame, and each sample is filed under the phase
+    that was current when it was taken. Results are written as collapsed
+    stacks ("phase;outer;inner count" per line), the input format of
+    flamegraph.pl, speedscope and similar tools.
+
+    The sampler thread only exists while profiling, either for a whole
+    session (start/stop) or for a fixed window (capture_window).
+
+    Samples can only be taken when the sampled thread gives up the GIL, so
+    time inside C calls that hold it (most pygame blits and mask building)
+    is credited to the next line that runs after the call returns.
+    """
+
+    def __init__(self, rate=500, folder="profiles", thread=None):
+        """
+        Args:
+            rate (float): Samples per second
+            folder (str): Where collapsed-stack files are written
+            thread (threading.Thread): Thread to sample (default main thread)
+        """
+        self.interval = 1.0 / rate
+        self.folder = folder
+        self.thread_id = (thread or threading.main_thread()).ident
+        self.phase = "idle"
+        self.counts = collections.Counter()
+        self.samples = 0
+        self.sampler = None
+        self.stopping = threading.Event()
+        self.deadline = None
+        self.label = None
+        self.lock = threading.Lock()
+        self.windows = 0
+        self.path = None  # Output of the last finished run
+
+    @property
+    def running(self):
+        return self.sampler is not None and self.sampler.is_alive()
+
+    def start(self, label="session", seconds=None):
+        """
+        Start sampling unless already running.
+
+        Args:
+            label (str): Name used for the output file
+            seconds (float): Stop and write the output after this long
+                (None samples until stop() is called)
+
+        Returns:
+            bool: True if sampling started
+        """
+        with self.lock:
+            if self.running:
+                return False
+            self.counts = collections.Counter()
+            self.samples = 0
+            self.label = label
+            self.deadline = None if seconds is None else time.perf_counter() + seconds
+            self.stopping.clear()
+            self.sampler = threading.Thread(target=self.sample_loop, name="profiler",
+                                            daemon=True)
+            self.sampler.start()
+            return True
+
+    def capture_window(self, seconds, label):
+        """Profile the next `seconds` seconds (ignored if already profiling)."""
+        return self.start(label, seconds)
+
+    def stop(self):
+        """
+        Stop sampling and write the collapsed stacks.
+
+        Returns:
+            str: Path of the written file, or None if nothing was running
+        """
+        sampler = self.sampler
+        if sampler is None:
+            return None
+        self.stopping.set()
+        if sampler is not threading.current_thread():
+            sampler.join()
+        return self.path
+
+    def sample_loop(self):
+        """Sampler thread: record a stack every interval until stopped."""
+        frames = sys._current_frames
+        thread_id = self.thread_id
+        counts = self.counts
+        frame = None
+        while not self.stopping.wait(self.interval):
+            frame = frames().get(thread_id)
+            if frame is None:
+                break  # The sampled thread has exited
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+                             f"{frame.f_lineno})")
+                frame = frame.f_back
+            stack.append(self.phase)
+            counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                break
+        frame = None  # Don't keep the sampled thread's frames alive
+        self.path = self.write()
+        self.sampler = None
+
+    def write(self):
+        """Write the collapsed stacks of the last run and return the path."""
+        os.makedirs(self.folder, exist_ok=True)
+        self.windows += 1
+        path = os.path.join(self.folder, f"{time.strftime('%Y%m%d-%H%M%S')}-"
+                                         f"{self.label}-{self.windows}.collapsed")
+        with open(path, "w") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def phase_totals(self):
+        """
+        Returns:
+            dict: Samples per phase from the last (or current) run
+        """
+        totals = collections.Counter()
+        for stack, count in list(self.counts.items()):
+            totals[stack.split(";", 1)[0]] += count
+        return dict(totals)
@@ -0,0 +1,224 @@
+# projectiles.py
+# Boss attack patterns and the array-backed hostile projectiles they fire
+
+import math
+
+import numpy as np
+import pygame
+
+# Attack patterns. Every pattern fires a volley each "interval" ticks.
+#   radial: "count" projectiles evenly around the boss, rotated by "turn"
+#           degrees more each volley
+#   spiral: "arms" evenly spaced streams that turn "turn" degrees per volley
+#   aimed:  "count" projectiles fanned over "spread" degrees at the target
+PATTERNS = {
+    "ring": {"kind": "radial", "count": 16, "speed": 3.5, "interval": 50, "turn": 0},
+    "twisting_ring": {"kind": "radial", "count": 28, "speed": 4, "interval": 30, "turn": 6},
+    "dense_ring": {"kind": "radial", "count": 48, "speed": 4.5, "interval": 24, "turn": 3.75},
+    "spiral": {"kind": "spiral", "arms": 3, "speed": 3.5, "interval": 5, "turn": 11},
+    "galaxy": {"kind": "spiral", "arms": 6, "speed": 4, "interval": 3, "turn": 7},
+    "volley": {"kind": "aimed", "count": 3, "spread": 20, "speed": 6, "interval": 40},
+    "fan": {"kind": "aimed", "count": 7, "spread": 50, "speed": 6.5, "interval": 25},
+}
+
+# Boss attack scripts by the level the boss appears at (the highest level
+# not above the player's is used). Each step is (pattern, duration in ticks)
+# and the script loops.
+BOSS_SCRIPTS = {
+    5: [("ring", 240), ("volley", 180)],
+    10: [("spiral", 300), ("twisting_ring", 180), ("volley", 120)],
+    15: [("galaxy", 300), ("fan", 180), ("twisting_ring", 180)],
+    20: [("galaxy", 240), ("dense_ring", 240), ("fan", 180)],
+}
+
+def script_for_level(level, scripts=BOSS_SCRIPTS):
+    """Return the attack script for a boss spawned at a player level."""
+    eligible = [start for start in scripts if start <= level] or [min(scripts)]
+    return scripts[max(eligible)]
+
+class AttackScript:
+    """
+    Plays a boss attack script, firing each pattern's volleys into a
+    ProjectileField.
+    """
+
+    def __init__(self, level, scripts=BOSS_SCRIPTS, patterns=PATTERNS):
+        """
+        Args:
+            level (int): Player level the boss spawned at (picks the script)
+            scripts (dict): Attack scripts by starting level
+            patterns (dict): Pattern definitions by name
+        """
+        self.level = level
+        self.steps = [(patterns[name], duration)
+                      for name, duration in script_for_level(level, scripts)]
+        self.step_index = 0
+        self.step_timer = 0
+        self.angle = 0.0  # Rotation carried between volleys (degrees)
+
+    def update(self, boss, target, field):
+        """
+        Advance one tick, firing a volley when the current pattern is due.
+
+        Args:
+            boss (Boss): Source of the projectiles
+            target (Player): Player aimed patterns fire at
+            field (ProjectileField): Where fired projectiles are added
+        """
+        pattern, duration = self.steps[self.step_index]
+        if self.step_timer % pattern["interval"] == 0:
+            self.fire(pattern, boss, target, field)
+
+        self.step_timer += 1
+        if self.step_timer >= duration:
+            self.step_timer = 0
+            self.step_index = (self.step_index + 1) % len(self.steps)
+
+    def fire(self, pattern, boss, target, field):
+        """Fire one volley of a pattern."""
+        kind = pattern["kind"]
+        if kind == "radial":
+            count = pattern["count"]
+            angles = np.radians(self.angle) + np.arange(count) * (2 * math.pi / count)
+            self.angle += pattern["turn"]
+        elif kind == "spiral":
+            arms = pattern["arms"]
+            angles = np.radians(self.angle) + np.arange(arms) * (2 * math.pi / arms)
+            self.angle += pattern["turn"]
+        else:  # aimed
+            count = pattern["count"]
+            base = math.atan2(target.y - boss.y, target.x - boss.x)
+            offsets = np.linspace(-0.5, 0.5, count) if count > 1 else np.zeros(1)
+            angles = base + offsets * math.radians(pattern["spread"])
+        field.spawn(boss.x, boss.y, angles, pattern["speed"])
+
+class ProjectileField:
+    """
+    Every hostile projectile, stored as parallel NumPy arrays.
+
+    Live projectiles are packed into the first `count` slots. Each tick
+    moves them all with one array operation and compacts away any outside
+    the cull rectangle; hits against a player are found with a single
+    vectorised circle test. Spawns past capacity are dropped.
+    """
+
+    def __init__(self, capacity, radius, colour=(255, 80, 200)):
+        """
+        Args:
+            capacity (int): Most projectiles alive at once
+            radius (int): Projectile radius in pixels
+            colour (tuple): Projectile colour
+        """
+        self.capacity = capacity
+        self.radius = radius
+        # Rows: x, y, vx, vy
+        self.state = np.zeros((4, capacity))
+        self.count = 0
+        self.dropped = 0
+
+        self.image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self.image, colour, (radius, radius), radius)
+        pygame.draw.circle(self.image, (255, 255, 255), (radius, radius), radius // 2)
+
+    def spawn(self, x, y, angles, speed):
+        """
+        Add projectiles leaving a point.
+
+        Args:
+            x (float): Start x-coordinate
+            y (float): Start y-coordinate
+            angles (np.ndarray): Direction of each projectile in radians
+            speed (float): Pixels per tick
+        """
+        room = self.capacity - self.count
+        if len(angles) > room:
+            self.dropped += len(angles) - room
+            angles = angles[:room]
+        start, end = self.count, self.count + len(angles)
+        self.state[0, start:end] = x
+        self.state[1, start:end] = y
+        self.state[2, start:end] = np.cos(angles) * speed
+        self.state[3, start:end] = np.sin(angles) * speed
+        self.count = end
+
+    def update(self, bounds):
+        """
+        Move every projectile and drop those outside the bounds.
+
+        Args:
+            bounds (pygame.Rect): Cull rectangle in world coordinates
+        """
+        live = self.state[:, :self.count]
+        live[:2] += live[2:]
+        x, y = live[0], live[1]
+        keep = (x >= bounds.left) & (x <= bounds.right) & (y >= bounds.top) & (y <= bounds.bottom)
+        self.compact(keep)
+
+    def compact(self, keep):
+        """Pack the projectiles selected by a mask into the first slots."""
+        kept = int(keep.sum())
+        if kept != self.count:
+            self.state[:, :kept] = self.state[:, :self.count][:, keep]
+            self.count = kept
+
+    def collide(self, x, y, radius):
+        """
+        Remove every projectile touching a circular hitbox.
+
+        Args:
+            x (float): Hitbox centre x-coordinate
+            y (float): Hitbox centre y-coordinate
+            radius (float): Hitbox radius
+
+        Returns:
+            int: Number of projectiles that hit
+        """
+        if self.count == 0:
+            return 0
+        dx = self.state[0, :self.count] - x
+        dy = self.state[1, :self.count] - y
+        reach = radius + self.radius
+        hit = dx * dx + dy * dy < reach * reach
+        hits = int(hit.sum())
+        if hits:
+            self.compact(~hit)
+        return hits
+
+    def pack(self):
+        """Return the live projectiles as float64 bytes, (x, y, vx, vy) each."""
+        return self.state[:, :self.count].T.tobytes()
+
+    def unpack(self, values):
+        """
+        Replace every projectile from values laid out like pack() output.
+
+        Args:
+            values: Sequence of 4 floats per projectile
+        """
+        rows = np.asarray(values, float).reshape(-1, 4)[:self.capacity]
+        self.count = len(rows)
+        self.state[:, :self.count] = rows.T
+
+    def clear(self):
+        """Remove every projectile."""
+        self.count = 0
+
+    def draw(self, target, view):
+        """
+        Draw the projectiles inside a view with one blits call.
+
+        Args:
+            target: A pygame.Surface or LowResTarget the size of the view
+            view (pygame.Rect): Visible part of the world
+        """
+        if self.count == 0:
+            return
+        x = self.state[0, :self.count]
+        y = self.state[1, :self.count]
+        r = self.radius
+        visible = (x > view.left - r) & (x < view.right + r) & \
+                  (y > view.top - r) & (y < view.bottom + r)
+        xs = (x[visible] - (view.x + r)).astype(np.int32).tolist()
+        ys = (y[visible] - (view.y + r)).astype(np.int32).tolist()
+        image = self.image
+        target.blits([(image, pos) for pos in zip(xs, ys)], doreturn=False)
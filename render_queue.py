@@ -0,0 +1,85 @@
+# render_queue.py
+# Per-layer sprite batching for Game.draw
+
+import pygame
+
+# Layers in back-to-front draw order
+LAYERS = ("coins", "player", "enemies", "weapons")
+
+class RenderQueue:
+    """
+    Collects (image, position) pairs per layer during a frame and submits
+    each layer with a single Surface.blits call. Positions are given in
+    world coordinates; sprites entirely outside the view are culled before
+    they are queued and the rest are shifted to screen coordinates on flush.
+
+    Bars (enemy health, weapon durability) are gathered separately and
+    filled in one pass after all sprite layers.
+    """
+
+    def __init__(self, width, height):
+        """
+        Args:
+            width (int): Screen width used for culling
+            height (int): Screen height used for culling
+        """
+        self.view = pygame.Rect(0, 0, width, height)  # Visible part of the world
+        self.layers = {layer: [] for layer in LAYERS}
+        self.bars = []  # (x, y, width, height, background, foreground, fraction)
+        self.culled = 0  # Sprites skipped so far this frame
+        self.last_culled = 0  # Sprites skipped in the last flushed frame
+
+    def add(self, layer, image, rect):
+        """
+        Queue a sprite for drawing.
+
+        Args:
+            layer (str): One of LAYERS
+            image (pygame.Surface): Image to draw
+            rect (pygame.Rect): World rectangle the image occupies
+        """
+        if self.view.colliderect(rect):
+            self.layers[layer].append((image, (rect.x - self.view.x, rect.y - self.view.y)))
+        else:
+            self.culled += 1
+
+    def set_view(self, view):
+        """Cull and position the next frame's sprites against a camera view."""
+        self.view.update(view)
+
+    def add_bar(self, x, y, width, height, background, foreground, fraction):
+        """
+        Queue a two-colour progress bar.
+
+        Args:
+            x (int): Left edge
+            y (int): Top edge
+            width (int): Full bar width
+            height (int): Bar height
+            background (tuple): Colour of the empty part
+            foreground (tuple): Colour of the filled part
+            fraction (float): Filled fraction (0-1)
+        """
+        if self.view.colliderect((x, y, width, height)):
+            self.bars.append((x - self.view.x, y - self.view.y, width, height,
+                              background, foreground, fraction))
+
+    def flush(self, target):
+        """
+        Draw every queued layer and bar onto the target, then empty the queue.
+
+        Args:
+            target: A pygame.Surface or LowResTarget
+        """
+        for layer in LAYERS:
+            sprites = self.layers[layer]
+            if sprites:
+                target.blits(sprites, doreturn=False)
+                sprites.clear()
+
+        for x, y, width, height, background, foreground, fraction in self.bars:
+            target.fill(background, (x, y, width, height))
+            target.fill(foreground, (x, y, width * fraction, height))
+        self.bars.clear()
+        self.last_culled = self.culled
+        self.culled = 0
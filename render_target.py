@@ -0,0 +1,72 @@
+# render_target.py
+# Low-resolution world render target used by the performance mode
+
+import weakref
+import pygame
+
+class LowResTarget:
+    """
+    Drawing surface that accepts full-resolution screen coordinates but
+    renders onto a surface RENDER_SCALE times smaller, which is then
+    upscaled onto the screen once per frame.
+
+    Sprites are already pixel art upscaled by an integer factor, so shrinking
+    them back to native resolution loses no detail. Shrunk copies are cached
+    per source surface and dropped when the source surface is freed.
+    """
+
+    def __init__(self, width, height, scale):
+        """
+        Args:
+            width (int): Full screen width
+            height (int): Full screen height
+            scale (int): Integer downscale factor
+        """
+        self.scale = scale
+        self.surface = pygame.Surface((width // scale, height // scale))
+        self.downscaled = weakref.WeakKeyDictionary()
+
+    def shrink(self, image):
+        """Return the native-resolution copy of a full-resolution image."""
+        small = self.downscaled.get(image)
+        if small is None:
+            w = max(1, image.get_width() // self.scale)
+            h = max(1, image.get_height() // self.scale)
+            small = pygame.transform.scale(image, (w, h))
+            self.downscaled[image] = small
+        return small
+
+    def blit(self, image, dest):
+        """
+        Draw an image at a full-resolution position.
+
+        Args:
+            image (pygame.Surface): Full-resolution image
+            dest (tuple | pygame.Rect): Top-left corner in screen coordinates
+        """
+        return self.surface.blit(self.shrink(image),
+                                 (int(dest[0]) // self.scale, int(dest[1]) // self.scale))
+
+    def blits(self, sequence, doreturn=True):
+        """Draw a batch of (image, dest) pairs given in screen coordinates."""
+        scale = self.scale
+        return self.surface.blits(
+            [(self.shrink(image), (int(dest[0]) // scale, int(dest[1]) // scale))
+             for image, dest in sequence],
+            doreturn=doreturn,
+        )
+
+    def fill(self, color, rect=None):
+        """Fill a full-resolution rectangle (or the whole surface)."""
+        if rect is None:
+            return self.surface.fill(color)
+        rect = pygame.Rect(rect)
+        scale = self.scale
+        # Thin rects stay visible, but empty ones (a 0-health bar) stay empty
+        width = rect.width // scale or (1 if rect.width > 0 else 0)
+        height = rect.height // scale or (1 if rect.height > 0 else 0)
+        return self.surface.fill(color, (rect.x // scale, rect.y // scale, width, height))
+
+    def present(self, screen):
+        """Upscale the finished world layer onto the screen."""
+        pygame.transform.scale(self.surface, screen.get_size(), screen)
@@ -0,0 +1,162 @@
+# replay.py
+# Recorded input sessions and headless replay of them to video
+
+import argparse
+import os
+import struct
+import time
+from array import array
+
+import app
+
+MAGIC = b"SGIN"
+VERSION = 2
+
+# magic, version, world seed, start snapshot length, ticks recorded, action count
+HEADER = struct.Struct("<4sHIIII")
+# tick the action happened before, action kind, two arguments
+ACTION = struct.Struct("<IBff")
+
+# Gameplay actions (everything besides per-tick movement)
+SHOOT_NEAREST = 0
+SHOOT_AT = 1      # arguments: world x, y
+UPGRADE = 2       # argument: menu option index
+RESTART = 3
+
+class InputSession:
+    """
+    A starting snapshot (which includes the RNG state) followed by the
+    local player's movement for every simulation tick and the actions
+    taken between ticks. Replaying it from the snapshot reproduces the run.
+    The floor's seed is kept too, so replays draw the same background.
+
+    Quick-loads (F9) are not recorded.
+    """
+
+    def __init__(self, start, world_seed):
+        """
+        Args:
+            start (bytes): Game snapshot the session starts from
+            world_seed (int): Seed of the recorded game's floor
+        """
+        self.start = start
+        self.world_seed = world_seed
+        self.moves = array("b")  # dir x, dir y per tick
+        self.actions = []        # (tick, kind, a, b)
+
+    @property
+    def ticks(self):
+        return len(self.moves) // 2
+
+    def move(self, dir_x, dir_y):
+        """Record the movement input of one simulation tick."""
+        self.moves.append(dir_x)
+        self.moves.append(dir_y)
+
+    def action(self, kind, a=0.0, b=0.0):
+        """Record an action taken before the next simulation tick."""
+        self.actions.append((self.ticks, kind, a, b))
+
+    def to_bytes(self):
+        parts = [HEADER.pack(MAGIC, VERSION, self.world_seed, len(self.start), self.ticks,
+                             len(self.actions)),
+                 self.start, self.moves.tobytes()]
+        parts.extend(ACTION.pack(*action) for action in self.actions)
+        return b"".join(parts)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a session written by save().
+
+        Raises:
+            ValueError: If the file is not a session of this version
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, world_seed, start_length, ticks, action_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} input session")
+        offset = HEADER.size
+        session = cls(data[offset:offset + start_length], world_seed)
+        offset += start_length
+        session.moves.frombytes(data[offset:offset + ticks * 2])
+        offset += ticks * 2
+        session.actions = [ACTION.unpack_from(data, offset + i * ACTION.size)
+                           for i in range(action_count)]
+        return session
+
+def replay_to_video(session_path, video_path, realtime=True, ring_frames=None, workers=None):
+    """
+    Replay an input session without a window, recording one frame per tick.
+
+    Args:
+        session_path (str): Session saved by the game's recorder
+        video_path (str): ".y4m" file or PNG sequence folder
+        realtime (bool): Run ticks at TICK_RATE so wall-clock timers match
+            the recorded run
+        ring_frames (int): Frame buffers (default app.CAPTURE_RING_FRAMES)
+        workers (int): Encoder threads (default app.CAPTURE_WORKERS)
+
+    Returns:
+        dict: Recorder statistics
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from game import Game
+    from video import VideoRecorder
+
+    session = InputSession.load(session_path)
+    # Same floor as the recording; replayed runs stay off the leaderboard
+    app.WORLD_SEED = session.world_seed
+    app.RUN_HISTORY_PATH = ":memory:"
+    game = Game()
+    game.restore_snapshot(session.start)
+    recorder = VideoRecorder(video_path, game.screen, app.TICK_RATE,
+                             ring_frames or app.CAPTURE_RING_FRAMES,
+                             workers or app.CAPTURE_WORKERS)
+
+    actions = session.actions
+    next_action = 0
+    tick_seconds = 1.0 / app.TICK_RATE
+    started = time.perf_counter()
+    for tick in range(session.ticks + 1):
+        while next_action < len(actions) and actions[next_action][0] <= tick:
+            game.perform(*actions[next_action][1:])
+            next_action += 1
+        if tick == session.ticks:
+            break
+
+        # The lead player follows the recorded movement
+        game.player.remote = True
+        game.player.remote_move = (session.moves[tick * 2], session.moves[tick * 2 + 1])
+        game.store_previous_positions()
+        game.update()
+        game.record_history()
+        game.draw()
+        recorder.capture(game.screen, block=True)
+
+        if realtime:
+            delay = started + (tick + 1) * tick_seconds - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    recorder.close()
+    game.close()
+    return recorder.stats()
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded input session to video.")
+    parser.add_argument("session", help="input session file (.inputs)")
+    parser.add_argument("output", help=".y4m file or folder for a PNG sequence")
+    parser.add_argument("--fast", action="store_true",
+                        help="don't pace ticks at the tick rate")
+    args = parser.parse_args()
+    stats = replay_to_video(args.session, args.output, realtime=not args.fast)
+    print(f"{stats['written']} frames written to {args.output}")
+
+if __name__ == "__main__":
+    main()
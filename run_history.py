@@ -0,0 +1,148 @@
+# run_history.py
+# Local SQLite store of finished runs, written from a background thread
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    level INTEGER NOT NULL,
+    xp REAL NOT NULL,
+    seconds_survived REAL NOT NULL,
+    kills INTEGER NOT NULL,
+    bosses_defeated INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_leaderboard ON runs (level DESC, xp DESC);
+CREATE TABLE IF NOT EXISTS run_upgrades (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    pick_order INTEGER NOT NULL,
+    upgrade TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    PRIMARY KEY (run_id, pick_order)
+);
+CREATE INDEX IF NOT EXISTS idx_run_upgrades_upgrade ON run_upgrades (upgrade, run_id);
+"""
+
+# Most queued operations written in one transaction
+BATCH_SIZE = 64
+
+class RunHistory:
+    """
+    Run history and leaderboard store.
+
+    The game thread only ever puts work on a queue. A single writer thread
+    owns the SQLite connection, drains the queue in batches and commits each
+    batch in one transaction. Queries are answered on the same thread
+    (after any pending writes) and handed back through Futures.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): SQLite database file (":memory:" for a throwaway store)
+        """
+        self.path = path
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self._writer, name="run-history", daemon=True)
+        self.thread.start()
+
+    def record_run(self, level, xp, seconds_survived, kills, bosses_defeated, upgrades):
+        """
+        Queue a finished run for writing. Never blocks on disk.
+
+        Args:
+            level (int): Level reached
+            xp (float): Total XP collected
+            seconds_survived (float): Simulated time survived
+            kills (int): Enemies killed
+            bosses_defeated (int): Bosses killed
+            upgrades (list): (upgrade name, level picked) in pick order
+        """
+        run = (time.time(), level, xp, seconds_survived, kills, bosses_defeated)
+        self.pending.put(("run", run, list(upgrades)))
+
+    def request_leaderboard(self, limit=5):
+        """
+        Ask for the best runs by level then XP.
+
+        Returns:
+            Future: Resolves to a list of (level, xp, seconds_survived) rows
+        """
+        future = Future()
+        self.pending.put(("query", self._leaderboard, (limit,), future))
+        return future
+
+    def request_upgrade_win_rates(self):
+        """
+        Ask how often runs that took each upgrade defeated at least one boss.
+
+        Returns:
+            Future: Resolves to a list of (upgrade, runs, win rate) rows
+        """
+        future = Future()
+        self.pending.put(("query", self._upgrade_win_rates, (), future))
+        return future
+
+    def close(self):
+        """Flush every queued write and stop the writer thread."""
+        self.pending.put(None)
+        self.thread.join()
+
+    def _writer(self):
+        """Writer thread: drain the queue in batches until close() is called."""
+        conn = sqlite3.connect(self.path)
+        conn.executescript(SCHEMA)
+        running = True
+        while running:
+            batch = [self.pending.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Writes first, in one transaction, so queries see them
+            with conn:
+                for item in batch:
+                    if item is not None and item[0] == "run":
+                        self._insert_run(conn, item[1], item[2])
+
+            for item in batch:
+                if item is None:
+                    running = False
+                elif item[0] == "query":
+                    _, query, args, future = item
+                    try:
+                        future.set_result(query(conn, *args))
+                    except sqlite3.Error as exc:
+                        future.set_exception(exc)
+        conn.close()
+
+    @staticmethod
+    def _insert_run(conn, run, upgrades):
+        cursor = conn.execute(
+            "INSERT INTO runs (ended_at, level, xp, seconds_survived, kills, bosses_defeated) "
+            "VALUES (?, ?, ?, ?, ?, ?)", run)
+        run_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO run_upgrades (run_id, pick_order, upgrade, level) VALUES (?, ?, ?, ?)",
+            [(run_id, i, name, level) for i, (name, level) in enumerate(upgrades)])
+
+    @staticmethod
+    def _leaderboard(conn, limit):
+        return conn.execute(
+            "SELECT level, xp, seconds_survived FROM runs "
+            "ORDER BY level DESC, xp DESC LIMIT ?", (limit,)).fetchall()
+
+    @staticmethod
+    def _upgrade_win_rates(conn):
+        return conn.execute(
+            "SELECT upgrade, COUNT(*), AVG(bosses_defeated > 0) FROM ("
+            "    SELECT DISTINCT u.upgrade, r.id, r.bosses_defeated "
+            "    FROM run_upgrades u JOIN runs r ON r.id = u.run_id"
+            ") GROUP BY upgrade ORDER BY upgrade").fetchall()
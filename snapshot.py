@@ -0,0 +1,322 @@
+# snapshot.py
+# Compact binary snapshots of the full simulation state
+
+import random
+import struct
+import numpy as np
+import pygame
+import app
+from array import array
+from itertools import chain
+from operator import attrgetter
+
+from enemy import Enemy
+from boss import Boss
+from projectiles import AttackScript
+from bullet import Bullet
+from fireball import Fireball
+from coin import Coin
+from weapon import Weapon
+
+MAGIC = b"SGSN"
+VERSION = 7
+
+# magic, version, player count, enemy count, coin count, weapon count,
+# boss projectile count, boss present, upgrade names length
+HEADER = struct.Struct("<4sHBIIIIBI")
+
+# Mersenne Twister state: 624 words plus the position index
+RNG_WORDS = 625
+
+GAME_FIELDS = ("enemy_spawn_timer", "enemy_spawn_interval", "enemies_per_spawn",
+               "pierce_level", "pierce_count", "xp_value", "game_over",
+               "in_level_up_menu", "xp_scale_factor", "run_ticks", "kills",
+               "bosses_defeated", "wave_seed", "wave_index", "wave_pending")
+PLAYER_FIELDS = ("x", "y", "speed", "frame_index", "animation_timer", "facing_left",
+                 "xp", "health", "max_health", "invincible_ticks", "bullet_speed",
+                 "bullet_size", "bullet_count", "shoot_cooldown", "shoot_timer",
+                 "base_damage", "level", "weapon_timer", "remote")
+# Animation state, weapon cooldown, remote move x and y, equipped weapon
+# present, bullet count
+PLAYER_EXTRA = 6
+ENEMY_FIELDS = ("x", "y", "speed", "frame_index", "animation_timer", "facing_left",
+                "knockback_dist_remaining", "knockback_dx", "knockback_dy",
+                "health", "max_health")
+WEAPON_FIELDS = ("x", "y", "frame_index", "durability", "facing_left")
+COIN_FIELDS = ("x", "y")
+ATTACK_FIELDS = ("level", "step_index", "step_timer", "angle")
+# Boss projectile position and velocity
+PROJECTILE_STRIDE = 4
+# kind (0 bullet, 1 fireball), position, velocity, size, damage, animation
+BULLET_STRIDE = 10
+
+BOOL_FIELDS = {"game_over", "in_level_up_menu", "facing_left", "remote"}
+PLAYER_STATES = ("idle", "run")
+
+get_game = attrgetter(*GAME_FIELDS)
+get_player = attrgetter(*PLAYER_FIELDS)
+get_enemy = attrgetter(*ENEMY_FIELDS)
+get_weapon = attrgetter(*WEAPON_FIELDS)
+get_coin = attrgetter(*COIN_FIELDS)
+get_attack = attrgetter(*ATTACK_FIELDS)
+get_enemy_type = attrgetter("enemy_type")
+# One getter per field for packing entities a column at a time
+enemy_columns = [attrgetter(name) for name in ENEMY_FIELDS]
+coin_columns = [attrgetter(name) for name in COIN_FIELDS]
+
+def _number(value):
+    """Return integral values as int so counters and health stay ints."""
+    return int(value) if value.is_integer() else value
+
+def _assign(obj, fields, values):
+    """Set each named attribute on obj from a sequence of stored doubles."""
+    for name, value in zip(fields, values):
+        setattr(obj, name, bool(value) if name in BOOL_FIELDS else _number(value))
+
+def _pack_columns(entities, getters):
+    """
+    Pack one float64 column per field, field after field.
+
+    Returns:
+        bytes: len(getters) * len(entities) doubles
+    """
+    count = len(entities)
+    columns = np.empty((len(getters), count))
+    for column, getter in zip(columns, getters):
+        column[:] = np.fromiter(map(getter, entities), np.float64, count)
+    return columns.tobytes()
+
+def _unpack_columns(values, fields, count):
+    """
+    Turn packed columns back into one Python list per field: bools for
+    flags, ints for columns that are all whole numbers, floats otherwise.
+    """
+    columns = np.frombuffer(values, np.float64).reshape(len(fields), count)
+    unpacked = []
+    for name, column in zip(fields, columns):
+        if name in BOOL_FIELDS:
+            unpacked.append(column.astype(bool).tolist())
+        elif np.array_equal(column, np.trunc(column)):
+            unpacked.append(column.astype(np.int64).tolist())
+        else:
+            unpacked.append(column.tolist())
+    return unpacked
+
+def _bullet_values(bullet):
+    if isinstance(bullet, Fireball):
+        return (1, bullet.x, bullet.y, bullet.vx, bullet.vy, bullet.size, bullet.damage,
+                bullet.frame_index, bullet.animation_timer, bullet.angle)
+    return (0, bullet.x, bullet.y, bullet.vx, bullet.vy, bullet.size, bullet.damage, 0, 0, 0)
+
+def save_snapshot(game):
+    """
+    Serialize the complete simulation state of a game.
+
+    Args:
+        game (Game): The game to capture
+
+    Returns:
+        bytes: The packed snapshot
+    """
+    type_ids = app.ENEMY_TYPE_IDS
+    boss = game.boss
+
+    upgrade_names = ",".join(up["name"] for up in game.upgrade_options) + "|" + \
+        ",".join(up["name"] for up in game.possible_upgrades)
+    upgrade_bytes = upgrade_names.encode("ascii")
+
+    floats = array("d", get_game(game))
+    floats.extend(game.camera.rect.topleft)
+    for player in game.players:
+        equipped = player.equipped_weapon or None
+        floats.extend(get_player(player))
+        floats.append(PLAYER_STATES.index(player.state))
+        floats.append(getattr(player, "weapon_cooldown", 0))
+        floats.extend(player.remote_move)
+        floats.append(equipped is not None)
+        floats.append(len(player.bullets))
+        if equipped:
+            floats.extend(get_weapon(equipped))
+    if boss is not None:
+        floats.extend(get_enemy(boss))
+        floats.append(boss.frame_set.scale)
+        floats.extend(get_attack(boss.attacks))
+    # Enemies and coins are packed column by column; the few bullets and
+    # weapons are flattened row by row
+    floats.frombytes(_pack_columns(game.enemies, enemy_columns))
+    for player in game.players:
+        floats.fromlist(list(chain.from_iterable(map(_bullet_values, player.bullets))))
+    floats.frombytes(_pack_columns(game.coins, coin_columns))
+    floats.fromlist(list(chain.from_iterable(map(get_weapon, game.weapons))))
+    floats.frombytes(game.enemy_projectiles.pack())
+
+    enemy_types = array("B", map(type_ids.__getitem__, map(get_enemy_type, game.enemies)))
+    if boss is not None:
+        enemy_types.append(type_ids[boss.enemy_type])
+
+    version, words, gauss_next = random.getstate()
+    rng = array("I", words)
+    gauss = struct.pack("<Bd", gauss_next is not None, gauss_next or 0.0)
+
+    header = HEADER.pack(MAGIC, VERSION, len(game.players), len(game.enemies),
+                         len(game.coins), len(game.weapons),
+                         game.enemy_projectiles.count, boss is not None,
+                         len(upgrade_bytes))
+    # The float block goes last, so its length needs no bookkeeping
+    return b"".join((header, rng.tobytes(), gauss, enemy_types.tobytes(),
+                     upgrade_bytes, floats.tobytes()))
+
+def _build_enemies(cls, columns, type_ids, frames_by_type):
+    """
+    Create enemies (or a boss) from unpacked columns without running
+    __init__, setting the state derived from their type and frames.
+
+    Args:
+        cls (type): Enemy or Boss
+        columns (list): One list per ENEMY_FIELDS field, from _unpack_columns
+        type_ids (list): Enemy type id of each enemy
+        frames_by_type: Animation frames indexed by type id
+    """
+    type_names = app.ENEMY_TYPES
+    new = cls.__new__
+    enemies = []
+    for type_id, row in zip(type_ids, zip(*columns)):
+        enemy = new(cls)
+        state = vars(enemy)
+        state.update(zip(ENEMY_FIELDS, row))
+        frames = frames_by_type[type_id]
+        state["enemy_type"] = type_names[type_id]
+        state["type_id"] = type_id
+        state["frames"] = frames
+        state["animation_speed"] = 8
+        image = state["image"] = frames[enemy.frame_index]
+        state["rect"] = image.get_rect(center=(enemy.x, enemy.y))
+        enemies.append(enemy)
+    return enemies
+
+def _build_weapon(game, values):
+    weapon = Weapon(0, 0, game.assets)
+    _assign(weapon, WEAPON_FIELDS, values)
+    weapon.image = weapon.animation[weapon.frame_index]
+    weapon.rect = weapon.image.get_rect(center=(weapon.x, weapon.y))
+    return weapon
+
+def restore_snapshot(game, blob):
+    """
+    Replace a game's simulation state with a snapshot made by save_snapshot.
+
+    Args:
+        game (Game): The game to restore into
+        blob (bytes): Snapshot data
+
+    Raises:
+        ValueError: If the blob is not a snapshot of a supported version
+    """
+    (magic, version, player_count, enemy_count, coin_count, weapon_count,
+     projectile_count, has_boss, names_len) = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a supported game snapshot")
+    offset = HEADER.size
+
+    rng = array("I")
+    rng.frombytes(blob[offset:offset + RNG_WORDS * 4])
+    offset += RNG_WORDS * 4
+    has_gauss, gauss_next = struct.unpack_from("<Bd", blob, offset)
+    offset += struct.calcsize("<Bd")
+    random.setstate((3, tuple(rng), gauss_next if has_gauss else None))
+
+    enemy_types = blob[offset:offset + enemy_count + has_boss]
+    offset += enemy_count + has_boss
+    options, remaining = blob[offset:offset + names_len].decode("ascii").split("|")
+    offset += names_len
+    floats = array("d")
+    floats.frombytes(blob[offset:])
+
+    enemy_assets = game.assets["enemies"]
+    pos = 0
+
+    def take(count):
+        nonlocal pos
+        values = floats[pos:pos + count]
+        pos += count
+        return values
+
+    _assign(game, GAME_FIELDS, take(len(GAME_FIELDS)))
+    camera_x, camera_y = take(2)
+    game.camera.rect.topleft = (int(camera_x), int(camera_y))
+    catalog = game.upgrade_catalog
+    game.upgrade_options = [catalog[name] for name in options.split(",") if name]
+    game.possible_upgrades = [catalog[name] for name in remaining.split(",") if name]
+
+    # Players (co-op players beyond the first are added or dropped to match)
+    while len(game.players) < player_count:
+        game.add_player()
+    del game.players[player_count:]
+    bullet_counts = []
+    for player in game.players:
+        _assign(player, PLAYER_FIELDS, take(len(PLAYER_FIELDS)))
+        state, weapon_cooldown, move_x, move_y, has_equipped, bullet_count = take(PLAYER_EXTRA)
+        player.state = PLAYER_STATES[int(state)]
+        player.weapon_cooldown = _number(weapon_cooldown)
+        player.remote_move = (int(move_x), int(move_y))
+        player.image = player.animations[player.state][player.frame_index]
+        player.rect = player.image.get_rect(center=(player.x, player.y))
+        player.equipped_weapon = False
+        if has_equipped:
+            player.equipped_weapon = _build_weapon(game, take(len(WEAPON_FIELDS)))
+            player.equipped_weapon.equipped = True
+        bullet_counts.append(int(bullet_count))
+
+    # Boss
+    game.boss = None
+    if has_boss:
+        columns = _unpack_columns(take(len(ENEMY_FIELDS)), ENEMY_FIELDS, 1)
+        (scale,) = take(1)
+        type_id = enemy_types[enemy_count]
+        frame_set = game.boss_assets.get(app.ENEMY_TYPES[type_id], enemy_assets,
+                                         _number(scale))
+        (boss,) = _build_enemies(Boss, columns, [type_id], {type_id: frame_set.frames})
+        boss.frame_set = frame_set
+        boss.mask = (frame_set.flipped_masks if boss.facing_left
+                     else frame_set.masks)[boss.frame_index]
+        attack_values = take(len(ATTACK_FIELDS))
+        boss.attacks = AttackScript(int(attack_values[0]))
+        _assign(boss.attacks, ATTACK_FIELDS, attack_values)
+        game.boss = boss
+
+    # Enemies
+    columns = _unpack_columns(take(enemy_count * len(ENEMY_FIELDS)), ENEMY_FIELDS,
+                              enemy_count)
+    frames_by_type = [enemy_assets[name] for name in app.ENEMY_TYPES]
+    game.enemies.clear()
+    game.enemies.create_many(_build_enemies(Enemy, columns, enemy_types[:enemy_count],
+                                            frames_by_type))
+
+    # Bullets
+    for player, bullet_count in zip(game.players, bullet_counts):
+        player.bullets.clear()
+        for _ in range(bullet_count):
+            (kind, x, y, vx, vy, size, damage,
+             frame_index, animation_timer, angle) = take(BULLET_STRIDE)
+            size = _number(size)
+            if kind:
+                bullet = Fireball(player, x, y, vx, vy, size, game.assets)
+                bullet.frame_index = int(frame_index)
+                bullet.animation_timer = int(animation_timer)
+                bullet.angle = angle
+                bullet.image = pygame.transform.rotate(bullet.animation[bullet.frame_index],
+                                                       angle)
+                bullet.rect = bullet.image.get_rect(center=(x, y))
+            else:
+                bullet = Bullet(player, x, y, vx, vy, size)
+            bullet.damage = _number(damage)
+            player.bullets.create(bullet)
+
+    # Pickups
+    xs, ys = _unpack_columns(take(coin_count * len(COIN_FIELDS)), COIN_FIELDS, coin_count)
+    game.coins.clear()
+    game.coins.create_many([Coin(x, y) for x, y in zip(xs, ys)])
+    game.weapons.clear()
+    for _ in range(weapon_count):
+        game.weapons.create(_build_weapon(game, take(len(WEAPON_FIELDS))))
+    game.enemy_projectiles.unpack(take(projectile_count * PROJECTILE_STRIDE))
@@ -0,0 +1,144 @@
+# soak.py
+# Headless long-run soak test: fails if memory or object counts keep growing
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import app
+import replay
+from memory import MemoryMonitor, format_report
+
+# Metrics checked for growth, with the absolute slack allowed on top of
+# the relative tolerance (rss and traced memory in bytes)
+GROWTH_SLACK = {
+    "rss": 16 * 1024 * 1024,
+    "traced": 4 * 1024 * 1024,
+    "python objects": 5000,
+    "threads": 4,
+}
+
+class SoakBot:
+    """Plays a game with simple random inputs and restarts when it dies."""
+
+    def __init__(self, game, seed=0):
+        self.game = game
+        self.rng = random.Random(seed)  # Separate from the gameplay RNG
+        self.move = (0, 0)
+
+    def step(self, tick):
+        game = self.game
+        if game.game_over:
+            game.perform(replay.RESTART)
+        if game.in_level_up_menu:
+            game.perform(replay.UPGRADE, self.rng.randrange(len(game.upgrade_options)))
+            return
+        if tick % 60 == 0:
+            self.move = (self.rng.randint(-1, 1), self.rng.randint(-1, 1))
+        if tick % 8 == 0:
+            game.perform(replay.SHOOT_NEAREST)
+        game.player.remote = True
+        game.player.remote_move = self.move
+        game.store_previous_positions()
+        game.update()
+        game.record_history()
+
+def find_growth(samples, tolerance):
+    """
+    Compare the peak of each metric in the second half of the samples with
+    its peak in the first half. Per-run state is bounded by restarts, so
+    a peak that keeps rising points to a leak.
+
+    Returns:
+        list: (metric, first half peak, second half peak) for metrics that grew
+    """
+    half = len(samples) // 2
+    grown = []
+    for metric, slack in GROWTH_SLACK.items():
+        first = [s[metric] for s in samples[:half] if s.get(metric) is not None]
+        second = [s[metric] for s in samples[half:] if s.get(metric) is not None]
+        if first and second and max(second) > max(first) * (1 + tolerance) + slack:
+            grown.append((metric, max(first), max(second)))
+    return grown
+
+def soak(hours=2.0, sample_minutes=1.0, draw_every=4, warmup=0.1, tolerance=0.1,
+         trace=False, seed=0, verbose=True):
+    """
+    Run simulated play without a window and check memory stays bounded.
+
+    Args:
+        hours (float): Simulated play time
+        sample_minutes (float): Simulated minutes between samples
+        draw_every (int): Draw one frame every this many ticks
+        warmup (float): Fraction of samples ignored while caches fill up
+        tolerance (float): Relative growth allowed between the halves
+        trace (bool): Also track Python allocations with tracemalloc
+        seed (int): Gameplay and bot seed
+        verbose (bool): Print progress and a memory report per level
+
+    Returns:
+        list: Metrics that grew (empty if the run passed)
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    app.TELEMETRY_FOLDER = None
+    app.RUN_HISTORY_PATH = ":memory:"  # Keep bot runs off the real leaderboard
+    random.seed(seed)
+    from game import Game
+
+    game = Game()
+    game.reset_game()
+    monitor = MemoryMonitor(game, trace)
+    bot = SoakBot(game, seed)
+
+    total_ticks = int(hours * 3600 * app.TICK_RATE)
+    sample_ticks = max(1, int(sample_minutes * 60 * app.TICK_RATE))
+    samples = []
+    levels_reported = set()
+    started = time.perf_counter()
+    for tick in range(total_ticks):
+        bot.step(tick)
+        if tick % draw_every == 0:
+            game.draw()
+
+        level = game.player.level
+        if verbose and trace and level not in levels_reported:
+            levels_reported.add(level)
+            print(format_report(monitor.report(level)))
+
+        if (tick + 1) % sample_ticks == 0:
+            samples.append(monitor.sample())
+            if verbose:
+                minutes = (tick + 1) / app.TICK_RATE / 60
+                sample = samples[-1]
+                rss = sample["rss"] / 1024 / 1024 if sample["rss"] else 0
+                print(f"{minutes:7.1f} min  rss {rss:7.1f} MiB  objects "
+                      f"{sample['python objects']:>8}  threads {sample['threads']:>3}  "
+                      f"enemies {sample['enemies']:>4}  level {level:>3}  "
+                      f"({(tick + 1) / (time.perf_counter() - started):,.0f} ticks/s)")
+
+    game.close()
+    return find_growth(samples[int(len(samples) * warmup):], tolerance)
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless memory soak test.")
+    parser.add_argument("--hours", type=float, default=2.0, help="simulated hours")
+    parser.add_argument("--sample-minutes", type=float, default=1.0)
+    parser.add_argument("--draw-every", type=int, default=4)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--trace", action="store_true",
+                        help="track allocation sites with tracemalloc (slow)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grown = soak(args.hours, args.sample_minutes, args.draw_every,
+                 tolerance=args.tolerance, trace=args.trace, seed=args.seed)
+    for metric, before, after in grown:
+        print(f"FAIL: {metric} grew from {before:,} to {after:,}")
+    if grown:
+        sys.exit(1)
+    print("PASS: memory and object counts stayed bounded")
+
+if __name__ == "__main__":
+    main()
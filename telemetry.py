@@ -0,0 +1,187 @@
+# telemetry.py
+# Append-only gameplay event stream written by a background thread
+
+import json
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+MAGIC = b"SGTL"
+VERSION = 2  # 2 added RUN_START and LOAD events
+
+# magic, version, record size, session start (unix time)
+FILE_HEADER = struct.Struct("<4sHHd")
+# tick, event kind, subtype (enemy type / upgrade id), x, y, value
+RECORD = struct.Struct("<IHhfff")
+RECORD_DTYPE = np.dtype([("tick", "<u4"), ("kind", "<u2"), ("subtype", "<i2"),
+                         ("x", "<f4"), ("y", "<f4"), ("value", "<f4")])
+
+# Event kinds
+SPAWN = 1         # subtype: enemy type id, value: max health
+DEATH = 2         # subtype: enemy type id, value: overkill damage
+DAMAGE = 3        # value: damage taken, x/y: player position
+COIN = 4          # value: xp gained
+WEAPON_EQUIP = 5
+WEAPON_BREAK = 6
+LEVEL_UP = 7      # value: new level
+FRAME = 8         # subtype: ticks run, value: frame time ms, x: update ms, y: draw ms
+UPGRADE = 9       # subtype: upgrade id, value: level picked
+BOSS_SPAWN = 10   # subtype: enemy type id, value: max health
+RUN_START = 11    # value: starting level
+LOAD = 12         # value: level after a quick-load or rewind
+
+EVENT_NAMES = {
+    SPAWN: "spawn", DEATH: "death", DAMAGE: "damage", COIN: "coin",
+    WEAPON_EQUIP: "weapon_equip", WEAPON_BREAK: "weapon_break",
+    LEVEL_UP: "level_up", FRAME: "frame", UPGRADE: "upgrade",
+    BOSS_SPAWN: "boss_spawn", RUN_START: "run_start", LOAD: "load",
+}
+
+class Telemetry:
+    """
+    Fixed-width event recorder.
+
+    record() packs one RECORD into a preallocated ring buffer and returns;
+    if the buffer is full the event is counted as dropped rather than
+    waiting. A flusher thread copies filled regions out in large sequential
+    writes and starts a new file when the current one reaches max_file_bytes.
+
+    A Telemetry created without a folder is disabled and record() is a no-op.
+    """
+
+    def __init__(self, folder=None, capacity=65536, max_file_bytes=64 * 1024 * 1024,
+                 flush_interval=0.5, metadata=None):
+        """
+        Args:
+            folder (str): Directory for session files (None disables recording)
+            capacity (int): Ring buffer size in records
+            max_file_bytes (int): Rotate to a new file past this size
+            flush_interval (float): Seconds between flushes
+            metadata (dict): Saved next to the session files (e.g. the names
+                behind subtype ids)
+        """
+        self.enabled = folder is not None
+        self.tick = 0  # Set by the game each simulation tick
+        self.dropped = 0
+        if not self.enabled:
+            return
+
+        self.folder = folder
+        self.capacity = capacity
+        self.max_file_bytes = max_file_bytes
+        self.flush_interval = flush_interval
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.view = memoryview(self.buffer)
+        self.head = 0  # Records written (only advanced by the game thread)
+        self.tail = 0  # Records flushed (only advanced by the flusher)
+
+        os.makedirs(folder, exist_ok=True)
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.part = 0
+        self.file = None
+        with open(os.path.join(folder, f"session-{self.session}.json"), "w") as f:
+            json.dump(dict(metadata or {}, event_names=EVENT_NAMES), f)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._flusher, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def record(self, kind, subtype=0, x=0.0, y=0.0, value=0.0):
+        """
+        Append one event. Constant time; never blocks.
+
+        Args:
+            kind (int): Event kind constant
+            subtype (int): Enemy type id, upgrade id, ...
+            x (float): Event x-coordinate
+            y (float): Event y-coordinate
+            value (float): Event-specific value
+        """
+        if not self.enabled:
+            return
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return
+        RECORD.pack_into(self.buffer, (head % self.capacity) * RECORD.size,
+                         self.tick, kind, subtype, x, y, value)
+        self.head = head + 1
+
+    def record_many(self, kind, subtypes, xs, ys, values):
+        """
+        Append a batch of events of one kind from arrays with a single copy.
+        Events that don't fit in the buffer are counted as dropped.
+
+        Args:
+            kind (int): Event kind constant
+            subtypes (np.ndarray): Subtype of each event
+            xs (np.ndarray): Event x-coordinates
+            ys (np.ndarray): Event y-coordinates
+            values (np.ndarray): Event-specific values
+        """
+        if not self.enabled:
+            return
+        head = self.head
+        count = min(len(xs), self.capacity - (head - self.tail))
+        self.dropped += len(xs) - count
+        if count <= 0:
+            return
+        records = np.empty(count, RECORD_DTYPE)
+        records["tick"] = self.tick
+        records["kind"] = kind
+        records["subtype"] = subtypes[:count]
+        records["x"] = xs[:count]
+        records["y"] = ys[:count]
+        records["value"] = values[:count]
+        data = records.tobytes()
+
+        # Copy in up to two pieces when the batch wraps around the buffer
+        start = (head % self.capacity) * RECORD.size
+        first = min(len(data), len(self.buffer) - start)
+        self.buffer[start:start + first] = data[:first]
+        self.buffer[:len(data) - first] = data[first:]
+        self.head = head + count
+
+    def close(self):
+        """Flush everything recorded so far and stop the flusher thread."""
+        if not self.enabled:
+            return
+        self.stop_event.set()
+        self.thread.join()
+
+    def _open_next_file(self):
+        if self.file is not None:
+            self.file.close()
+        path = os.path.join(self.folder, f"session-{self.session}-{self.part:03d}.bin")
+        self.part += 1
+        self.file = open(path, "wb")
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, RECORD.size, time.time()))
+
+    def _flush(self):
+        """Write every complete record between tail and head."""
+        head = self.head
+        tail = self.tail
+        if head == tail:
+            return
+        if self.file is None or self.file.tell() >= self.max_file_bytes:
+            self._open_next_file()
+
+        start = tail % self.capacity
+        end = head % self.capacity
+        size = RECORD.size
+        if start < end:
+            self.file.write(self.view[start * size:end * size])
+        else:
+            # The filled region wraps around the end of the buffer
+            self.file.write(self.view[start * size:])
+            self.file.write(self.view[:end * size])
+        self.tail = head
+
+    def _flusher(self):
+        while not self.stop_event.wait(self.flush_interval):
+            self._flush()
+        self._flush()
+        if self.file is not None:
+            self.file.close()
@@ -0,0 +1,11 @@
+# conftest.py
+# Shared pytest setup: headless pygame and the flat game modules on sys.path
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, ROOT)
@@ -0,0 +1,51 @@
+# test_analyze_telemetry.py
+# Telemetry analysis: runs, levels and per-level time across quick-loads
+
+import glob
+import os
+
+import numpy as np
+
+import telemetry
+from analyze_telemetry import kill_rates, load_session
+from telemetry import Telemetry
+
+def write_session(folder, events):
+    recorder = Telemetry(folder, flush_interval=3600)
+    for tick, kind, value in events:
+        recorder.tick = tick
+        recorder.record(kind, value=value)
+    recorder.close()
+    return sorted(glob.glob(os.path.join(folder, "session-*.bin")))
+
+def test_quick_load_keeps_the_run_and_restores_the_level(tmp_path):
+    paths = write_session(str(tmp_path), [
+        (0, telemetry.RUN_START, 1),
+        (120, telemetry.LEVEL_UP, 2),
+        (150, telemetry.DEATH, 0),
+        (60, telemetry.LOAD, 1),       # Quick-load back to tick 60, level 1
+        (90, telemetry.DEATH, 0),
+        (0, telemetry.RUN_START, 1),   # Restart
+        (30, telemetry.DEATH, 0),
+    ])
+    events, levels, level_spans = load_session(paths)
+
+    np.testing.assert_array_equal(levels[telemetry.DEATH], [2, 1, 1])
+    assert sorted(level_spans) == [(1, 1), (1, 2), (2, 1)]
+    assert level_spans[(1, 1)] == [0, 90]
+    assert level_spans[(1, 2)] == [120, 150]
+
+    rows = kill_rates(events, levels, level_spans)
+    assert [(level, kills) for level, kills, _, _ in rows] == [(1, 2), (2, 1)]
+
+def test_levels_past_999_stay_separate(tmp_path):
+    paths = write_session(str(tmp_path), [
+        (0, telemetry.RUN_START, 1),
+        (10, telemetry.LEVEL_UP, 1000),
+        (20, telemetry.DEATH, 0),
+        (0, telemetry.RUN_START, 1),
+        (5, telemetry.DEATH, 0),
+    ])
+    _, levels, level_spans = load_session(paths)
+    np.testing.assert_array_equal(levels[telemetry.DEATH], [1000, 1])
+    assert (2, 1) in level_spans and (1, 1000) in level_spans
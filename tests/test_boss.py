@@ -0,0 +1,30 @@
+# test_boss.py
+# Boss frame registry: caching, and clear() racing workers on old frames
+
+import pygame
+
+from boss import BossAssetRegistry
+
+def frames(size):
+    return {"orc": [pygame.Surface((size, size), pygame.SRCALPHA)]}
+
+def test_frame_sets_are_cached_per_type_and_scale():
+    registry = BossAssetRegistry(scales=(2, 3))
+    registry.prepare(frames(4))
+    assert sorted(registry.frame_sets) == [("orc", 2), ("orc", 3)]
+    assert registry.get("orc", frames(4), 3) is registry.frame_sets[("orc", 3)]
+    assert registry.frame_sets[("orc", 3)].frames[0].get_size() == (12, 12)
+
+def test_sets_from_frames_read_before_clear_are_not_cached():
+    registry = BossAssetRegistry(scales=(2,))
+    old_frames = frames(4)
+    generation = registry.generation  # A worker reads the frames...
+    registry.clear()                  # ...then a reload clears the registry
+    stale = registry.get("orc", old_frames, 2, generation)
+    assert stale.frames[0].get_size() == (8, 8)
+    assert registry.frame_sets == {}
+
+    registry.prepare(old_frames, generation)  # Stops at once
+    assert registry.frame_sets == {}
+    fresh = registry.get("orc", frames(5), 2, registry.generation)
+    assert registry.frame_sets == {("orc", 2): fresh}
@@ -0,0 +1,91 @@
+# test_combat.py
+# CombatQueue damage aggregation, overkill skipping and radius-limited knockback
+
+import numpy as np
+import pytest
+
+import app
+from combat import BOSS, CombatQueue
+from conftest import ROOT
+
+def test_damage_totals_sum_per_target_in_first_hit_order():
+    queue = CombatQueue()
+    queue.hit(7, 1.0, 10, 10)
+    queue.hit(BOSS, 2.0, 20, 20)
+    queue.hit(3, 1.5, 30, 30)
+    queue.hit(7, 2.5, 40, 40)
+    queue.hit(3, 1.0, 50, 50)
+
+    targets, totals, first_hits = queue.damage_totals()
+    assert targets.tolist() == [7, BOSS, 3]
+    assert totals.tolist() == [3.5, 2.0, 2.5]
+    # Index of each target's first hit, for effect positions
+    assert first_hits.tolist() == [0, 1, 2]
+    assert [queue.hit_x[i] for i in first_hits] == [10, 20, 30]
+
+def test_knockbacks_only_reach_enemies_within_radius():
+    queue = CombatQueue()
+    queue.impulse(0, 0, 80)
+    xs = np.array([3.0, 0.0, 100.0, 0.0, 500.0])
+    ys = np.array([4.0, -10.0, 0.0, 0.0, 0.0])
+
+    (indices, dxs, dys, distance), = queue.knockbacks(xs, ys, 100)
+    # The enemy at the source has no direction; the one at 500 is out of reach
+    assert indices.tolist() == [0, 1, 2]
+    assert np.allclose(dxs, [0.6, 0.0, 1.0])
+    assert np.allclose(dys, [0.8, -1.0, 0.0])
+    assert distance == 80
+
+def test_clear_empties_every_buffer():
+    queue = CombatQueue()
+    queue.hit(1, 1.0, 0, 0)
+    queue.impulse(0, 0, 10)
+    queue.clear()
+    assert not queue.targets and not queue.damage and not queue.impulse_x
+    assert queue.knockbacks(np.zeros(2), np.ones(2), 50) == []
+
+def test_lethal_needs_queued_damage_at_least_the_health():
+    queue = CombatQueue()
+    assert not queue.lethal(4, 0)  # Not hit yet, even at zero health
+    queue.hit(4, 1.0, 0, 0)
+    assert not queue.lethal(4, 1.5)
+    queue.hit(4, 0.5, 0, 0)
+    assert queue.lethal(4, 1.5)
+    queue.clear()
+    assert not queue.lethal(4, 1.5)
+
+@pytest.fixture
+def game(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(app, "RUN_HISTORY_PATH", ":memory:")
+    monkeypatch.setattr(app, "TELEMETRY_FOLDER", None)
+    from game import Game
+
+    game = Game()
+    yield game
+    game.close()
+
+def test_second_bullet_passes_an_enemy_already_killed_this_tick(game):
+    from bullet import Bullet
+    from enemy import Enemy
+
+    player = game.player
+    game.enemies.clear()
+    x, y = player.x + 200, player.y
+    front = Enemy(x, y, "orc", game.assets["enemies"])
+    behind = Enemy(x, y, "demon", game.assets["enemies"])
+    front.health = 1
+    behind.health = 5
+    game.enemies.create(front)
+    game.enemies.create(behind)
+    for _ in range(2):
+        player.bullets.create(Bullet(player, x, y, 0, 0, 10))
+
+    game.check_player_bullet_collisions(player)
+    game.resolve_combat()
+    game.enemies.flush()
+    player.bullets.flush()
+
+    assert not game.enemies.alive(front.handle)
+    assert behind.health == 5 - player.base_damage
+    assert len(player.bullets) == 0
@@ -0,0 +1,114 @@
+# test_content.py
+# Content validation, compiled lookup tables, drop rolls and the compile cache
+
+import copy
+import json
+import os
+
+import pytest
+
+import app
+import content
+from conftest import ROOT
+
+with open(os.path.join(ROOT, "content.json")) as f:
+    SHIPPED = json.load(f)
+
+def compile_with(change):
+    data = copy.deepcopy(SHIPPED)
+    change(data)
+    return content.compile_content(data, "test")
+
+def test_shipped_content_compiles_to_level_tables():
+    compiled = content.compile_content(copy.deepcopy(SHIPPED), "test")
+    assert len(compiled.enemy_health) == len(compiled.enemy_speed) == 3
+    assert compiled.enemy_health_bonus(3) == 3        # Catch-all band
+    assert compiled.enemy_health_bonus(10) == 13      # 6-19 band
+    assert compiled.enemy_health_bonus(22) == 33      # 21+ band
+    assert compiled.enemy_health_bonus(10 ** 6) == compiled.enemy_health_bonus(999)
+    assert compiled.boss_max_health(10) == 500
+    assert compiled.boss_max_health(11) == 2750
+    assert [up["id"] for up in compiled.upgrades] == list(range(len(SHIPPED["upgrades"])))
+
+def test_roll_drop_uses_cumulative_chances():
+    def partial_table(data):
+        data["drop_tables"]["common"] = [{"item": "weapon", "chance": 0.25},
+                                         {"item": "coin", "chance": 0.5}]
+    compiled = compile_with(partial_table)
+    assert compiled.roll_drop(0, 0.0) == content.DROP_WEAPON
+    assert compiled.roll_drop(0, 0.2499) == content.DROP_WEAPON
+    assert compiled.roll_drop(0, 0.25) == content.DROP_COIN
+    assert compiled.roll_drop(0, 0.7499) == content.DROP_COIN
+    assert compiled.roll_drop(0, 0.75) == content.DROP_NONE
+
+def test_enemy_without_drops_never_drops():
+    def no_drops(data):
+        del data["enemies"]["orc"]["drops"]
+    compiled = compile_with(no_drops)
+    assert compiled.roll_drop(0, 0.0) == content.DROP_NONE
+
+@pytest.mark.parametrize("change, where", [
+    (lambda data: data["drop_tables"]["common"].append({"item": "coin", "chance": 0.5}),
+     "drop_tables.common"),
+    (lambda data: data["drop_tables"]["common"][0].update(item="gem"),
+     "drop_tables.common[0]"),
+    (lambda data: data["enemies"]["orc"].update(drops="rare"), "enemies.orc"),
+    (lambda data: data["enemies"].pop("demon"), "enemies"),
+    (lambda data: data["enemies"]["undead"].update(health="1"), "enemies.undead"),
+    (lambda data: data["boss"]["health"].pop(), "boss.health"),
+    (lambda data: data["upgrades"][1].update(name="SNIPER"), "upgrades[1]"),
+    (lambda data: data["upgrades"][0]["effects"][0].update(op="pow"),
+     "upgrades[0].effects[0]"),
+    (lambda data: data["upgrades"][1]["effects"][0].update(stat="bulet_speed"),
+     "upgrades[1].effects[0]"),
+    (lambda data: data["upgrades"][0]["effects"][0].update(stat="bullet_speed"),
+     "upgrades[0].effects[0]"),  # A player stat on the game
+])
+def test_malformed_content_names_the_bad_entry(change, where):
+    with pytest.raises(ValueError) as error:
+        compile_with(change)
+    assert str(error.value).startswith(where + " ")
+
+def test_upgrade_stats_exist_on_their_targets(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(app, "RUN_HISTORY_PATH", ":memory:")
+    monkeypatch.setattr(app, "TELEMETRY_FOLDER", None)
+    from game import Game
+
+    game = Game()
+    try:
+        targets = {content.TARGET_PLAYER: game.player, content.TARGET_GAME: game}
+        for target, stats in content.TARGET_STATS.items():
+            for stat in stats:
+                assert isinstance(getattr(targets[target], stat), (int, float)), stat
+    finally:
+        game.close()
+
+def test_load_content_reuses_the_cache_until_the_source_changes(tmp_path, monkeypatch):
+    source = tmp_path / "content.json"
+    cache = tmp_path / "content.cache"
+    source.write_text(json.dumps(SHIPPED))
+    compiles = []
+    compile_content = content.compile_content
+
+    def counting_compile(data, source_hash):
+        compiles.append(source_hash)
+        return compile_content(data, source_hash)
+    monkeypatch.setattr(content, "compile_content", counting_compile)
+
+    first = content.load_content(str(source), str(cache))
+    second = content.load_content(str(source), str(cache))
+    assert len(compiles) == 1
+    assert second.upgrades == first.upgrades
+
+    changed = copy.deepcopy(SHIPPED)
+    changed["boss"]["speed"] = 3
+    source.write_text(json.dumps(changed))
+    assert content.load_content(str(source), str(cache)).boss_speed == 3
+    assert len(compiles) == 2
+
+def test_load_content_reports_the_file(tmp_path):
+    source = tmp_path / "content.json"
+    source.write_text("{")
+    with pytest.raises(ValueError, match="content.json"):
+        content.load_content(str(source), "")
@@ -0,0 +1,24 @@
+# test_coop.py
+# Co-op network ids: stable per object, never shared by two live objects
+
+from coop import CoopServer
+
+class Thing:
+    pass
+
+def test_entity_ids_are_stable():
+    server = CoopServer(game=None)
+    thing = Thing()
+    assert server.entity_id(thing) == server.entity_id(thing) == 1
+    assert server.entity_id(Thing()) == 2
+
+def test_wrapped_ids_skip_live_objects():
+    server = CoopServer(game=None)
+    server.live_ids = {65535, 1, 2}
+    server.next_entity_id = 65535
+    assert [server.entity_id(Thing()) for _ in range(3)] == [3, 4, 5]
+
+    # Once the holders are gone (not in the last capture) the ids are reused
+    server.live_ids = set()
+    server.next_entity_id = 65535
+    assert [server.entity_id(Thing()) for _ in range(2)] == [65535, 1]
@@ -0,0 +1,93 @@
+# test_entities.py
+# EntityStore handles, deferred destroy and swap-remove compaction
+
+from entities import SLOT_MASK, EntityStore
+
+class Thing:
+    def __init__(self, name):
+        self.name = name
+
+def names(store):
+    return [thing.name for thing in store]
+
+def test_stale_handle_after_slot_reuse():
+    store = EntityStore()
+    old = Thing("old")
+    old_handle = store.create(old)
+    store.destroy(old_handle)
+    store.flush()
+
+    new = Thing("new")
+    new_handle = store.create(new)
+    # Same slot, new generation
+    assert new_handle != old_handle
+    assert not store.alive(old_handle)
+    assert store.get(new_handle) is new
+    assert not store.destroy(old_handle)
+    assert store.alive(new_handle)
+
+def test_destroy_during_iteration_is_deferred():
+    store = EntityStore()
+    things = [Thing(i) for i in range(5)]
+    for thing in things:
+        store.create(thing)
+
+    seen = []
+    for thing in store:
+        seen.append(thing.name)
+        if thing.name % 2 == 0:
+            assert store.destroy(thing.handle)
+            assert not store.destroy(thing.handle)  # Repeat calls are no-ops
+    assert seen == [0, 1, 2, 3, 4]
+    assert len(store) == 5
+    assert [store.alive(thing.handle) for thing in things] == [False, True, False, True, False]
+
+    store.flush()
+    assert sorted(names(store)) == [1, 3]
+
+def test_flush_keeps_moved_handles_valid():
+    store = EntityStore()
+    things = [Thing(i) for i in range(6)]
+    for thing in things:
+        store.create(thing)
+
+    # Destroy out of order, including the last entity and one moved into a gap
+    for i in (1, 5, 0, 3):
+        store.destroy(things[i].handle)
+    store.flush()
+
+    assert sorted(names(store)) == [2, 4]
+    for thing in things:
+        if thing.name in (2, 4):
+            assert store.get(thing.handle) is thing
+            assert store[store.slot_index[thing.handle & SLOT_MASK]] is thing
+        else:
+            assert not store.alive(thing.handle)
+
+def test_create_many_reuses_slots_and_matches_create():
+    store = EntityStore()
+    first = [Thing(i) for i in range(4)]
+    store.create_many(first)
+    store.destroy(first[1].handle)
+    store.destroy(first[2].handle)
+    store.flush()
+
+    batch = [Thing(name) for name in "abc"]
+    handles = store.create_many(batch)
+    assert handles == [thing.handle for thing in batch]
+    assert len(set(handles) | {first[1].handle, first[2].handle}) == 5
+    assert sorted(map(str, names(store))) == ["0", "3", "a", "b", "c"]
+    for thing in batch:
+        assert store.get(thing.handle) is thing
+
+def test_clear_invalidates_every_handle():
+    store = EntityStore()
+    things = [Thing(i) for i in range(3)]
+    for thing in things:
+        store.create(thing)
+    store.destroy(things[0].handle)
+    store.clear()
+    assert len(store) == 0
+    assert not any(store.alive(thing.handle) for thing in things)
+    store.flush()  # Nothing left over from before clear()
+    assert len(store) == 0
@@ -0,0 +1,77 @@
+# test_snapshot.py
+# Snapshot round trips: save -> restore -> save must be byte-identical
+
+import random
+import threading
+
+import pytest
+
+import app
+from conftest import ROOT
+
+def play(game, ticks):
+    """Run simulation ticks the way the main loop does, then snapshot."""
+    for tick in range(ticks):
+        if game.game_over or game.in_level_up_menu:
+            break
+        nearest = game.find_nearest_enemy()
+        if nearest is not None and tick % 10 == 0:
+            game.player.shoot_toward_enemy(nearest)
+        game.store_previous_positions()
+        game.update()
+    return game.save_snapshot()
+
+@pytest.fixture
+def game(monkeypatch):
+    """A game a few hundred ticks into a run, with enemies, bullets and coins in play."""
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(app, "RUN_HISTORY_PATH", ":memory:")
+    monkeypatch.setattr(app, "TELEMETRY_FOLDER", None)
+    random.seed(7)
+    from game import Game
+
+    game = Game()
+    play(game, 300)
+    yield game
+    game.close()
+
+def test_save_restore_save_is_byte_identical(game):
+    assert len(game.enemies) > 0
+    assert len(game.player.bullets) > 0
+    assert len(game.coins) > 0
+    blob = game.save_snapshot()
+    game.restore_snapshot(blob)
+    assert game.save_snapshot() == blob
+
+def test_restored_game_continues_identically(game):
+    blob = game.save_snapshot()
+    first = play(game, 300)
+    game.restore_snapshot(blob)
+    assert play(game, 300) == first
+
+def test_coop_players_camera_and_invincibility_round_trip(game):
+    from game import Game
+
+    partner = game.add_player()
+    partner.remote_move = (1, -1)
+    partner.shoot_toward_position(partner.x + 100, partner.y)
+    partner.take_damage(1)
+    play(game, 3)
+    game.camera.rect.x += 7  # Not where following the lead player would put it
+    blob = game.save_snapshot()
+
+    other = Game()
+    try:
+        threads = threading.active_count()
+        for _ in range(3):
+            other.restore_snapshot(blob)
+        assert threading.active_count() == threads
+        assert len(other.players) == 2
+        restored = other.players[1]
+        assert restored.remote and restored.remote_move == (1, -1)
+        assert restored.invincible_ticks == partner.invincible_ticks > 0
+        assert len(restored.bullets) == len(partner.bullets) > 0
+        assert other.camera.rect == game.camera.rect
+        assert other.save_snapshot() == blob
+    finally:
+        other.close()
@@ -0,0 +1,66 @@
+# test_telemetry.py
+# Telemetry ring buffer: wrap-around flushes and drop-on-full
+
+import glob
+import os
+
+import numpy as np
+
+import telemetry
+from telemetry import FILE_HEADER, RECORD, Telemetry
+
+def read_records(folder):
+    records = []
+    for path in sorted(glob.glob(os.path.join(folder, "session-*.bin"))):
+        with open(path, "rb") as f:
+            data = f.read()
+        records.extend(RECORD.iter_unpack(data[FILE_HEADER.size:]))
+    return records
+
+def record_ticks(recorder, ticks):
+    for tick in ticks:
+        recorder.tick = tick
+        recorder.record(telemetry.COIN, value=tick)
+
+def test_ring_buffer_wraps_in_order_and_drops_when_full(tmp_path):
+    # A long interval keeps the flusher asleep; flushes are driven by hand
+    recorder = Telemetry(str(tmp_path), capacity=4, flush_interval=3600)
+    record_ticks(recorder, range(3))
+    recorder._flush()
+    # Slots 3, 0, 1 and 2: the filled region now wraps around the end
+    record_ticks(recorder, range(3, 8))
+    assert recorder.dropped == 1
+    recorder.close()
+
+    records = read_records(str(tmp_path))
+    assert [record[0] for record in records] == [0, 1, 2, 3, 4, 5, 6]
+    assert {record[1] for record in records} == {telemetry.COIN}
+    assert [record[5] for record in records] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+
+def test_record_many_matches_single_records_across_the_wrap(tmp_path):
+    single = Telemetry(str(tmp_path / "single"), capacity=4, flush_interval=3600)
+    batched = Telemetry(str(tmp_path / "batched"), capacity=4, flush_interval=3600)
+    for recorder in (single, batched):
+        record_ticks(recorder, range(3))
+        recorder._flush()
+        recorder.tick = 9
+
+    subtypes = np.array([1, 2, 0, 1, 2])
+    xs = np.array([10.0, 20.0, 30.0, 40.0, 50.0])
+    ys = np.array([-1.0, -2.0, -3.0, -4.0, -5.0])
+    values = np.array([5.0, 6.0, 7.0, 8.0, 9.0])
+    for event in zip(subtypes, xs, ys, values):
+        single.record(telemetry.SPAWN, *event)
+    batched.record_many(telemetry.SPAWN, subtypes, xs, ys, values)
+    assert single.dropped == batched.dropped == 1
+    single.close()
+    batched.close()
+
+    assert read_records(str(tmp_path / "batched")) == read_records(str(tmp_path / "single"))
+
+def test_disabled_recorder_is_a_no_op():
+    recorder = Telemetry()
+    recorder.record(telemetry.COIN, value=1.0)
+    recorder.close()
+    assert not recorder.enabled
+    assert recorder.dropped == 0
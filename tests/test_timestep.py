@@ -0,0 +1,31 @@
+# test_timestep.py
+# FixedTimestep tick counting, catch-up cap, interpolation and render skipping
+
+import pytest
+
+from timestep import FixedTimestep
+
+def test_ticks_accumulate_across_short_frames():
+    timestep = FixedTimestep(10)
+    assert timestep.advance(0.04) == 0
+    assert timestep.alpha == pytest.approx(0.4)
+    assert timestep.advance(0.08) == 1
+    assert timestep.alpha == pytest.approx(0.2)
+    assert timestep.stats.ticks == 1
+    assert timestep.stats.frames == 2
+
+def test_catch_up_is_capped_and_backlog_dropped():
+    timestep = FixedTimestep(10, max_catch_up_steps=3)
+    assert timestep.advance(1.05) == 3
+    assert timestep.stats.dropped_ticks == 7
+    # Only the fraction of a tick is kept, not the dropped backlog
+    assert timestep.alpha == pytest.approx(0.5)
+    assert timestep.advance(0.0) == 0
+
+def test_render_skipping_is_bounded():
+    timestep = FixedTimestep(60, max_skipped_renders=2)
+    assert timestep.should_render(1)
+    assert timestep.should_render(2)  # One extra tick is normal jitter
+    assert [timestep.should_render(3) for _ in range(4)] == [False, False, True, False]
+    assert timestep.stats.skipped_renders == 3
+    assert timestep.stats.renders == 3
@@ -0,0 +1,49 @@
+# test_vec_env.py
+# Arena and collision sizes of the batched training environment
+
+import numpy as np
+import pytest
+
+import app
+import vec_env
+from conftest import ROOT
+
+@pytest.fixture(autouse=True)
+def in_repo(monkeypatch):
+    monkeypatch.chdir(ROOT)
+
+def test_collision_boxes_follow_sprites_and_scale(monkeypatch):
+    env = vec_env.VecGameEnv(1, seed=0)
+    assert env.enemy_half_w.tolist() == [16, 16, 32]
+    assert env.enemy_half_h.tolist() == [23, 16, 36]
+    assert env.player_half_size == (16, 28)
+
+    monkeypatch.setattr(app, "ENEMY_SCALE_FACTOR", 3)
+    env = vec_env.VecGameEnv(1, seed=0)
+    assert env.enemy_half_w.tolist() == [24, 24, 48]
+
+def test_arena_is_the_game_world():
+    env = vec_env.VecGameEnv(4, seed=0)
+    obs = env.reset()
+    assert (env.px == app.WORLD_WIDTH // 2).all()
+    assert (env.py == app.WORLD_HEIGHT // 2).all()
+    assert np.allclose(obs["player"][:, :2], 0.5)
+
+    # Enemies appear just outside the view around the player, not the world's corner
+    for _ in range(vec_env.SPAWN_INTERVAL):
+        env.step(np.zeros((4, 2), np.int64))
+    ex, ey = env.ex[env.ealive], env.ey[env.ealive]
+    assert len(ex) == 4
+    half_w = app.WIDTH // 2 + app.SPAWN_MARGIN
+    half_h = app.HEIGHT // 2 + app.SPAWN_MARGIN
+    assert (np.abs(ex - app.WORLD_WIDTH // 2) <= half_w).all()
+    assert (np.abs(ey - app.WORLD_HEIGHT // 2) <= half_h).all()
+    assert ((np.abs(ex - app.WORLD_WIDTH // 2) == half_w) |
+            (np.abs(ey - app.WORLD_HEIGHT // 2) == half_h)).all()
+
+def test_player_is_clamped_to_the_world():
+    env = vec_env.VecGameEnv(1, seed=0)
+    env.reset()
+    env.px[:] = app.WORLD_WIDTH - 1
+    env._move_player(np.array([3]))  # Move right
+    assert env.px[0] == app.WORLD_WIDTH
@@ -0,0 +1,64 @@
+# test_waves.py
+# Seeded wave schedules: determinism per seed, random access and planner caching
+
+import numpy as np
+
+from waves import WavePlanner, WaveSchedule
+
+VIEW = (800, 600)
+MARGIN = 50
+
+class Tables:
+    """Just the content tables a WaveSchedule reads."""
+    enemy_health = [1, 0, 2]
+
+    def enemy_health_bonus(self, level):
+        return level * 10
+
+def make_schedule(seed, level=3, per_wave=5, block_waves=4):
+    return WaveSchedule(seed, level, per_wave, VIEW, MARGIN, Tables.enemy_health,
+                        Tables().enemy_health_bonus(level), len(Tables.enemy_health),
+                        block_waves)
+
+def assert_same_wave(a, b):
+    for left, right in zip(a, b):
+        np.testing.assert_array_equal(left, right)
+
+def test_same_seed_gives_same_waves():
+    a, b = make_schedule(7), make_schedule(7)
+    for index in range(10):
+        assert_same_wave(a.wave(index), b.wave(index))
+
+def test_seed_and_level_change_the_waves():
+    base = np.concatenate(make_schedule(7).wave(0)[:2])
+    assert not np.array_equal(base, np.concatenate(make_schedule(8).wave(0)[:2]))
+    assert not np.array_equal(base, np.concatenate(make_schedule(7, level=4).wave(0)[:2]))
+
+def test_waves_can_be_looked_up_out_of_order():
+    sequential = make_schedule(3)
+    waves = [sequential.wave(index) for index in range(12)]
+    jumped = make_schedule(3)
+    assert_same_wave(jumped.wave(11), waves[11])
+    assert_same_wave(jumped.wave(2), waves[2])
+
+def test_waves_spawn_on_the_margin_with_level_health():
+    xs, ys, type_ids, health = make_schedule(5, per_wave=200).wave(0)
+    width, height = VIEW
+    on_side = ((xs == -MARGIN) | (xs == width + MARGIN)) & (ys >= 0) & (ys <= height)
+    on_top_bottom = ((ys == -MARGIN) | (ys == height + MARGIN)) & (xs >= 0) & (xs <= width)
+    assert np.all(on_side | on_top_bottom)
+    np.testing.assert_array_equal(health, np.array(Tables.enemy_health)[type_ids] + 30)
+
+def test_planner_hands_out_prepared_schedules_and_drops_old_ones():
+    planner = WavePlanner(VIEW, MARGIN, len(Tables.enemy_health), block_waves=4)
+    tables = Tables()
+    planner.prepare(1, 2, 5, tables)
+    planner.prepare(1, 3, 6, tables)
+    prepared = planner.prepared[(1, 3, 6)]
+
+    first = planner.schedule(1, 2, 5, tables)
+    assert first.key == (1, 2, 5)
+    assert planner.schedule(1, 3, 6, tables) is prepared
+    assert planner.prepared == {}
+    # Built on demand when nothing was prepared, with the same waves
+    assert_same_wave(planner.schedule(1, 3, 6, tables).wave(5), prepared.wave(5))
@@ -0,0 +1,87 @@
+# timestep.py
+# Fixed-timestep bookkeeping for the main game loop
+
+class FrameStats:
+    """
+    Counters describing how the fixed-timestep loop kept up with real time.
+    """
+
+    def __init__(self):
+        self.frames = 0  # Loop iterations
+        self.ticks = 0  # Simulation ticks run
+        self.renders = 0  # Frames actually drawn
+        self.skipped_renders = 0  # Frames not drawn because the loop was behind
+        self.dropped_ticks = 0  # Ticks discarded by the catch-up cap
+
+    def as_dict(self):
+        return dict(vars(self))
+
+class FixedTimestep:
+    """
+    Accumulator that converts variable frame times into a steady number of
+    simulation ticks, with an interpolation factor for rendering.
+    """
+
+    def __init__(self, tick_rate, max_catch_up_steps=5, max_skipped_renders=4):
+        """
+        Args:
+            tick_rate (int): Simulation ticks per second
+            max_catch_up_steps (int): Most ticks run in a single frame before
+                the remaining backlog is dropped (avoids a spiral of death)
+            max_skipped_renders (int): Most consecutive frames that may be
+                skipped while catching up
+        """
+        self.tick_seconds = 1.0 / tick_rate
+        self.max_catch_up_steps = max_catch_up_steps
+        self.max_skipped_renders = max_skipped_renders
+        self.accumulator = 0.0
+        self.skipped_in_a_row = 0
+        self.stats = FrameStats()
+
+    def advance(self, frame_seconds):
+        """
+        Add elapsed real time and work out how many ticks to simulate.
+
+        Args:
+            frame_seconds (float): Time since the previous frame
+
+        Returns:
+            int: Number of simulation ticks to run this frame
+        """
+        self.stats.frames += 1
+        self.accumulator += frame_seconds
+
+        steps = int(self.accumulator / self.tick_seconds)
+        if steps > self.max_catch_up_steps:
+            # Too far behind: run the cap and forget the rest of the backlog
+            self.stats.dropped_ticks += steps - self.max_catch_up_steps
+            steps = self.max_catch_up_steps
+            self.accumulator = self.accumulator % self.tick_seconds + steps * self.tick_seconds
+
+        self.accumulator -= steps * self.tick_seconds
+        self.stats.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a tick elapsed since the last simulation step (0-1)."""
+        return min(1.0, self.accumulator / self.tick_seconds)
+
+    def should_render(self, steps):
+        """
+        Decide whether to draw this frame.
+
+        Frames that needed more than two ticks to catch up are skipped, but
+        never more than max_skipped_renders in a row. (One extra tick is
+        normal clock jitter and is still drawn.)
+
+        Args:
+            steps (int): Ticks simulated this frame
+        """
+        if steps > 2 and self.skipped_in_a_row < self.max_skipped_renders:
+            self.skipped_in_a_row += 1
+            self.stats.skipped_renders += 1
+            return False
+        self.skipped_in_a_row = 0
+        self.stats.renders += 1
+        return True
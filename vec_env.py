@@ -0,0 +1,444 @@
+# vec_env.py
+# Batched headless environment for training and evaluating automated players
+
+import time
+
+import os
+
+import numpy as np
+import pygame
+
+import app
+import content
+
+# Movement actions: index -> (dir x, dir y)
+MOVES = np.array([(0, 0), (0, -1), (1, -1), (1, 0), (1, 1),
+                  (0, 1), (-1, 1), (-1, 0), (-1, -1)], dtype=np.float64)
+
+BULLET_HALF_SIZE = 5
+COIN_HALF_SIZE = 7.5
+
+PLAYER_MAX_HEALTH = 5
+BULLET_SPEED = 10
+SPAWN_INTERVAL = 60
+XP_SCALE_FACTOR = 4
+INVINCIBILITY_TICKS = app.INVINCIBILITY_TICKS
+
+def sprite_half_size(spec, folder=None):
+    """
+    Half width and half height of the first frame of an ASSET_GROUPS entry,
+    scaled the way app.load_image scales it. Only the file header is needed,
+    so this works without a display.
+
+    Args:
+        spec (tuple): (prefix, frame count, scale factor constant, alpha)
+        folder (str): Asset folder (default ASSET_FOLDER)
+
+    Returns:
+        tuple: (half width, half height)
+    """
+    prefix, _, scale_name, _ = spec
+    image = pygame.image.load(os.path.join(folder or app.ASSET_FOLDER, f"{prefix}_0.png"))
+    scale = getattr(app, scale_name)
+    return int(image.get_width() * scale) / 2, int(image.get_height() * scale) / 2
+
+def allocate(free, requested):
+    """
+    Pair each requested item with a free slot in the same row.
+
+    Args:
+        free (np.ndarray): (rows, slots) bool, True where a slot is free
+        requested (np.ndarray): (rows, items) bool, True where an item wants a slot
+
+    Returns:
+        tuple: (row, item, slot) index arrays for the items that got a slot
+    """
+    item_rows, items = np.nonzero(requested)
+    item_rank = np.cumsum(requested, axis=1)[item_rows, items] - 1
+    free_rows, slots = np.nonzero(free)
+    free_rank = np.cumsum(free, axis=1)[free_rows, slots] - 1
+    table = np.full(free.shape, -1)
+    table[free_rows, free_rank] = slots
+    chosen = table[item_rows, np.minimum(item_rank, free.shape[1] - 1)]
+    ok = (chosen >= 0) & (item_rank < free.shape[1])
+    return item_rows[ok], items[ok], chosen[ok]
+
+class VecGameEnv:
+    """
+    N independent headless games stepped together.
+
+    The rules mirror Game.update (movement, knockback, spawning, level
+    scaling, coins, XP and level-ups) but every entity lives in fixed-size
+    NumPy arrays with one row per game, so each step is a handful of array
+    operations shared by all games rather than a Python loop per game.
+    Bosses, weapons and upgrades are not simulated.
+
+    As in the game, the player moves in an app.WORLD_WIDTH x WORLD_HEIGHT
+    world, enemies spawn just outside the screen-sized view around the
+    player and bullets are dropped when they leave it. Collision boxes are
+    the scaled sprite sizes. All of these are read when the env is built.
+
+    Actions: int array (N, 2) of [move index into MOVES, shoot at nearest enemy].
+    Observations: dict with
+        "enemies": (N, nearest_k, 5) dx, dy (in view sizes), health, type id, valid
+        "player":  (N, 5) x, y (in world sizes), health, level, invincible
+        "coins":   (N, rows, columns) coin counts per grid cell of the view
+    Games whose player dies are reset automatically; their final stats are
+    returned in infos["final"].
+    """
+
+    def __init__(self, num_envs, seed=None, max_enemies=256, max_bullets=64,
+                 max_coins=256, nearest_k=8, coin_grid=(10, 15)):
+        """
+        Args:
+            num_envs (int): Number of games
+            seed (int): Seed for the shared random generator
+            max_enemies (int): Enemy slots per game
+            max_bullets (int): Bullet slots per game
+            max_coins (int): Coin slots per game
+            nearest_k (int): Enemies included in each observation
+            coin_grid (tuple): (rows, columns) of the coin observation grid
+        """
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+        self.nearest_k = nearest_k
+        self.coin_grid = coin_grid
+        n = num_envs
+
+        # Arena and collision boxes, matching the game's current settings
+        self.world_width, self.world_height = app.WORLD_WIDTH, app.WORLD_HEIGHT
+        self.view_width, self.view_height = app.WIDTH, app.HEIGHT
+        self.spawn_margin = app.SPAWN_MARGIN
+        half_sizes = [sprite_half_size(app.ASSET_GROUPS["enemies"][enemy_type])
+                      for enemy_type in app.ENEMY_TYPES]
+        self.enemy_half_w = np.array([w for w, _ in half_sizes], float)
+        self.enemy_half_h = np.array([h for _, h in half_sizes], float)
+        self.player_half_size = sprite_half_size(app.ASSET_GROUPS["player"]["idle"])
+
+        # Enemy stats and level scaling from the compiled content tables
+        stats = content.current()
+        self.enemy_base_health = np.array(stats.enemy_health, float)
+        self.enemy_speed = np.array(stats.enemy_speed, float)
+        self.health_bonus = np.array(stats.health_bonus, float)
+        # Weapons are not simulated, so only the coin share of each drop table counts
+        self.coin_chance = np.array([
+            sum(high - low for low, high, item in zip([0.0] + chances[:-1], chances, items)
+                if item == content.DROP_COIN)
+            for chances, items in zip(stats.enemy_drop_chances, stats.enemy_drop_items)])
+
+        # Player state
+        self.px = np.zeros(n)
+        self.py = np.zeros(n)
+        self.health = np.zeros(n)
+        self.xp = np.zeros(n)
+        self.level = np.zeros(n, np.int64)
+        self.invincible = np.zeros(n, np.int64)  # Ticks left
+        self.spawn_timer = np.zeros(n, np.int64)
+        self.enemies_per_spawn = np.zeros(n, np.int64)
+        self.ticks = np.zeros(n, np.int64)
+        self.kills = np.zeros(n, np.int64)
+
+        # Enemies
+        self.ex = np.zeros((n, max_enemies))
+        self.ey = np.zeros((n, max_enemies))
+        self.etype = np.zeros((n, max_enemies), np.int64)
+        self.ehealth = np.zeros((n, max_enemies))
+        self.ealive = np.zeros((n, max_enemies), bool)
+        self.kb_left = np.zeros((n, max_enemies))
+        self.kb_dx = np.zeros((n, max_enemies))
+        self.kb_dy = np.zeros((n, max_enemies))
+
+        # Bullets
+        self.bx = np.zeros((n, max_bullets))
+        self.by = np.zeros((n, max_bullets))
+        self.bvx = np.zeros((n, max_bullets))
+        self.bvy = np.zeros((n, max_bullets))
+        self.balive = np.zeros((n, max_bullets), bool)
+
+        # Coins
+        self.cx = np.zeros((n, max_coins))
+        self.cy = np.zeros((n, max_coins))
+        self.calive = np.zeros((n, max_coins), bool)
+
+    def reset(self):
+        """Reset every game and return the first observations."""
+        self.reset_envs(np.ones(self.num_envs, bool))
+        return self.observe()
+
+    def reset_envs(self, mask):
+        """Reset the games selected by a boolean mask."""
+        self.px[mask] = self.world_width // 2
+        self.py[mask] = self.world_height // 2
+        self.health[mask] = PLAYER_MAX_HEALTH
+        self.xp[mask] = 0
+        self.level[mask] = 1
+        self.invincible[mask] = 0
+        self.spawn_timer[mask] = 0
+        self.enemies_per_spawn[mask] = 1
+        self.ticks[mask] = 0
+        self.kills[mask] = 0
+        self.ealive[mask] = False
+        self.kb_left[mask] = 0
+        self.balive[mask] = False
+        self.calive[mask] = False
+
+    def step(self, actions):
+        """
+        Advance every game by one simulation tick.
+
+        Args:
+            actions (np.ndarray): (N, 2) int array of [move, shoot]
+
+        Returns:
+            tuple: (observations, rewards, dones, infos)
+        """
+        actions = np.asarray(actions)
+        xp_before = self.xp.copy()
+        health_before = self.health.copy()
+        self.ticks += 1
+
+        self._move_player(actions[:, 0])
+        self._shoot(actions[:, 1].astype(bool))
+        self._move_bullets()
+        self._move_enemies()
+        self._player_enemy_collisions()
+        self._bullet_enemy_collisions()
+        self._coin_collisions()
+
+        dones = self.health <= 0
+        self.ealive[dones] = False
+        self._spawn_enemies()
+        self._level_up()
+
+        rewards = (self.xp - xp_before) - (health_before - self.health)
+        infos = {}
+        if dones.any():
+            infos["final"] = {
+                "env": np.nonzero(dones)[0],
+                "level": self.level[dones].copy(),
+                "xp": self.xp[dones].copy(),
+                "kills": self.kills[dones].copy(),
+                "ticks": self.ticks[dones].copy(),
+            }
+            self.reset_envs(dones)
+        return self.observe(), rewards, dones, infos
+
+    def _move_player(self, moves):
+        direction = MOVES[moves]
+        self.px = np.clip(self.px + direction[:, 0] * app.PLAYER_SPEED, 0, self.world_width)
+        self.py = np.clip(self.py + direction[:, 1] * app.PLAYER_SPEED, 0, self.world_height)
+        self.invincible = np.maximum(0, self.invincible - 1)
+
+    def _view_origin(self):
+        """Top-left of the screen-sized view centred on each player, kept inside the world."""
+        left = np.clip(self.px - self.view_width // 2, 0, self.world_width - self.view_width)
+        top = np.clip(self.py - self.view_height // 2, 0, self.world_height - self.view_height)
+        return left, top
+
+    def _nearest_enemy(self):
+        """Return (index, has enemy) of the nearest living enemy per game."""
+        dist2 = (self.ex - self.px[:, None]) ** 2 + (self.ey - self.py[:, None]) ** 2
+        dist2[~self.ealive] = np.inf
+        nearest = dist2.argmin(axis=1)
+        return nearest, np.isfinite(dist2[np.arange(self.num_envs), nearest])
+
+    def _shoot(self, shoot):
+        nearest, has_target = self._nearest_enemy()
+        shoot &= has_target
+        rows = np.arange(self.num_envs)
+        dx = self.ex[rows, nearest] - self.px
+        dy = self.ey[rows, nearest] - self.py
+        dist = np.hypot(dx, dy)
+        shoot &= dist > 0
+
+        env, _, slot = allocate(~self.balive, shoot[:, None])
+        safe = np.where(dist > 0, dist, 1)
+        self.bx[env, slot] = self.px[env]
+        self.by[env, slot] = self.py[env]
+        self.bvx[env, slot] = dx[env] / safe[env] * BULLET_SPEED
+        self.bvy[env, slot] = dy[env] / safe[env] * BULLET_SPEED
+        self.balive[env, slot] = True
+
+    def _move_bullets(self):
+        self.bx += self.bvx
+        self.by += self.bvy
+        left, top = self._view_origin()
+        bx = self.bx - left[:, None]
+        by = self.by - top[:, None]
+        self.balive &= (bx >= 0) & (bx <= self.view_width) & \
+                       (by >= 0) & (by <= self.view_height)
+
+    def _move_enemies(self):
+        knocked = self.ealive & (self.kb_left > 0)
+        chasing = self.ealive & ~knocked
+
+        step = np.minimum(app.ENEMY_KNOCKBACK_SPEED, self.kb_left)
+        step = np.where(knocked, step, 0)
+        self.kb_left -= step
+        self.ex += self.kb_dx * step
+        self.ey += self.kb_dy * step
+
+        dx = self.px[:, None] - self.ex
+        dy = self.py[:, None] - self.ey
+        dist = np.hypot(dx, dy)
+        scale = np.where(chasing & (dist > 0), self.enemy_speed[self.etype] / np.where(dist > 0, dist, 1), 0)
+        self.ex += dx * scale
+        self.ey += dy * scale
+
+    def _player_enemy_collisions(self):
+        half_w = self.enemy_half_w[self.etype] + self.player_half_size[0]
+        half_h = self.enemy_half_h[self.etype] + self.player_half_size[1]
+        touching = self.ealive & (np.abs(self.ex - self.px[:, None]) < half_w) & \
+                   (np.abs(self.ey - self.py[:, None]) < half_h)
+        hit = touching.any(axis=1)
+
+        damaged = hit & (self.invincible == 0) & (self.health > 0)
+        self.health[damaged] -= 1
+        self.invincible[damaged] = INVINCIBILITY_TICKS
+
+        # Every enemy in a game that touched the player is pushed away
+        dx = self.ex - self.px[:, None]
+        dy = self.ey - self.py[:, None]
+        length = np.hypot(dx, dy)
+        push = hit[:, None] & self.ealive & (length > 0)
+        safe = np.where(length > 0, length, 1)
+        self.kb_dx = np.where(push, dx / safe, self.kb_dx)
+        self.kb_dy = np.where(push, dy / safe, self.kb_dy)
+        self.kb_left = np.where(push, app.PUSHBACK_DISTANCE, self.kb_left)
+
+    def _bullet_enemy_collisions(self):
+        n, enemies = self.ex.shape
+        env, bullet = np.nonzero(self.balive)
+        # Slots are filled lowest first, so only test up to the highest live enemy
+        columns = enemies - np.argmax(self.ealive[:, ::-1].any(axis=0)) if self.ealive.any() else 0
+        if len(env) == 0 or columns == 0:
+            return
+
+        # One row per live bullet against the enemies of its own game
+        etype = self.etype[env, :columns]
+        overlap = (np.abs(self.bx[env, bullet][:, None] - self.ex[env, :columns])
+                   < self.enemy_half_w[etype] + BULLET_HALF_SIZE) & \
+                  (np.abs(self.by[env, bullet][:, None] - self.ey[env, :columns])
+                   < self.enemy_half_h[etype] + BULLET_HALF_SIZE) & \
+                  self.ealive[env, :columns]
+
+        # Each bullet hits the first enemy it overlaps and is used up
+        hit = overlap.any(axis=1)
+        target = overlap.argmax(axis=1)
+        damage = np.bincount(env[hit] * enemies + target[hit], minlength=n * enemies)
+        damage = damage.reshape(n, enemies)
+        self.ehealth -= damage
+        self.balive[env[hit], bullet[hit]] = False
+
+        dead = self.ealive & (damage > 0) & (self.ehealth <= 0)
+        self.ealive &= ~dead
+        self.kills += dead.sum(axis=1)
+
+        drops = dead & (self.rng.random(dead.shape) < self.coin_chance[self.etype])
+        env, enemy, slot = allocate(~self.calive, drops)
+        self.cx[env, slot] = self.ex[env, enemy]
+        self.cy[env, slot] = self.ey[env, enemy]
+        self.calive[env, slot] = True
+
+    def _coin_collisions(self):
+        collected = self.calive & \
+            (np.abs(self.cx - self.px[:, None]) < COIN_HALF_SIZE + self.player_half_size[0]) & \
+            (np.abs(self.cy - self.py[:, None]) < COIN_HALF_SIZE + self.player_half_size[1])
+        self.xp += collected.sum(axis=1)
+        self.calive &= ~collected
+
+    def _spawn_enemies(self):
+        self.spawn_timer += 1
+        due = self.spawn_timer >= SPAWN_INTERVAL
+        self.spawn_timer[due] = 0
+
+        requested = np.zeros(self.ealive.shape, bool)
+        counts = np.where(due, self.enemies_per_spawn, 0)
+        requested[:, :min(requested.shape[1], counts.max(initial=0))] = True
+        requested &= np.arange(requested.shape[1])[None, :] < counts[:, None]
+        env, _, slot = allocate(~self.ealive, requested)
+        count = len(env)
+        if count == 0:
+            return
+
+        # Random side of the view, then a random position along it
+        side = self.rng.integers(0, 4, count)
+        along_x = self.rng.integers(0, self.view_width + 1, count)
+        along_y = self.rng.integers(0, self.view_height + 1, count)
+        margin = self.spawn_margin
+        left, top = self._view_origin()
+        x = left[env] + np.select([side == 0, side == 1, side == 2],
+                                  [along_x, along_x, -margin], self.view_width + margin)
+        y = top[env] + np.select([side == 0, side == 1, side == 2],
+                                 [-margin, self.view_height + margin, along_y], along_y)
+
+        enemy_type = self.rng.integers(0, len(app.ENEMY_TYPES), count)
+        level = self.level[env]
+        # Same level scaling table as Game.spawn_enemies
+        bonus = self.health_bonus[np.minimum(level, len(self.health_bonus) - 1)]
+        self.ex[env, slot] = x
+        self.ey[env, slot] = y
+        self.etype[env, slot] = enemy_type
+        self.ehealth[env, slot] = self.enemy_base_health[enemy_type] + bonus
+        self.kb_left[env, slot] = 0
+        self.ealive[env, slot] = True
+
+    def _level_up(self):
+        levelled = self.xp >= self.level * self.level * XP_SCALE_FACTOR
+        self.level[levelled] += 1
+        self.enemies_per_spawn[levelled] += 1
+        self.ealive[levelled] = False  # Level-ups clear the arena
+
+    def observe(self):
+        """Build the observation arrays for every game."""
+        n = self.num_envs
+        k = self.nearest_k
+        dx = self.ex - self.px[:, None]
+        dy = self.ey - self.py[:, None]
+        dist2 = np.where(self.ealive, dx * dx + dy * dy, np.inf)
+        order = np.argsort(dist2, axis=1)[:, :k]
+        rows = np.arange(n)[:, None]
+        enemies = np.stack([
+            dx[rows, order] / self.view_width,
+            dy[rows, order] / self.view_height,
+            self.ehealth[rows, order],
+            self.etype[rows, order],
+            self.ealive[rows, order],
+        ], axis=2).astype(np.float32)
+        enemies[~self.ealive[rows, order]] = 0
+
+        player = np.stack([self.px / self.world_width, self.py / self.world_height,
+                           self.health / PLAYER_MAX_HEALTH, self.level,
+                           self.invincible > 0], axis=1).astype(np.float32)
+
+        grid_rows, grid_cols = self.coin_grid
+        left, top = self._view_origin()
+        cx = self.cx - left[:, None]
+        cy = self.cy - top[:, None]
+        # Coins outside the view are left out, as they are off screen in the game
+        visible = self.calive & (cx >= 0) & (cx <= self.view_width) & \
+                  (cy >= 0) & (cy <= self.view_height)
+        gx = np.minimum((cx * grid_cols / self.view_width).astype(np.int64), grid_cols - 1)
+        gy = np.minimum((cy * grid_rows / self.view_height).astype(np.int64), grid_rows - 1)
+        cell = (np.arange(n)[:, None] * grid_rows + gy) * grid_cols + gx
+        coins = np.bincount(cell[visible], minlength=n * grid_rows * grid_cols)
+        coins = coins.reshape(n, grid_rows, grid_cols).astype(np.float32)
+
+        return {"enemies": enemies, "player": player, "coins": coins}
+
+def benchmark(sizes=(1, 8, 64, 256), steps=300):
+    """Print steps per second (summed over games) for several batch sizes."""
+    for num_envs in sizes:
+        env = VecGameEnv(num_envs, seed=0)
+        env.reset()
+        rng = np.random.default_rng(0)
+        start = time.perf_counter()
+        for _ in range(steps):
+            actions = np.stack([rng.integers(0, len(MOVES), num_envs),
+                                rng.integers(0, 2, num_envs)], axis=1)
+            env.step(actions)
+        elapsed = time.perf_counter() - start
+        print(f"{num_envs:5d} games: {steps * num_envs / elapsed:10.0f} game steps/s")
+
+if __name__ == "__main__":
+    benchmark()
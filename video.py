@@ -0,0 +1,164 @@
+# video.py
+# Gameplay video capture with encoding and writing on worker threads
+
+import collections
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pygame
+
+class VideoRecorder:
+    """
+    Records frames of a surface to a PNG sequence or a raw Y4M video.
+
+    capture() only copies the surface's packed 32-bit pixels (through a
+    surfarray view, without an intermediate surface) into one of a fixed
+    ring of preallocated buffers. Unpacking the colour channels, encoding
+    and writing happen on a thread pool. When every buffer is still waiting
+    to be encoded, live captures drop the frame instead of stalling the
+    game loop.
+    """
+
+    def __init__(self, path, surface, fps, ring_frames=8, workers=2):
+        """
+        Args:
+            path (str): A ".y4m" file, or a folder for a PNG sequence
+            surface (pygame.Surface): The 32-bit surface that will be captured
+            fps (int): Frame rate written into the Y4M header
+            ring_frames (int): Preallocated frame buffers
+            workers (int): Encoder threads
+
+        Raises:
+            ValueError: If the surface is not 32 bits per pixel
+        """
+        if surface.get_bytesize() != 4:
+            raise ValueError("VideoRecorder needs a 32-bit surface")
+        self.path = path
+        self.y4m = path.endswith(".y4m")
+        width, height = self.size = surface.get_size()
+        self.shifts = surface.get_shifts()[:3]  # Red, green, blue bit offsets
+        # Rows of packed pixels, in the surface's own memory order
+        self.buffers = [np.empty((height, width), np.uint32) for _ in range(ring_frames)]
+        self.free = queue.Queue()
+        for slot in range(ring_frames):
+            self.free.put(slot)
+
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.written_lock = threading.Lock()  # PNG frames are counted by every encoder
+        self.executor = ThreadPoolExecutor(max_workers=workers,
+                                           thread_name_prefix="video-encoder")
+
+        if self.y4m:
+            # 4:2:0 chroma needs even dimensions; an odd last row/column is cut
+            self.out_width, self.out_height = width & ~1, height & ~1
+            self.file = open(path, "wb")
+            self.file.write(f"YUV4MPEG2 W{self.out_width} H{self.out_height} F{fps}:1 "
+                            "Ip A1:1 C420jpeg\n".encode())
+            # Frames are encoded in parallel but must be written in order
+            self.ordered = collections.deque()
+            self.ready = threading.Condition()
+            self.closing = False
+            self.writer = threading.Thread(target=self.write_in_order, name="video-writer",
+                                           daemon=True)
+            self.writer.start()
+        else:
+            os.makedirs(path, exist_ok=True)
+
+    def capture(self, surface, block=False):
+        """
+        Copy a frame into the ring and queue it for encoding.
+
+        Args:
+            surface (pygame.Surface): Surface to record (normally the screen)
+            block (bool): Wait for a free buffer instead of dropping the frame
+
+        Returns:
+            bool: True if the frame was queued
+        """
+        try:
+            slot = self.free.get(block)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+
+        pixels = pygame.surfarray.pixels2d(surface)  # (width, height) view
+        np.copyto(self.buffers[slot], pixels.T)
+        del pixels  # Unlock the surface
+
+        index = self.captured
+        self.captured += 1
+        future = self.executor.submit(self.encode, slot, index)
+        if self.y4m:
+            with self.ready:
+                self.ordered.append(future)
+                self.ready.notify()
+        return True
+
+    def encode(self, slot, index):
+        """Encode one buffered frame (worker thread) and free its buffer."""
+        try:
+            packed = self.buffers[slot]
+            if self.y4m:
+                packed = packed[:self.out_height, :self.out_width]
+            r, g, b = [(packed >> shift).astype(np.uint8) for shift in self.shifts]
+        finally:
+            self.free.put(slot)
+
+        if self.y4m:
+            return rgb_to_yuv420(r, g, b)
+        frame = np.dstack((r, g, b))
+
+        image = pygame.image.frombuffer(frame, self.size, "RGB")
+        pygame.image.save(image, os.path.join(self.path, f"frame_{index:06d}.png"))
+        with self.written_lock:
+            self.written += 1
+        return None
+
+    def write_in_order(self):
+        """Writer thread loop: append encoded Y4M frames in capture order."""
+        while True:
+            with self.ready:
+                while not self.ordered and not self.closing:
+                    self.ready.wait()
+                if not self.ordered:
+                    return
+                future = self.ordered.popleft()
+            self.file.write(b"FRAME\n")
+            self.file.write(future.result())
+            self.written += 1
+
+    def close(self):
+        """Finish writing every queued frame and close the output."""
+        self.executor.shutdown(wait=True)
+        if self.y4m:
+            with self.ready:
+                self.closing = True
+                self.ready.notify()
+            self.writer.join()
+            self.file.close()
+
+    def stats(self):
+        return {"captured": self.captured, "dropped": self.dropped, "written": self.written}
+
+def rgb_to_yuv420(r, g, b):
+    """
+    Convert RGB channel planes with even dimensions to planar full-range
+    YUV 4:2:0 bytes (JPEG/BT.601 coefficients in 8-bit fixed point).
+    """
+    r, g, b = r.astype(np.uint16), g.astype(np.uint16), b.astype(np.uint16)
+    y = (77 * r + 150 * g + 29 * b + 128) >> 8
+
+    def block_sum(plane):
+        # Sum of each 2x2 block (chroma is averaged over 4 pixels)
+        return (plane[0::2, 0::2] + plane[1::2, 0::2] +
+                plane[0::2, 1::2] + plane[1::2, 1::2]).astype(np.int32)
+
+    r, g, b = block_sum(r), block_sum(g), block_sum(b)
+    u = (128 * 1024 - 43 * r - 85 * g + 128 * b + 512) >> 10
+    v = (128 * 1024 + 128 * r - 107 * g - 21 * b + 512) >> 10
+    return b"".join(np.clip(plane, 0, 255).astype(np.uint8).tobytes() for plane in (y, u, v))
@@ -0,0 +1,139 @@
+# warmup.py
+# Prepares the next level on a worker thread while the upgrade menu is open
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+import app
+from boss import boss_scale_for_level
+
+class PreparedLevel:
+    """Everything the warm-up built for one level, handed over in one piece."""
+
+    def __init__(self, key, waves, next_waves, flips, masks):
+        """
+        Args:
+            key (tuple): (seed, level, per_wave) the level was prepared for
+            waves (WaveSchedule): The level's wave schedule
+            next_waves (WaveSchedule): The following level's schedule
+            flips (dict): Enemy frame -> mirrored copy, for app.flipped
+            masks (dict): Enemy frame -> collision mask, for app.frame_mask
+        """
+        self.key = key
+        self.waves = waves
+        self.next_waves = next_waves
+        self.flips = flips
+        self.masks = masks
+
+class LevelWarmup:
+    """
+    Level-transition pipeline. When a level-up opens the upgrade menu the
+    simulation is paused, so that idle time is used to build the coming
+    level's wave schedule (and the one after it), the collision masks and
+    mirrored frames enemies will need, and the boss frames for the next
+    boss level. The result is taken as one PreparedLevel when an upgrade
+    is picked.
+
+    Everything prepared is either a pure function of its key or a shared
+    cache, so warming up never changes the simulation (or snapshots and
+    replays); it only moves work off the first ticks of the level.
+
+    The worker never touches the game's shared state: schedules, mirrored
+    frames and masks are built privately and handed to the main thread,
+    which publishes them (only the boss registry, which has its own lock,
+    is filled directly). A running job can't be interrupted, so each job
+    carries a generation number and one that has been cancelled or
+    replaced stops at its next check and returns nothing.
+    """
+
+    def __init__(self, planner, boss_assets):
+        """
+        Args:
+            planner (WavePlanner): Builds and caches wave schedules
+            boss_assets (BossAssetRegistry): Cache of scaled boss frames
+        """
+        self.planner = planner
+        self.boss_assets = boss_assets
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-warmup")
+        self.pending = None  # Future of the PreparedLevel being built
+        self.generation = 0  # Bumped whenever a warm-up is started or cancelled
+
+    def start(self, key, content, enemy_assets, boss_every_levels):
+        """
+        Start preparing a level, replacing any warm-up not yet taken.
+
+        Args:
+            key (tuple): (seed, level, per_wave) of the level to prepare
+            content (Content): Content tables the schedule is built from
+            enemy_assets (dict): Regular enemy animation frames
+            boss_every_levels (int): Levels between boss waves
+        """
+        self.cancel()
+        self.pending = self.executor.submit(self.prepare, self.generation, key, content,
+                                            enemy_assets, boss_every_levels,
+                                            self.boss_assets.generation)
+
+    def prepare(self, generation, key, content, enemy_assets, boss_every_levels,
+                boss_generation=None):
+        """
+        Worker thread: build one level's state privately.
+
+        Boss frames built from enemy frames that a reload has since replaced
+        are not cached (boss_generation is the registry's generation when
+        enemy_assets was read).
+
+        Returns:
+            PreparedLevel: The state, or None if the job went stale
+        """
+        seed, level, per_wave = key
+        waves = self.planner.build(seed, level, per_wave, content)
+        # Spawns grow by one per level, so the level after is known too
+        next_waves = self.planner.build(seed, level + 1, per_wave + 1, content)
+        if generation != self.generation:
+            return None
+
+        # Collision masks and left-facing frames are otherwise built lazily
+        # by the first enemies to use them
+        flips, masks = {}, {}
+        for frames in list(enemy_assets.values()):
+            for frame in frames:
+                mirrored = pygame.transform.flip(frame, True, False)
+                flips[frame] = mirrored
+                masks[frame] = pygame.mask.from_surface(frame)
+                masks[mirrored] = pygame.mask.from_surface(mirrored)
+        if generation != self.generation:
+            return None
+
+        # Boss frames (and their masks) for the next boss level
+        boss_level = (level // boss_every_levels + 1) * boss_every_levels
+        boss_scale = boss_scale_for_level(boss_level, boss_every_levels,
+                                          self.boss_assets.tiers)
+        for enemy_type in list(enemy_assets.keys()):
+            self.boss_assets.get(enemy_type, enemy_assets, boss_scale, boss_generation)
+        if generation != self.generation:
+            return None
+        return PreparedLevel(key, waves, next_waves, flips, masks)
+
+    def take(self):
+        """
+        Hand over the prepared level, waiting for the worker if it hasn't
+        finished yet.
+
+        Returns:
+            PreparedLevel: The prepared state, or None if nothing was started
+        """
+        pending, self.pending = self.pending, None
+        return None if pending is None else pending.result()
+
+    def cancel(self):
+        """Forget a warm-up that hasn't been taken, stopping it if running."""
+        self.generation += 1
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+
+    def close(self):
+        """Stop the worker thread."""
+        self.cancel()
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,140 @@
+# waves.py
+# Seeded per-level enemy wave schedules, generated in blocks of arrays
+
+import threading
+
+import numpy as np
+
+# Side of the camera view a spawn comes from
+SIDE_TOP, SIDE_BOTTOM, SIDE_LEFT, SIDE_RIGHT = range(4)
+
+class WaveSchedule:
+    """
+    Every enemy wave of one level: spawn offsets from the camera view's
+    top-left corner, enemy type ids and health, as (waves, per_wave)
+    arrays.
+
+    The schedule is a pure function of (seed, level, per_wave), so a
+    snapshot only needs the seed and the index of the next wave. Waves are
+    generated block_waves at a time from one generator, so any wave index
+    can be regenerated exactly.
+    """
+
+    def __init__(self, seed, level, per_wave, view_size, margin, enemy_health,
+                 health_bonus, type_count, block_waves=32):
+        """
+        Args:
+            seed (int): Run seed
+            level (int): Player level the waves belong to
+            per_wave (int): Enemies in each wave
+            view_size (tuple): (width, height) of the camera view
+            margin (int): Distance outside the view enemies appear at
+            enemy_health (list): Base health by enemy type id
+            health_bonus (float): Extra health for every enemy at this level
+            type_count (int): Number of enemy types
+            block_waves (int): Waves generated at once
+        """
+        self.key = (seed, level, per_wave)
+        self.per_wave = per_wave
+        self.view_width, self.view_height = view_size
+        self.margin = margin
+        self.health_table = np.asarray(enemy_health, np.float64) + health_bonus
+        self.type_count = type_count
+        self.block_waves = block_waves
+        self.rng = np.random.default_rng([seed, level, per_wave])
+        self.blocks = []  # (x offsets, y offsets, type ids, health) per block
+        self.lock = threading.Lock()  # Blocks may be generated off-thread
+        self.extend()
+
+    def extend(self):
+        """Generate the next block of waves."""
+        shape = (self.block_waves, self.per_wave)
+        rng = self.rng
+        side = rng.integers(0, 4, shape)
+        along_x = rng.integers(0, self.view_width + 1, shape)
+        along_y = rng.integers(0, self.view_height + 1, shape)
+        type_ids = rng.integers(0, self.type_count, shape)
+
+        # Top/bottom spawns spread along x, left/right along y
+        horizontal = side <= SIDE_BOTTOM
+        xs = np.where(horizontal, along_x,
+                      np.where(side == SIDE_LEFT, -self.margin, self.view_width + self.margin))
+        ys = np.where(horizontal,
+                      np.where(side == SIDE_TOP, -self.margin, self.view_height + self.margin),
+                      along_y)
+        self.blocks.append((xs, ys, type_ids, self.health_table[type_ids]))
+
+    def wave(self, index):
+        """
+        Look up one wave, generating blocks up to it if needed.
+
+        Returns:
+            tuple: (x offsets, y offsets, type ids, health) arrays of per_wave
+        """
+        block, row = divmod(index, self.block_waves)
+        if block >= len(self.blocks):
+            with self.lock:
+                while block >= len(self.blocks):
+                    self.extend()
+        xs, ys, type_ids, health = self.blocks[block]
+        return xs[row], ys[row], type_ids[row], health[row]
+
+class WavePlanner:
+    """
+    Builds wave schedules and keeps the next level's ready ahead of time.
+    """
+
+    def __init__(self, view_size, margin, type_count, block_waves=32):
+        """
+        Args:
+            view_size (tuple): (width, height) of the camera view
+            margin (int): Distance outside the view enemies appear at
+            type_count (int): Number of enemy types
+            block_waves (int): Waves generated at once
+        """
+        self.view_size = view_size
+        self.margin = margin
+        self.type_count = type_count
+        self.block_waves = block_waves
+        self.prepared = {}  # (seed, level, per_wave) -> WaveSchedule
+        self.lock = threading.Lock()
+
+    def build(self, seed, level, per_wave, content):
+        """Build a level's schedule with the content's enemy health."""
+        return WaveSchedule(seed, level, per_wave, self.view_size, self.margin,
+                            content.enemy_health, content.enemy_health_bonus(level),
+                            self.type_count, self.block_waves)
+
+    def prepare(self, seed, level, per_wave, content):
+        """Build a schedule now so schedule() can return it without waiting."""
+        key = (seed, level, per_wave)
+        with self.lock:
+            if key in self.prepared:
+                return
+        schedule = self.build(seed, level, per_wave, content)
+        with self.lock:
+            self.prepared[key] = schedule
+
+    def schedule(self, seed, level, per_wave, content):
+        """
+        Return the schedule for a level, using a prepared one if available.
+        Older prepared schedules are dropped.
+        """
+        key = (seed, level, per_wave)
+        with self.lock:
+            schedule = self.prepared.pop(key, None)
+            self.prepared = {k: v for k, v in self.prepared.items()
+                             if k[0] == seed and k[1] > level}
+        return schedule or self.build(seed, level, per_wave, content)
+
+    def offer(self, schedule):
+        """Keep a schedule built elsewhere for a later schedule() call."""
+        with self.lock:
+            self.prepared.setdefault(schedule.key, schedule)
+
+    def clear(self, margin=None):
+        """Drop prepared schedules, e.g. after content or tuning changes."""
+        with self.lock:
+            self.prepared = {}
+            if margin is not None:
+                self.margin = margin
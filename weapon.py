@@ -1,5 +1,6 @@
 import pygame
 import math
+import app
 
 class Weapon:
     """
@@ -52,7 +53,7 @@ class Weapon:
         
         # Flip image if facing left
         if self.facing_left:
-            self.image = pygame.transform.flip(self.image, True, False)
+            self.image = app.flipped(self.image)
 
         # Handle positioning when equipped to player
         if self.equipped and player:
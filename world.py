@@ -0,0 +1,116 @@
+# world.py
+# Camera and lazily generated floor for a world larger than the screen
+
+import collections
+import random
+
+import pygame
+
+class Camera:
+    """
+    Screen-sized view into the world that follows a point and stays
+    inside the world bounds.
+    """
+
+    def __init__(self, view_width, view_height, world_width, world_height):
+        """
+        Args:
+            view_width (int): Screen width
+            view_height (int): Screen height
+            world_width (int): World width
+            world_height (int): World height
+        """
+        self.rect = pygame.Rect(0, 0, view_width, view_height)
+        self.world_width = world_width
+        self.world_height = world_height
+
+    def follow(self, x, y):
+        """Centre the view on a world position, clamped to the world edges."""
+        self.rect.center = (round(x), round(y))
+        self.rect.clamp_ip((0, 0, self.world_width, self.world_height))
+
+    def screen_to_world(self, pos):
+        """Convert a screen position (e.g. the mouse) to world coordinates."""
+        return pos[0] + self.rect.x, pos[1] + self.rect.y
+
+class ChunkedFloor:
+    """
+    Floor tiles generated in square chunks on first view.
+
+    Every chunk's tiles come from a random generator seeded by the world
+    seed and the chunk position, so a chunk looks the same every time it
+    is rebuilt. Built chunks are kept in a least-recently-used cache and
+    the oldest are freed once the cache holds more than max_bytes of
+    surfaces. The chunks in view are touched every frame, so the ones
+    evicted are the ones the camera left longest ago.
+    """
+
+    def __init__(self, floor_tiles, seed, chunk_tiles=16, max_bytes=32 * 1024 * 1024):
+        """
+        Args:
+            floor_tiles (list): Tile images to choose from
+            seed (int): World seed
+            chunk_tiles (int): Chunk width and height in tiles
+            max_bytes (int): Memory cap for cached chunk surfaces
+        """
+        self.floor_tiles = floor_tiles
+        self.seed = seed
+        self.tile_width = floor_tiles[0].get_width()
+        self.tile_height = floor_tiles[0].get_height()
+        self.chunk_width = self.tile_width * chunk_tiles
+        self.chunk_height = self.tile_height * chunk_tiles
+        self.chunk_tiles = chunk_tiles
+        self.max_bytes = max_bytes
+        self.chunks = collections.OrderedDict()  # (cx, cy) -> Surface, oldest first
+        self.cached_bytes = 0
+        self.built = 0  # Chunks generated, including rebuilds after eviction
+        self.evicted = 0
+
+    def build_chunk(self, cx, cy):
+        """Tile one chunk from its own seeded generator."""
+        rng = random.Random(f"{self.seed}:{cx}:{cy}")
+        surface = pygame.Surface((self.chunk_width, self.chunk_height))
+        tiles = self.floor_tiles
+        surface.blits([(rng.choice(tiles), (x * self.tile_width, y * self.tile_height))
+                       for y in range(self.chunk_tiles) for x in range(self.chunk_tiles)],
+                      doreturn=False)
+        self.built += 1
+        return surface
+
+    def chunk(self, cx, cy):
+        """Return a chunk surface, building it if needed, and mark it as used."""
+        key = (cx, cy)
+        surface = self.chunks.get(key)
+        if surface is None:
+            surface = self.build_chunk(cx, cy)
+            self.chunks[key] = surface
+            self.cached_bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        else:
+            self.chunks.move_to_end(key)
+        return surface
+
+    def evict(self, keep):
+        """Free least recently used chunks until under the memory cap."""
+        while self.cached_bytes > self.max_bytes and len(self.chunks) > keep:
+            _, surface = self.chunks.popitem(last=False)
+            self.cached_bytes -= surface.get_width() * surface.get_height() * surface.get_bytesize()
+            self.evicted += 1
+
+    def draw(self, target, view):
+        """
+        Draw the chunks intersecting a view.
+
+        Args:
+            target: A pygame.Surface or LowResTarget the size of the view
+            view (pygame.Rect): Visible part of the world
+        """
+        first_x = view.left // self.chunk_width
+        first_y = view.top // self.chunk_height
+        last_x = (view.right - 1) // self.chunk_width
+        last_y = (view.bottom - 1) // self.chunk_height
+        visible = [(self.chunk(cx, cy), (cx * self.chunk_width - view.x,
+                                         cy * self.chunk_height - view.y))
+                   for cy in range(first_y, last_y + 1)
+                   for cx in range(first_x, last_x + 1)]
+        target.blits(visible, doreturn=False)
+        self.evict(keep=len(visible))